@@ -1,7 +1,8 @@
 from datetime import datetime, timedelta
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import HTTPException, status
-from domain.repository.user_repository import UserRepository
+from starlette.concurrency import run_in_threadpool
+from domain.repository.async_user_repository import AsyncUserRepository
 from core.security import get_password_hash, verify_password, create_access_token, create_refresh_token, decode_token
 from core.config import get_settings
 
@@ -9,13 +10,15 @@ settings = get_settings()
 
 
 class AuthService:
-    def __init__(self, db: Session):
+    """회원가입/로그인/토큰 재발급 (비동기 세션, 비밀번호 해싱은 스레드 풀에서 실행해 이벤트 루프를 막지 않음)"""
+
+    def __init__(self, db: AsyncSession):
         self.db = db
-        self.user_repository = UserRepository(db)
+        self.user_repository = AsyncUserRepository(db)
 
-    def signup(self, username: str, email: str, password: str) -> dict:
+    async def signup(self, username: str, email: str, password: str) -> dict:
         # 이미 존재하는 username 확인
-        existing_user = self.user_repository.get_user_by_username(username)
+        existing_user = await self.user_repository.get_user_by_username(username)
         if existing_user:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -23,7 +26,7 @@ class AuthService:
             )
 
         # 이미 존재하는 email 확인
-        existing_email = self.user_repository.get_user_by_email(email)
+        existing_email = await self.user_repository.get_user_by_email(email)
         if existing_email:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -31,10 +34,10 @@ class AuthService:
             )
 
         # 비밀번호 해싱
-        hashed_password = get_password_hash(password)
+        hashed_password = await run_in_threadpool(get_password_hash, password)
 
         # 사용자 생성
-        user = self.user_repository.create_user(
+        user = await self.user_repository.create_user(
             username=username,
             email=email,
             hashed_password=hashed_password
@@ -42,9 +45,9 @@ class AuthService:
 
         return {"message": "회원가입에 성공했습니다."}
 
-    def login(self, username: str, password: str) -> dict:
+    async def login(self, username: str, password: str) -> dict:
         # 사용자 조회
-        user = self.user_repository.get_user_by_username(username)
+        user = await self.user_repository.get_user_by_username(username)
         if not user:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
@@ -52,7 +55,7 @@ class AuthService:
             )
 
         # 비밀번호 검증
-        if not verify_password(password, user.hashed_password):
+        if not await run_in_threadpool(verify_password, password, user.hashed_password):
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Incorrect username or password"
@@ -66,10 +69,11 @@ class AuthService:
 
         # 리프레시 토큰을 DB에 저장
         expires_at = datetime.utcnow() + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
-        self.user_repository.save_refresh_token(
+        await self.user_repository.save_refresh_token(
             user_id=user.id,
             token=refresh_token,
-            expires_at=expires_at
+            expires_at=expires_at,
+            max_active=settings.REFRESH_TOKEN_MAX_PER_USER
         )
 
         return {
@@ -77,7 +81,7 @@ class AuthService:
             "refresh_token": refresh_token
         }
 
-    def reissue_token(self, refresh_token: str) -> dict:
+    async def reissue_token(self, refresh_token: str) -> dict:
         # 리프레시 토큰 검증
         try:
             payload = decode_token(refresh_token)
@@ -95,7 +99,7 @@ class AuthService:
             )
 
         # DB에서 리프레시 토큰 확인
-        stored_token = self.user_repository.get_refresh_token(refresh_token)
+        stored_token = await self.user_repository.get_refresh_token(refresh_token)
         if not stored_token:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
@@ -105,7 +109,7 @@ class AuthService:
         # 토큰 만료 확인
         if stored_token.expires_at < datetime.utcnow():
             # 만료된 토큰 삭제
-            self.user_repository.delete_refresh_token(refresh_token)
+            await self.user_repository.delete_refresh_token(refresh_token)
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Refresh token expired"
@@ -113,7 +117,7 @@ class AuthService:
 
         # 사용자 정보 조회
         user_id = int(payload.get("sub"))
-        user = self.user_repository.get_user_by_id(user_id)
+        user = await self.user_repository.get_user_by_id(user_id)
         if not user:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
@@ -128,7 +132,7 @@ class AuthService:
 
         # 기존 토큰 삭제 및 새 토큰 저장 (원자적 작업)
         expires_at = datetime.utcnow() + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
-        self.user_repository.replace_refresh_token(
+        await self.user_repository.replace_refresh_token(
             old_token=refresh_token,
             user_id=user.id,
             new_token=new_refresh_token,
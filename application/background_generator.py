@@ -1,16 +1,21 @@
 from google import genai
 import os
 from dotenv import load_dotenv
-from pathlib import Path
-import base64
-import uuid
+import hashlib
 import logging
-import requests
-from PIL import Image
-import io
-import re
-from datetime import datetime
-from typing import List, Optional
+import httpx
+from typing import List, Optional, Tuple
+
+from application.image_index import ImageIndex
+from application.image_processing import ImageProcessor, ProcessedImage, get_image_processor
+from application.keyword_cache import KeywordCache
+from application.keyword_canonicalizer import canonical_key, with_facet
+from core.config import get_settings
+from core.metrics import metrics
+from core.database import SessionLocal
+from core.http_client import PooledHttpClient, get_http_client
+from core.storage import ImageStorage, create_image_storage
+from domain.repository.image_repository import ImageRepository
 
 load_dotenv()
 
@@ -19,7 +24,14 @@ logger = logging.getLogger(__name__)
 
 
 class BackgroundGenerator:
-    def __init__(self):
+    def __init__(
+        self,
+        storage: Optional[ImageStorage] = None,
+        image_processor: Optional[ImageProcessor] = None,
+        http_client: Optional[PooledHttpClient] = None,
+        keyword_cache: Optional[KeywordCache] = None,
+        session_factory=SessionLocal,
+    ):
         # Google AI client setup
         GEMINI_API_KEY = os.getenv("GEMINI_TOKEN")
         
@@ -45,66 +57,114 @@ class BackgroundGenerator:
         # Image settings
         self.__immage_size = os.getenv("IMAGE_SIZE")
         
-        # Image storage directory
-        self.__images_dir = Path("static/generated_images")
-        try:
-            self.__images_dir.mkdir(parents=True, exist_ok=True)
-        except Exception as e:
-            error_msg = f"Failed to create image storage directory: {e}"
-            logger.error(error_msg)
-            raise RuntimeError(error_msg)
+        # Image storage (로컬 디스크 또는 S3 호환 스토리지)
+        self.__storage = storage or create_image_storage()
+
+        # 콘텐츠 해시 파일의 키워드 메타데이터
+        self.__image_index = ImageIndex(self.__storage)
+
+        # 이미지 후처리 프로세스 풀
+        self.__image_processor = image_processor or get_image_processor()
+
+        # 이미지 생성 REST API용 keep-alive 연결 풀
+        self.__http_client = http_client or get_http_client()
+
+        # 장면 설명 → 키워드 캐시 (같은 장면이면 LLM 호출 생략)
+        if keyword_cache is None:
+            settings = get_settings()
+            keyword_cache = KeywordCache(
+                session_factory,
+                max_size=settings.KEYWORD_CACHE_SIZE,
+                ttl_seconds=settings.KEYWORD_CACHE_TTL_SECONDS,
+            )
+        self.__keyword_cache = keyword_cache
+
+        # images 테이블 기록용 DB 세션 팩토리
+        self.__session_factory = session_factory
+
+        # 이 거리 이내의 기존 이미지가 있으면 새로 저장하지 않고 재사용
+        self.__dedup_max_distance = get_settings().IMAGE_DEDUP_MAX_DISTANCE
+
+        # 새 배경 생성 시 같은 API 호출로 함께 만들 변형 facet (날씨/시간대)
+        self.__variant_facets = [
+            facet.strip() for facet in get_settings().IMAGE_VARIANT_FACETS.split(",") if facet.strip()
+        ]
+        self.__variant_max = get_settings().IMAGE_VARIANT_MAX
 
     def get_existing_images(self) -> List[str]:
-        """저장된 이미지 파일 목록 반환 (키워드 부분만)"""
-        existing_images = []
-        for file in self.__images_dir.glob("*.png"):
-            # 파일명에서 타임스탬프 제거하고 키워드만 추출
-            # 예: rainy_school_corridor_20251114_153045.png -> rainy_school_corridor
-            filename = file.stem  # 확장자 제거
-            # 마지막 타임스탬프 부분 제거 (YYYYMMDD_HHMMSS 패턴)
-            keyword = re.sub(r'_\d{8}_\d{6}$', '', filename)
-            if keyword:
-                existing_images.append(keyword)
-        return existing_images
+        """저장된 이미지 키워드 목록 반환 (같은 장면으로 정규화되는 키워드는 하나만)"""
+        return self.__image_index.keywords()
 
     def find_matching_image(self, keyword: str) -> Optional[str]:
-        """키워드와 일치하는 기존 이미지 찾기"""
-        clean_keyword = re.sub(r'[^\w\s-]', '', keyword)
-        clean_keyword = re.sub(r'[\s]+', '_', clean_keyword)
-        clean_keyword = clean_keyword[:50]
-        
-        # 정확히 일치하는 파일 찾기
-        for file in self.__images_dir.glob(f"{clean_keyword}_*.png"):
-            image_url = f"/static/generated_images/{file.name}"
-            logger.info(f"Found existing image for keyword '{keyword}': {file.name}")
-            return image_url
+        """키워드와 일치하는 기존 이미지 찾기 (단어 순서/동의어가 달라도 같은 장면이면 일치)"""
+        filename = self.__image_index.find(keyword)
+        if filename and self.__storage.exists(filename):
+            logger.info(f"Found existing image for keyword '{keyword}': {filename}")
+            return self.__storage.url(filename)
         
         return None
 
     def create_background_image(self, story: str) -> str:
+        background_search_keyword = self.get_background_keyword(story)
+        print(f"Background keyword: {background_search_keyword}")
+
+        return self.create_background_image_by_keyword(background_search_keyword)
+
+    def get_background_keyword(self, story: str) -> str:
+        """장면 설명을 배경 검색 키워드로 변환 (캐시에 없을 때만 LLM 호출)"""
+        keyword, _ = self.resolve_background_keyword(story)
+        return keyword
+
+    def resolve_background_keyword(self, story: str) -> Tuple[str, bool]:
+        """get_background_keyword와 같지만 (키워드, LLM을 호출했는지) 반환 (캐시 적중이면 False)"""
+        cached_keyword = self.__keyword_cache.get(story)
+        if cached_keyword:
+            return cached_keyword, False
+
         # 기존 이미지 목록 가져오기
         existing_images = self.get_existing_images()
         
         # LLM에게 기존 이미지 목록 전달하여 키워드 생성
         prompt = self.__set_prompt(story, existing_images)
-        background_search_keyword = self.__get_search_word(prompt)
-        print(f"Background keyword: {background_search_keyword}")
-
-        return self.create_background_image_by_keyword(background_search_keyword)
+        keyword = self.__get_search_word(prompt)
+        self.__keyword_cache.set(story, keyword)
+        return keyword, True
 
-    def create_background_image_by_keyword(self, keyword: str) -> str:
+    def create_background_image_by_keyword(self, keyword: str, variant_facets: Optional[List[str]] = None) -> str:
         # 먼저 기존 이미지 확인
         existing_image = self.find_matching_image(keyword)
         if existing_image:
             print(f"Reusing existing image: {existing_image}")
             return existing_image
         
-        # 없으면 새로 생성
-        print(f"Generating new image for: {keyword}")
-        background_image = self.__create_background_image(keyword)
+        # 없으면 새로 생성 (설정된 facet의 변형도 같은 호출로 함께 생성)
+        variant_keywords = self.get_variant_keywords(
+            keyword, self.__variant_facets if variant_facets is None else variant_facets
+        )
+        print(f"Generating new image for: {keyword}" + (f" (+ variants: {variant_keywords})" if variant_keywords else ""))
+        background_image = self.__create_background_image(keyword, variant_keywords)
 
         return background_image
 
+    def get_variant_keywords(self, keyword: str, facets: List[str]) -> List[str]:
+        """facet만 바꾼 변형 키워드 중 아직 이미지가 없는 것 (최대 IMAGE_VARIANT_MAX - 1개)"""
+        variants = []
+        seen = {canonical_key(keyword)}
+        for facet in facets:
+            if len(variants) >= self.__variant_max - 1:
+                break
+            try:
+                variant = with_facet(keyword, facet)
+            except ValueError as e:
+                logger.warning(f"Skipping variant facet: {e}")
+                continue
+            key = canonical_key(variant)
+            if key in seen or self.__image_index.contains(variant):
+                continue
+            seen.add(key)
+            variants.append(variant)
+        return variants
+
     def __set_prompt(self, story: str, existing_images: List[str] = None) -> str:
         base_prompt = (
             "미연시 게임 배경 이미지를 생성할 영어 검색어가 필요합니다.\n"
@@ -144,7 +204,12 @@ class BackgroundGenerator:
 
         return response.candidates[0].content.parts[0].text.strip()
 
-    def __create_background_image(self, background_search_keyword):
+    def __create_background_image(self, background_search_keyword, variant_keywords: Optional[List[str]] = None):
+        """
+        배경 이미지 생성 후 저장하여 URL 반환
+        variant_keywords가 있으면 같은 장소의 변형들을 한 번의 API 호출로 함께 생성하여 각각 저장
+        """
+        variant_keywords = variant_keywords or []
         image_style = """
         visual novel style,
         clean line art,
@@ -160,6 +225,17 @@ class BackgroundGenerator:
         # Add aspect ratio to prompt (16:9 widescreen format)
         aspect_ratio_instruction = "16:9 widescreen aspect ratio, horizontal landscape orientation"
         full_prompt = f"{background_search_keyword}, {image_style}, {aspect_ratio_instruction}, ultra detail, no people, environment background"
+        if variant_keywords:
+            image_list = "\n".join(
+                f"{i}. {keyword}" for i, keyword in enumerate([background_search_keyword] + variant_keywords, 1)
+            )
+            full_prompt = (
+                f"Generate {len(variant_keywords) + 1} separate images of the same location, "
+                "one image per line below, in this order. "
+                "Keep the place and composition identical; only change the weather or time of day.\n"
+                f"{image_list}\n"
+                f"{image_style}, {aspect_ratio_instruction}, ultra detail, no people, environment background"
+            )
 
         logger.info(f"Generating background image for keyword: {background_search_keyword}")
         logger.debug(f"Full prompt: {full_prompt}")
@@ -188,7 +264,7 @@ class BackgroundGenerator:
                 "key": self.__api_key
             }
             
-            response = requests.post(url, headers=headers, json=payload, params=params, timeout=60)
+            response = self.__http_client.post(url, headers=headers, json=payload, params=params)
             
             # Check for HTTP errors
             if response.status_code != 200:
@@ -208,11 +284,11 @@ class BackgroundGenerator:
             
             response_data = response.json()
             
-        except requests.exceptions.Timeout:
-            error_msg = "Image generation request timed out after 60 seconds"
+        except httpx.TimeoutException as e:
+            error_msg = f"Image generation request timed out: {e!r}"
             logger.error(error_msg)
             raise RuntimeError(error_msg)
-        except requests.exceptions.RequestException as e:
+        except httpx.HTTPError as e:
             error_msg = f"Network error while generating image: {e}"
             logger.error(error_msg)
             raise RuntimeError(error_msg)
@@ -238,14 +314,13 @@ class BackgroundGenerator:
                 logger.error(error_msg)
                 raise RuntimeError(error_msg)
             
-            # Find the part with inline_data (image)
-            image_base64 = None
-            for part in parts:
-                if "inlineData" in part:
-                    image_base64 = part["inlineData"].get("data")
-                    break
+            # Find the parts with inline_data (image) - 변형 요청 시 순서대로 여러 장
+            images_base64 = [
+                part["inlineData"].get("data") for part in parts
+                if "inlineData" in part and part["inlineData"].get("data")
+            ]
             
-            if not image_base64:
+            if not images_base64:
                 error_msg = "No image data in API response"
                 logger.error(error_msg)
                 raise RuntimeError(error_msg)
@@ -255,56 +330,86 @@ class BackgroundGenerator:
             logger.error(error_msg)
             raise RuntimeError(error_msg)
         
-        # Generate filename with keyword and timestamp
-        # Clean keyword for filename (remove special chars, limit length)
-        clean_keyword = re.sub(r'[^\w\s-]', '', background_search_keyword)
-        clean_keyword = re.sub(r'[\s]+', '_', clean_keyword)
-        clean_keyword = clean_keyword[:50]  # Limit length
-        
-        # Add timestamp for uniqueness
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"{clean_keyword}_{timestamp}.png"
-        filepath = self.__images_dir / filename
-        
+        del response_data
+        if variant_keywords and len(images_base64) < len(variant_keywords) + 1:
+            logger.warning(
+                f"Requested {len(variant_keywords) + 1} variants but received {len(images_base64)} images"
+            )
+        metrics.inc("image_generation_request_total")
+        metrics.observe("image_generation_images_per_request", len(images_base64))
+
+        image_url = self.__save_generated_image(images_base64[0], background_search_keyword)
+
+        # 변형 이미지는 실패해도 요청한 이미지는 그대로 반환
+        for variant_keyword, variant_base64 in zip(variant_keywords, images_base64[1:]):
+            try:
+                self.__save_generated_image(variant_base64, variant_keyword)
+                metrics.inc("image_variant_saved_total")
+            except Exception as e:
+                logger.error(f"Failed to save variant '{variant_keyword}': {e}")
+
+        return image_url
+
+    def __save_generated_image(self, image_base64: str, background_search_keyword: str) -> str:
+        """생성된 이미지를 후처리하여 저장하고 키워드를 인덱스에 등록한 뒤 URL 반환"""
+        # 디코딩/크롭/인코딩은 별도 프로세스에서 실행
+        try:
+            processed = self.__image_processor.process(image_base64)
+            del image_base64
+        except Exception as e:
+            error_msg = f"Failed to process generated image: {e}"
+            logger.error(error_msg)
+            raise RuntimeError(error_msg)
+
         # 파일 저장 실패 시 에러 처리
         try:
-            # Decode base64 image data
-            image_bytes = base64.b64decode(image_base64)
-            
-            # Open image with PIL to crop to 16:9
-            img = Image.open(io.BytesIO(image_bytes))
-            original_width, original_height = img.size
-            
-            logger.info(f"Original image size: {original_width}x{original_height}")
-            
-            # Calculate 16:9 dimensions
-            target_ratio = 16 / 9
-            current_ratio = original_width / original_height
-            
-            if abs(current_ratio - target_ratio) > 0.01:  # If not already 16:9
-                # Crop to 16:9 from center
-                if current_ratio > target_ratio:
-                    # Image is wider, crop width
-                    new_width = int(original_height * target_ratio)
-                    left = (original_width - new_width) // 2
-                    img = img.crop((left, 0, left + new_width, original_height))
-                else:
-                    # Image is taller, crop height
-                    new_height = int(original_width / target_ratio)
-                    top = (original_height - new_height) // 2
-                    img = img.crop((0, top, original_width, top + new_height))
-                
-                logger.info(f"Cropped to 16:9: {img.size[0]}x{img.size[1]}")
-            
-            # Save as PNG
-            img.save(filepath, "PNG")
-            
-            logger.info(f"Image saved successfully: {filename}")
+            png_bytes = processed.png_bytes
+
+            # 거의 같은 이미지가 이미 있으면 키워드만 그 이미지에 추가
+            similar_filename = self.__image_index.find_similar(processed.dhash, self.__dedup_max_distance)
+            if similar_filename and self.__storage.exists(similar_filename):
+                logger.info(f"Near-duplicate of {similar_filename}, reusing it for '{background_search_keyword}'")
+                metrics.inc("image_dedup_total")
+                similar_digest = similar_filename.rsplit(".", 1)[0]
+                self.__image_index.add(similar_digest, similar_filename, background_search_keyword)
+                return self.__storage.url(similar_filename)
+
+            # 콘텐츠 해시를 파일명으로 사용 (동일한 이미지는 하나의 파일로 합쳐짐)
+            digest = hashlib.sha256(png_bytes).hexdigest()
+            filename = f"{digest}.png"
+
+            if self.__storage.exists(filename):
+                logger.info(f"Identical image already stored: {filename}")
+            else:
+                self.__storage.put(filename, png_bytes, "image/png", immutable=True)
+                logger.info(f"Image saved successfully: {filename}")
+
+            self.__image_index.add(digest, filename, background_search_keyword, processed.dhash)
+            self.__record_image(digest, filename, background_search_keyword, processed)
         except Exception as e:
-            error_msg = f"Failed to save image file to {filepath}: {e}"
+            error_msg = f"Failed to save image for '{background_search_keyword}': {e}"
             logger.error(error_msg)
             raise RuntimeError(error_msg)
         
-        # Return URL path for the saved image
-        image_url = f"/static/generated_images/{filename}"
-        return image_url
+        # Return URL for the saved image
+        return self.__storage.url(filename)
+
+    def __record_image(self, digest: str, filename: str, keyword: str, processed: ProcessedImage) -> None:
+        """images 테이블에 메타데이터 기록 (실패해도 이미지 생성은 성공으로 처리)"""
+        if self.__session_factory is None:
+            return
+        db = self.__session_factory()
+        try:
+            ImageRepository(db).record_image(
+                image_hash=digest,
+                filename=filename,
+                keyword=keyword,
+                width=processed.width,
+                height=processed.height,
+                size_bytes=len(processed.png_bytes),
+            )
+        except Exception as e:
+            logger.error(f"Failed to record image metadata for {filename}: {e}")
+            db.rollback()
+        finally:
+            db.close()
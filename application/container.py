@@ -0,0 +1,81 @@
+import logging
+import threading
+from typing import Optional
+
+from fastapi import Depends
+from sqlalchemy.orm import Session
+
+from application.background_generator import BackgroundGenerator
+from application.game_service import GameService
+from application.image_processing import get_image_processor, shutdown_image_processor
+from application.llm_service import LLMService
+from application.sprite_manifest import get_sprite_manifest
+from core.config import get_settings
+from core.database import get_db
+from core.http_client import close_http_client, get_http_client
+from core.storage import create_image_storage
+
+logger = logging.getLogger(__name__)
+
+
+class ServiceContainer:
+    """
+    프로세스당 한 번만 생성하는 서비스 모음
+    (Gemini 클라이언트, HTTP 연결 풀, 이미지 저장소/인덱스, 후처리 풀, 스프라이트 매니페스트)
+    요청마다 바뀌는 DB 세션은 GameService 생성 시에만 주입
+    """
+
+    def __init__(self):
+        self.http_client = get_http_client()
+        self.image_storage = create_image_storage()
+        self.image_processor = get_image_processor()
+        self.bg_generator = BackgroundGenerator(
+            storage=self.image_storage,
+            image_processor=self.image_processor,
+            http_client=self.http_client,
+        )
+        self.llm_service = LLMService()
+        self.sprite_manifest = get_sprite_manifest()
+
+    def game_service(self, db: Session) -> GameService:
+        return GameService(
+            db,
+            bg_generator=self.bg_generator,
+            llm_service=self.llm_service,
+            sprite_manifest=self.sprite_manifest,
+            release_connection_during_calls=get_settings().DB_RELEASE_DURING_EXTERNAL_CALLS,
+        )
+
+
+_container: Optional[ServiceContainer] = None
+_container_lock = threading.Lock()
+
+
+def get_container() -> ServiceContainer:
+    """프로세스 전체에서 공유하는 서비스 컨테이너 (최초 호출 시 생성)"""
+    global _container
+    with _container_lock:
+        if _container is None:
+            _container = ServiceContainer()
+        return _container
+
+
+def warm_container() -> None:
+    """서버 시작 시 컨테이너를 미리 생성 (실패해도 서버는 뜨고 첫 요청에서 다시 시도)"""
+    try:
+        get_container()
+    except Exception as e:
+        logger.error(f"Failed to initialize service container: {e}")
+
+
+def shutdown_container() -> None:
+    """서버 종료 시 연결 풀과 후처리 프로세스 정리"""
+    global _container
+    with _container_lock:
+        _container = None
+    shutdown_image_processor()
+    close_http_client()
+
+
+def get_game_service(db: Session = Depends(get_db)) -> GameService:
+    return get_container().game_service(db)
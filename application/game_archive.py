@@ -0,0 +1,156 @@
+import gzip
+import json
+import logging
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List, Mapping
+
+from sqlalchemy import DateTime
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from core.static_files import extract_content_hash
+from domain.entity.game import GameState, Scene, Session as GameSession
+from domain.repository.game_repository import GameArchiveRepository
+
+logger = logging.getLogger(__name__)
+
+# JSONL 각 줄의 "table" 값 → 엔티티 (복원 순서: 세션 → 씬 → 상태)
+ARCHIVE_TABLES = {
+    GameSession.__tablename__: GameSession,
+    Scene.__tablename__: Scene,
+    GameState.__tablename__: GameState,
+}
+
+
+def to_json_row(values: Mapping) -> Dict:
+    """컬럼 값 → JSON으로 쓸 수 있는 값 (datetime은 ISO 문자열)"""
+    return {key: value.isoformat() if isinstance(value, datetime) else value for key, value in values.items()}
+
+
+def from_json_row(model, row: Dict) -> Dict:
+    """to_json_row의 역변환 (model의 DateTime 컬럼을 datetime으로)"""
+    values = dict(row)
+    for column in model.__table__.columns:
+        if isinstance(column.type, DateTime) and values.get(column.key):
+            values[column.key] = datetime.fromisoformat(values[column.key])
+    return values
+
+
+def serialize_game(sessions: List[GameSession], scenes: List[Scene], state) -> bytes:
+    """세션/씬/상태를 한 줄에 한 행씩 gzip JSONL로"""
+    rows = [*sessions, *scenes, *([state] if state is not None else [])]
+    lines = [
+        json.dumps(
+            {
+                "table": obj.__tablename__,
+                "row": to_json_row({column.key: getattr(obj, column.key) for column in obj.__table__.columns}),
+            },
+            ensure_ascii=False,
+            separators=(",", ":"),
+        )
+        for obj in rows
+    ]
+    return gzip.compress("\n".join(lines).encode("utf-8"))
+
+
+def deserialize_game(data: bytes) -> Dict[str, List[Dict]]:
+    """gzip JSONL → 테이블별 insert 값 목록"""
+    tables: Dict[str, List[Dict]] = {name: [] for name in ARCHIVE_TABLES}
+    for line in gzip.decompress(data).decode("utf-8").splitlines():
+        if not line:
+            continue
+        record = json.loads(line)
+        tables[record["table"]].append(from_json_row(ARCHIVE_TABLES[record["table"]], record["row"]))
+    return tables
+
+
+def archive_game(db: Session, game_id: int) -> Dict:
+    """게임 하나의 세션/씬/상태를 보관 행으로 옮김"""
+    archive_repo = GameArchiveRepository(db)
+    sessions, scenes, state = archive_repo.get_game_rows(game_id)
+    data = serialize_game(sessions, scenes, state)
+    archive_repo.archive_game(
+        game_id,
+        data,
+        session_ids=[session.id for session in sessions],
+        scene_ids=[scene.id for scene in scenes],
+        background_hashes=sorted(
+            {extract_content_hash(session.background_url) for session in sessions if session.background_url} - {None}
+        ),
+    )
+    return {"sessions": len(sessions), "scenes": len(scenes), "bytes": len(data)}
+
+
+def archive_games(
+    db: Session,
+    older_than_days: int,
+    batch_size: int = 50,
+    max_games: int = 0,
+    pause_seconds: float = 0.0,
+    dry_run: bool = False,
+) -> Dict:
+    """
+    엔딩 후 older_than_days일 넘게 진행이 없는 게임을 batch_size개씩 보관
+    게임마다 짧은 트랜잭션으로 처리하고 배치 사이에 pause_seconds만큼 쉼 (max_games: 0이면 제한 없음)
+    """
+    archive_repo = GameArchiveRepository(db)
+    finished_before = datetime.utcnow() - timedelta(days=older_than_days)
+    report = {"archived": 0, "sessions": 0, "scenes": 0, "bytes": 0, "skipped": 0, "candidates": []}
+
+    skipped = set()
+    while not max_games or report["archived"] < max_games:
+        limit = batch_size if not max_games else min(batch_size, max_games - report["archived"])
+        candidates = [
+            game_id
+            for game_id in archive_repo.get_archive_candidates(finished_before, limit + len(skipped))
+            if game_id not in skipped
+        ][:limit]
+        if not candidates:
+            break
+        if dry_run:
+            report["candidates"] = candidates
+            break
+
+        for game_id in candidates:
+            try:
+                result = archive_game(db, game_id)
+            except Exception as e:
+                db.rollback()
+                skipped.add(game_id)
+                report["skipped"] += 1
+                logger.warning(f"Failed to archive game {game_id}: {e}")
+                continue
+            report["archived"] += 1
+            report["sessions"] += result["sessions"]
+            report["scenes"] += result["scenes"]
+            report["bytes"] += result["bytes"]
+        logger.info(f"Archived {report['archived']} games so far")
+        if pause_seconds:
+            time.sleep(pause_seconds)
+    return report
+
+
+def restore_game(db: Session, game_id: int) -> bool:
+    """보관된 게임을 원래 테이블로 복원 (보관되지 않았으면 False)"""
+    archive_repo = GameArchiveRepository(db)
+    archive = archive_repo.get_archive(game_id)
+    if archive is None:
+        return False
+    tables = deserialize_game(archive.data)
+    # 조회도 진행으로 보고 복원 직후 다시 보관되지 않도록
+    for state in tables[GameState.__tablename__]:
+        state["updated_at"] = datetime.utcnow()
+    try:
+        archive_repo.restore_game(
+            archive,
+            sessions=tables[GameSession.__tablename__],
+            scenes=tables[Scene.__tablename__],
+            states=tables[GameState.__tablename__],
+        )
+    except IntegrityError:
+        # 동시에 들어온 다른 요청이 먼저 복원함
+        db.rollback()
+        return True
+    logger.info(f"Restored archived game {game_id}")
+    return True
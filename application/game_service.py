@@ -1,37 +1,133 @@
+from collections import Counter
 from sqlalchemy.orm import Session
 from typing import Dict, List, Optional
 from fastapi import HTTPException, status
 
 from domain.repository.game_repository import (
     CharacterRepository,
+    GameArchiveRepository,
     GameRepository,
+    GameStateRepository,
     SessionRepository,
     SceneRepository,
 )
 from application.background_generator import BackgroundGenerator
+from application.game_archive import restore_game
 from application.llm_service import LLMService
+from domain.entity.game import GameState
+from application.sprite_manifest import DEFAULT_EMOTION, SpriteManifest, get_sprite_manifest, normalize_emotion
+from core.db_routing import use_primary
+from core.metrics import metrics
+
+def dominant_emotion(emotion: Dict[str, int]) -> Optional[str]:
+    """사용자 얼굴 감정 중 가장 높은 값"""
+    return max(emotion.items(), key=lambda item: item[1])[0] if emotion else None
+
+
+# 다음 씬을 위해 미리 받아 둘 메인 캐릭터 표정 수 (자주 쓰인 순)
+PREFETCH_EMOTION_COUNT = 3
 
 
 class GameService:
-    def __init__(self, db: Session):
+    def __init__(
+        self,
+        db: Session,
+        bg_generator: Optional[BackgroundGenerator] = None,
+        llm_service: Optional[LLMService] = None,
+        sprite_manifest: Optional[SpriteManifest] = None,
+        release_connection_during_calls: bool = False,
+    ):
         self.db = db
+        self.release_connection_during_calls = release_connection_during_calls
         self.character_repo = CharacterRepository(db)
         self.game_repo = GameRepository(db)
         self.session_repo = SessionRepository(db)
         self.scene_repo = SceneRepository(db)
-        self.bg_generator = BackgroundGenerator()
-        self.llm_service = LLMService()
+        self.state_repo = GameStateRepository(db)
+        self.archive_repo = GameArchiveRepository(db)
+        # 외부 클라이언트는 ServiceContainer에서 공유 인스턴스를 주입받음
+        self.bg_generator = bg_generator or BackgroundGenerator()
+        self.llm_service = llm_service or LLMService()
+        self.sprite_manifest = sprite_manifest or get_sprite_manifest()
+
+    def _release_connection(self) -> None:
+        """
+        LLM/이미지 생성처럼 오래 걸리는 호출 전에 트랜잭션을 끝내 연결을 풀에 반환
+        (다음 쿼리에서 새 연결을 받음, 이미 읽은 객체는 만료시키지 않고 그대로 사용)
+        """
+        if not self.release_connection_during_calls:
+            return
+        expire_on_commit = self.db.expire_on_commit
+        self.db.expire_on_commit = False
+        try:
+            self.db.commit()
+        finally:
+            self.db.expire_on_commit = expire_on_commit
+        metrics.inc("db_connection_release_total")
+
+    def _get_game_state(self, game_id: int) -> GameState:
+        """게임 진행 상태 (보관된 게임은 복원, 상태 행이 없는 기존 게임은 세션/씬에서 다시 계산)"""
+        state = self.state_repo.get_state(game_id)
+        if state is None:
+            restore_game(self.db, game_id)
+            state = self.state_repo.get_state(game_id) or self.state_repo.rebuild_state(game_id)
+        if state is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Game not found"
+            )
+        return state
+
+    def _get_turn_session(self, state: GameState, game_id: int, session_id: int):
+        """요청한 세션 (현재 세션이면 상태와 함께 이미 로드됨)"""
+        if session_id == state.current_session_id:
+            return state.current_session
+        session = self.session_repo.get_session_by_id(session_id)
+        if not session or session.game_id != game_id:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Session not found"
+            )
+        return session
+
+    def _get_next_scene_number(self, state: GameState, session_id: int) -> int:
+        if session_id == state.current_session_id:
+            return state.next_scene_number
+        return self.scene_repo.get_latest_scene(session_id).scene_number + 1
+
+    def _get_latest_scene_id(self, game_id: int) -> Optional[int]:
+        """게임의 가장 최근 씬 ID (복제본에 없으면 방금 만든 게임일 수 있으므로 primary에서 다시 조회)"""
+        latest_scene_id = self.scene_repo.get_latest_scene_ids([game_id]).get(game_id)
+        if latest_scene_id is None:
+            with use_primary(self.db):
+                latest_scene_id = self.scene_repo.get_latest_scene_ids([game_id]).get(game_id)
+        return latest_scene_id
 
     def _get_character_filename(self, character_id: Optional[int], emotion: Optional[str]) -> Optional[str]:
-        """캐릭터 이미지 파일명 생성"""
-        if character_id is None:
-            return None
-        
-        # emotion이 없거나 빈 문자열이면 기본 표정
-        if not emotion:
-            return f"{character_id}.png"
-        
-        return f"{character_id}_{emotion}.png"
+        """캐릭터 이미지 파일명 (알 수 없는 표정은 가장 가까운 스프라이트로 대체)"""
+        return self.sprite_manifest.filename(character_id, emotion)
+
+    def _get_character_url(self, character_id: Optional[int], emotion: Optional[str]) -> Optional[str]:
+        """캐릭터 이미지의 콘텐츠 해시 URL (영구 캐시 가능)"""
+        return self.sprite_manifest.url(character_id, emotion)
+
+    def _get_prefetch_urls(self, main_character_id: int, scenes: List, exclude: List[Optional[str]]) -> List[str]:
+        """다음 씬에서 필요할 가능성이 높은 에셋 URL (아틀라스가 있으면 아틀라스 하나, 없으면 자주 쓰인 표정)"""
+        atlas = self.sprite_manifest.atlas(main_character_id)
+        if atlas:
+            candidates = [atlas["url"]]
+        else:
+            counts = Counter(
+                normalize_emotion(sc.emotion) for sc in scenes if sc.character_id == main_character_id
+            )
+            emotions = [emotion for emotion, _ in counts.most_common(PREFETCH_EMOTION_COUNT)]
+            if DEFAULT_EMOTION not in emotions:
+                emotions.append(DEFAULT_EMOTION)
+            candidates = [self.sprite_manifest.url(main_character_id, emotion) for emotion in emotions]
+
+        urls = []
+        for url in candidates:
+            if url and url not in exclude and url not in urls:
+                urls.append(url)
+        return urls
 
     def create_new_game(
         self, user_id: int, personality: str, genre: str, playtime: int
@@ -51,12 +147,14 @@ class GameService:
         ]
 
         # 2. LLM으로 게임 구조 생성
+        self._release_connection()
         game_structure = self.llm_service.generate_game_structure(
             personality=personality,
             genre=genre,
             playtime=playtime,
             characters=characters_dict,
         )
+        token_usage = self.llm_service.consume_token_usage()
 
         # 메인 캐릭터 ID 추출
         main_character_id = game_structure.get("main_character_id")
@@ -95,6 +193,7 @@ class GameService:
         first_session_content = game_structure["first_session_content"]
 
         # 배경 이미지 생성
+        self._release_connection()
         try:
             background_url = self.bg_generator.create_background_image(
                 first_session_content
@@ -110,7 +209,7 @@ class GameService:
             background_url=background_url,
         )
 
-        # 5. 첫 씬 생성
+        # 5. 첫 씬 생성 (게임 진행 상태도 함께 저장)
         first_scene_data = game_structure["first_scene"]
         scene = self.scene_repo.create_scene(
             session_id=session.id,
@@ -121,6 +220,8 @@ class GameService:
             selections=first_scene_data.get("selections"),
             character_id=first_scene_data.get("character_id"),
             emotion=first_scene_data.get("emotion"),
+            game_state=self.state_repo.build_state(game, session),
+            token_usage=token_usage,
         )
 
         # 6. 응답 구성
@@ -132,6 +233,7 @@ class GameService:
             "playtime": game.playtime,
             "main_character_id": game.main_character_id,
             "main_character_name": main_character.name,
+            "main_character_atlas": self.sprite_manifest.atlas(game.main_character_id),
             "sessions": [
                 {
                     "session_id": session.id,
@@ -144,6 +246,7 @@ class GameService:
                             "dialogue": scene.dialogue,
                             "selections": scene.selections or {},
                             "character_filename": self._get_character_filename(scene.character_id, scene.emotion),
+                            "character_url": self._get_character_url(scene.character_id, scene.emotion),
                         }
                     ],
                     "background_url": session.background_url,
@@ -160,18 +263,10 @@ class GameService:
         elapsed_time: int,
     ) -> Dict:
         """다음 씬 생성"""
-        # 1. 게임, 세션 조회
-        game = self.game_repo.get_game_by_id(game_id)
-        if not game:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND, detail="Game not found"
-            )
-
-        session = self.session_repo.get_session_by_id(session_id)
-        if not session or session.game_id != game_id:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND, detail="Session not found"
-            )
+        # 1. 게임 진행 상태 (게임, 현재 세션 포함)
+        state = self._get_game_state(game_id)
+        game = state.game
+        session = self._get_turn_session(state, game_id, session_id)
 
         # 2. 캐릭터 정보 가져오기
         characters = self.character_repo.get_all_characters()
@@ -200,6 +295,7 @@ class GameService:
         }
 
         # 5. LLM으로 다음 씬 생성
+        self._release_connection()
         new_scene_data, session_ended, new_session_content = (
             self.llm_service.generate_next_scene(
                 game_context=game_context,
@@ -212,6 +308,8 @@ class GameService:
                 main_character_id=game.main_character_id,
             )
         )
+        token_usage = self.llm_service.consume_token_usage()
+        user_emotion = dominant_emotion(emotion)
 
         # 6. 새 세션이 필요한 경우
         if session_ended and new_session_content:
@@ -219,10 +317,10 @@ class GameService:
             self.session_repo.mark_session_completed(session_id)
 
             # 새 세션 생성
-            latest_session = self.session_repo.get_latest_session(game_id)
-            new_session_number = latest_session.session_number + 1
+            new_session_number = state.next_session_number
 
             # 배경 이미지 생성
+            self._release_connection()
             try:
                 background_url = self.bg_generator.create_background_image(
                     new_session_content
@@ -237,6 +335,7 @@ class GameService:
                 content=new_session_content,
                 background_url=background_url,
             )
+            state.next_session_number = new_session_number + 1
 
             # 새 세션의 첫 씬 생성
             new_scene = self.scene_repo.create_scene(
@@ -248,6 +347,9 @@ class GameService:
                 selections=new_scene_data.get("selections"),
                 character_id=new_scene_data.get("character_id"),
                 emotion=new_scene_data.get("emotion"),
+                game_state=state,
+                user_emotion=user_emotion,
+                token_usage=token_usage,
             )
 
             return {
@@ -261,14 +363,19 @@ class GameService:
                         "dialogue": new_scene.dialogue,
                         "selections": new_scene.selections or {},
                         "character_filename": self._get_character_filename(new_scene.character_id, new_scene.emotion),
+                        "character_url": self._get_character_url(new_scene.character_id, new_scene.emotion),
                     }
                 ],
                 "background_url": new_session.background_url,
+                "prefetch": self._get_prefetch_urls(
+                    game.main_character_id,
+                    [*scenes, new_scene],
+                    exclude=[self._get_character_url(new_scene.character_id, new_scene.emotion)],
+                ),
             }
         else:
             # 현재 세션에서 계속
-            latest_scene = self.scene_repo.get_latest_scene(session_id)
-            new_scene_number = latest_scene.scene_number + 1
+            new_scene_number = self._get_next_scene_number(state, session_id)
 
             new_scene = self.scene_repo.create_scene(
                 session_id=session_id,
@@ -279,6 +386,9 @@ class GameService:
                 selections=new_scene_data.get("selections"),
                 character_id=new_scene_data.get("character_id"),
                 emotion=new_scene_data.get("emotion"),
+                game_state=state,
+                user_emotion=user_emotion,
+                token_usage=token_usage,
             )
 
             return {
@@ -292,9 +402,15 @@ class GameService:
                         "dialogue": new_scene.dialogue,
                         "selections": new_scene.selections or {},
                         "character_filename": self._get_character_filename(new_scene.character_id, new_scene.emotion),
+                        "character_url": self._get_character_url(new_scene.character_id, new_scene.emotion),
                     }
                 ],
                 "background_url": session.background_url,
+                "prefetch": self._get_prefetch_urls(
+                    game.main_character_id,
+                    [*scenes, new_scene],
+                    exclude=[self._get_character_url(new_scene.character_id, new_scene.emotion)],
+                ),
             }
 
     def generate_scene_after_selection(
@@ -307,18 +423,10 @@ class GameService:
         elapsed_time: int,
     ) -> Dict:
         """선택지 선택 후 다음 씬 생성"""
-        # 1. 게임, 세션, 씬 조회
-        game = self.game_repo.get_game_by_id(game_id)
-        if not game:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND, detail="Game not found"
-            )
-
-        session = self.session_repo.get_session_by_id(session_id)
-        if not session or session.game_id != game_id:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND, detail="Session not found"
-            )
+        # 1. 게임 진행 상태 (게임, 현재 세션 포함), 씬 조회
+        state = self._get_game_state(game_id)
+        game = state.game
+        session = self._get_turn_session(state, game_id, session_id)
 
         scene = self.scene_repo.get_scene_by_id(scene_id)
         if not scene or scene.session_id != session_id:
@@ -374,6 +482,7 @@ class GameService:
         selected_option = scene.selections[str(selection_id)]
 
         # 7. LLM으로 다음 씬 생성
+        self._release_connection()
         new_scene_data, session_ended, new_session_content = (
             self.llm_service.generate_scene_after_selection(
                 game_context=game_context,
@@ -387,6 +496,8 @@ class GameService:
                 main_character_id=game.main_character_id,
             )
         )
+        token_usage = self.llm_service.consume_token_usage()
+        user_emotion = dominant_emotion(emotion)
 
         # 8. 새 세션이 필요한 경우
         if session_ended and new_session_content:
@@ -394,10 +505,10 @@ class GameService:
             self.session_repo.mark_session_completed(session_id)
 
             # 새 세션 생성
-            latest_session = self.session_repo.get_latest_session(game_id)
-            new_session_number = latest_session.session_number + 1
+            new_session_number = state.next_session_number
 
             # 배경 이미지 생성
+            self._release_connection()
             try:
                 background_url = self.bg_generator.create_background_image(
                     new_session_content
@@ -412,6 +523,7 @@ class GameService:
                 content=new_session_content,
                 background_url=background_url,
             )
+            state.next_session_number = new_session_number + 1
 
             # 새 세션의 첫 씬 생성
             new_scene = self.scene_repo.create_scene(
@@ -423,6 +535,9 @@ class GameService:
                 selections=new_scene_data.get("selections"),
                 character_id=new_scene_data.get("character_id"),
                 emotion=new_scene_data.get("emotion"),
+                game_state=state,
+                user_emotion=user_emotion,
+                token_usage=token_usage,
             )
 
             return {
@@ -436,14 +551,19 @@ class GameService:
                         "dialogue": new_scene.dialogue,
                         "selections": new_scene.selections or {},
                         "character_filename": self._get_character_filename(new_scene.character_id, new_scene.emotion),
+                        "character_url": self._get_character_url(new_scene.character_id, new_scene.emotion),
                     }
                 ],
                 "background_url": new_session.background_url,
+                "prefetch": self._get_prefetch_urls(
+                    game.main_character_id,
+                    [*scenes, new_scene],
+                    exclude=[self._get_character_url(new_scene.character_id, new_scene.emotion)],
+                ),
             }
         else:
             # 현재 세션에서 계속
-            latest_scene = self.scene_repo.get_latest_scene(session_id)
-            new_scene_number = latest_scene.scene_number + 1
+            new_scene_number = self._get_next_scene_number(state, session_id)
 
             new_scene = self.scene_repo.create_scene(
                 session_id=session_id,
@@ -454,6 +574,9 @@ class GameService:
                 selections=new_scene_data.get("selections"),
                 character_id=new_scene_data.get("character_id"),
                 emotion=new_scene_data.get("emotion"),
+                game_state=state,
+                user_emotion=user_emotion,
+                token_usage=token_usage,
             )
 
             return {
@@ -467,7 +590,184 @@ class GameService:
                         "dialogue": new_scene.dialogue,
                         "selections": new_scene.selections or {},
                         "character_filename": self._get_character_filename(new_scene.character_id, new_scene.emotion),
+                        "character_url": self._get_character_url(new_scene.character_id, new_scene.emotion),
                     }
                 ],
                 "background_url": session.background_url,
+                "prefetch": self._get_prefetch_urls(
+                    game.main_character_id,
+                    [*scenes, new_scene],
+                    exclude=[self._get_character_url(new_scene.character_id, new_scene.emotion)],
+                ),
             }
+
+    def fork_game(self, user_id: int, game_id: int, from_scene_id: int) -> Dict:
+        """
+        저장된 게임의 씬에서 분기한 새 게임 생성 (이전 선택지로 돌아가 다른 선택하기)
+        원본 히스토리는 복사하지 않고 참조하므로 히스토리 길이와 관계없이 세션/씬 한 행씩만 복사
+        """
+        game = self.game_repo.get_game_by_id(game_id)
+        if not game or game.user_id != user_id:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Game not found"
+            )
+        self._get_game_state(game_id)  # 보관된 게임은 복원
+
+        scene = self.scene_repo.get_history_scene(game_id, from_scene_id)
+        if not scene:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Scene not found"
+            )
+
+        state = self.game_repo.create_fork(game, scene)
+        fork = state.game
+        session = state.current_session
+        fork_scene = self.scene_repo.get_scene_by_id(state.current_scene_id)
+        main_character = self.character_repo.get_character_by_id(fork.main_character_id)
+
+        return {
+            "game_id": fork.id,
+            "parent_game_id": fork.parent_game_id,
+            "fork_scene_id": fork.fork_scene_id,
+            "personality": fork.personality,
+            "genre": fork.genre,
+            "title": fork.title,
+            "playtime": fork.playtime,
+            "main_character_id": fork.main_character_id,
+            "main_character_name": main_character.name if main_character else "Unknown",
+            "main_character_atlas": self.sprite_manifest.atlas(fork.main_character_id),
+            "sessions": [
+                {
+                    "session_id": session.id,
+                    "content": session.content,
+                    "scenes": [
+                        {
+                            "role": fork_scene.role,
+                            "scene_id": fork_scene.id,
+                            "type": fork_scene.type,
+                            "dialogue": fork_scene.dialogue,
+                            "selections": fork_scene.selections or {},
+                            "character_filename": self._get_character_filename(
+                                fork_scene.character_id, fork_scene.emotion
+                            ),
+                            "character_url": self._get_character_url(fork_scene.character_id, fork_scene.emotion),
+                        }
+                    ],
+                    "background_url": session.background_url,
+                }
+            ],
+        }
+
+    def get_game_version(self, user_id: int, game_id: int) -> int:
+        """게임의 가장 최근 씬 ID (새 씬이 생길 때만 바뀌므로 ETag로 사용)"""
+        game = self.game_repo.get_game_by_id(game_id)
+        if not game or game.user_id != user_id:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Game not found"
+            )
+        latest_scene_id = self._get_latest_scene_id(game_id)
+        if latest_scene_id is None and restore_game(self.db, game_id):
+            latest_scene_id = self.scene_repo.get_latest_scene_ids([game_id]).get(game_id)
+        return latest_scene_id or 0
+
+    def get_game(
+        self,
+        user_id: int,
+        game_id: int,
+        after_scene_id: int = 0,
+        limit: int = 100,
+        latest_scene_id: Optional[int] = None,
+    ) -> Dict:
+        """
+        저장된 게임 조회 (이어하기/크래시 복구용), 씬은 after_scene_id 이후 limit개
+        latest_scene_id: get_game_version으로 이미 조회했다면 재사용
+        """
+        game, history = self.game_repo.get_game_with_scenes(game_id, after_scene_id=after_scene_id, limit=limit)
+        if not game:
+            # 방금 만든 게임은 복제본에 아직 없을 수 있음
+            with use_primary(self.db):
+                game, history = self.game_repo.get_game_with_scenes(
+                    game_id, after_scene_id=after_scene_id, limit=limit
+                )
+        if not game or game.user_id != user_id:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Game not found"
+            )
+        # 자기 세션이 없으면 보관된 게임 (분기 게임도 원본에서 물려받은 세션만 남음)
+        if not any(session.game_id == game_id for session in history) and restore_game(self.db, game_id):
+            game, history = self.game_repo.get_game_with_scenes(game_id, after_scene_id=after_scene_id, limit=limit)
+        if latest_scene_id is None:
+            latest_scene_id = self._get_latest_scene_id(game_id) or 0
+
+        sessions = []
+        last_scene_id = None
+        for session in history:
+            if not session.scenes:
+                continue
+            scenes = sorted(session.scenes, key=lambda sc: sc.scene_number)
+            last_scene_id = max(last_scene_id or 0, scenes[-1].id)
+            sessions.append(
+                {
+                    "session_id": session.id,
+                    "content": session.content,
+                    "background_url": session.background_url,
+                    "scenes": [
+                        {
+                            "role": sc.role,
+                            "scene_id": sc.id,
+                            "type": sc.type,
+                            "dialogue": sc.dialogue,
+                            "selections": sc.selections or {},
+                            "selected_option": sc.selected_option,
+                            "character_filename": self._get_character_filename(sc.character_id, sc.emotion),
+                            "character_url": self._get_character_url(sc.character_id, sc.emotion),
+                        }
+                        for sc in scenes
+                    ],
+                }
+            )
+
+        has_more = last_scene_id is not None and last_scene_id < latest_scene_id
+        return {
+            "game_id": game.id,
+            "personality": game.personality,
+            "genre": game.genre,
+            "title": game.title,
+            "playtime": game.playtime,
+            "main_character_id": game.main_character_id,
+            "main_character_atlas": self.sprite_manifest.atlas(game.main_character_id),
+            "parent_game_id": game.parent_game_id,
+            "sessions": sessions,
+            "latest_scene_id": latest_scene_id or None,
+            "next_after_scene_id": last_scene_id if has_more else None,
+        }
+
+    def list_games(self, user_id: int, before_id: Optional[int] = None, limit: int = 20) -> Dict:
+        """사용자의 게임 목록 (최신 게임부터 keyset 페이지)"""
+        games = self.game_repo.get_games_by_user(user_id, before_id=before_id, limit=limit + 1)
+        has_more = len(games) > limit
+        games = games[:limit]
+        game_ids = [game.id for game in games]
+        # 보관된 게임은 복원하지 않고 보관 행의 마지막 씬 ID 사용
+        latest_scene_ids = {
+            **self.archive_repo.get_latest_scene_ids(game_ids),
+            **self.scene_repo.get_latest_scene_ids(game_ids),
+        }
+        return {
+            "games": [
+                {
+                    "game_id": game.id,
+                    "title": game.title,
+                    "personality": game.personality,
+                    "genre": game.genre,
+                    "playtime": game.playtime,
+                    "main_character_id": game.main_character_id,
+                    "parent_game_id": game.parent_game_id,
+                    "latest_scene_id": latest_scene_ids.get(game.id),
+                    "created_at": game.created_at,
+                    "updated_at": game.updated_at,
+                }
+                for game in games
+            ],
+            "next_before_id": games[-1].id if has_more else None,
+        }
@@ -0,0 +1,249 @@
+import json
+import logging
+import os
+import time
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from application.game_archive import deserialize_game, from_json_row, to_json_row
+from domain.entity.game import Game, Scene, Session as GameSession
+from domain.repository.game_repository import GameArchiveRepository, GameStateRepository, GameTransferRepository
+
+logger = logging.getLogger(__name__)
+
+# JSONL 각 줄의 "table" 값 → 엔티티 (한 묶음 안에서 게임 → 세션 → 씬 순서로 씀)
+TRANSFER_TABLES = {
+    Game.__tablename__: Game,
+    GameSession.__tablename__: GameSession,
+    Scene.__tablename__: Scene,
+}
+
+# 게임 묶음이 끝날 때마다 쓰는 줄 ({"checkpoint": {"last_game_id": ...}}) - 이어서 내보내기/가져오기 기준
+CHECKPOINT_KEY = "checkpoint"
+
+
+def _dump_line(record: Dict) -> str:
+    return json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n"
+
+
+def _report_throughput(report: Dict, started: float) -> None:
+    report["seconds"] = time.perf_counter() - started
+    rows = sum(report[table] for table in TRANSFER_TABLES)
+    report["rows_per_second"] = rows / report["seconds"] if report["seconds"] else 0.0
+
+
+def find_checkpoint(path: str) -> Tuple[int, int]:
+    """마지막 체크포인트 줄 끝의 바이트 위치와 그때까지 내보낸 마지막 게임 ID (없으면 (0, 0))"""
+    offset = checkpoint_offset = last_game_id = 0
+    with open(path, "rb") as f:
+        for line in f:
+            offset += len(line)
+            if line.endswith(b"\n") and line.startswith(b'{"%s"' % CHECKPOINT_KEY.encode()):
+                checkpoint_offset = offset
+                last_game_id = json.loads(line)[CHECKPOINT_KEY]["last_game_id"]
+    return checkpoint_offset, last_game_id
+
+
+def export_games(
+    db: Session,
+    path: str,
+    resume: bool = False,
+    user_id: Optional[int] = None,
+    chunk_size: int = 200,
+    yield_per: int = 1000,
+    max_games: int = 0,
+) -> Dict:
+    """
+    게임 → 세션 → 씬을 한 줄에 한 행씩 JSONL로 내보냄 (보관된 게임은 보관 데이터를 풀어서 포함)
+    게임은 chunk_size개씩 키셋으로, 세션/씬은 yield_per개씩 스트리밍으로 읽어 메모리 사용량이 전체 크기와 무관
+    resume이면 파일의 마지막 체크포인트 뒤를 잘라내고 그다음 게임부터 이어서 씀 (max_games: 0이면 제한 없음)
+    """
+    transfer_repo = GameTransferRepository(db)
+    archive_repo = GameArchiveRepository(db)
+    after_game_id = 0
+    mode = "w"
+    if resume and os.path.exists(path):
+        offset, after_game_id = find_checkpoint(path)
+        with open(path, "r+b") as f:
+            f.truncate(offset)
+        mode = "a"
+
+    report = {table: 0 for table in TRANSFER_TABLES}
+    report.update({"bytes": 0, "last_game_id": after_game_id})
+    started = time.perf_counter()
+
+    def write_row(out, model, row) -> None:
+        line = _dump_line({"table": model.__tablename__, "row": to_json_row(row)})
+        out.write(line)
+        report[model.__tablename__] += 1
+        report["bytes"] += len(line.encode("utf-8"))
+
+    with open(path, mode, encoding="utf-8") as out:
+        while not max_games or report[Game.__tablename__] < max_games:
+            limit = chunk_size if not max_games else min(chunk_size, max_games - report[Game.__tablename__])
+            games = transfer_repo.get_games_after(after_game_id, limit, user_id=user_id)
+            if not games:
+                break
+            game_ids = [game["id"] for game in games]
+
+            for game in games:
+                write_row(out, Game, game)
+            for row in transfer_repo.stream_sessions(game_ids, yield_per):
+                write_row(out, GameSession, row)
+            for row in transfer_repo.stream_scenes(game_ids, yield_per):
+                write_row(out, Scene, row)
+            for game_id in transfer_repo.get_archived_game_ids(game_ids):
+                archive = archive_repo.get_archive(game_id)
+                tables = deserialize_game(archive.data)
+                db.expunge(archive)
+                for row in tables[GameSession.__tablename__]:
+                    write_row(out, GameSession, row)
+                for row in tables[Scene.__tablename__]:
+                    write_row(out, Scene, row)
+
+            after_game_id = game_ids[-1]
+            out.write(_dump_line({CHECKPOINT_KEY: {"last_game_id": after_game_id}}))
+            out.flush()
+            report["last_game_id"] = after_game_id
+            _report_throughput(report, started)
+            logger.info(
+                f"Exported {report[Game.__tablename__]} games up to id {after_game_id} "
+                f"({report['rows_per_second']:.0f} rows/s)"
+            )
+
+    _report_throughput(report, started)
+    return report
+
+
+def _assign_ids(rows: List[Dict], first_id: int, id_map: Dict[str, int]) -> None:
+    """rows에 first_id부터 이어지는 새 ID를 부여하고 원래 ID → 새 ID를 id_map에 기록 (JSON 키라 문자열)"""
+    for new_id, row in enumerate(rows, start=first_id):
+        id_map[str(row["id"])] = new_id
+        row["id"] = new_id
+
+
+def _remap_references(model, row: Dict, id_maps: Dict[str, Dict[str, int]]) -> Optional[int]:
+    """
+    참조하는 ID를 새 ID로 변환
+    원본 게임이 내보내기에 없는 분기 게임은 원본 참조(parent_game_id, fork_scene_id)를 비움
+    분기 지점 씬이 아직 없으면 (원본이 같은 묶음) fork_scene_id를 비우고 원래 씬 ID 반환 (체크포인트에서 변환)
+    """
+    games, sessions, scenes = (id_maps[table] for table in TRANSFER_TABLES)
+    if model is GameSession:
+        row["game_id"] = games[str(row["game_id"])]
+    elif model is Scene:
+        row["session_id"] = sessions[str(row["session_id"])]
+    elif row.get("parent_game_id") is not None:
+        row["parent_game_id"] = games.get(str(row["parent_game_id"]))
+        if row["parent_game_id"] is None:
+            row["fork_scene_id"] = None
+            return None
+        fork_scene_id = row["fork_scene_id"]
+        row["fork_scene_id"] = scenes.get(str(fork_scene_id))
+        if row["fork_scene_id"] is None:
+            return fork_scene_id
+    return None
+
+
+def import_games(
+    db: Session,
+    path: str,
+    state_path: Optional[str] = None,
+    user_id: Optional[int] = None,
+    batch_size: int = 1000,
+) -> Dict:
+    """
+    export_games로 만든 JSONL을 batch_size행씩 executemany로 가져옴
+    새 ID는 insert 직전의 최대 ID 다음부터 차례로 부여하고 원래 ID → 새 ID 맵으로 참조(게임/세션/분기 지점)도 변환
+    (user_id를 주면 모든 게임의 소유자 변경)
+    체크포인트마다 커밋하고 읽은 위치와 게임/씬 ID 맵을 state_path에 기록하므로 중단 후 다시 실행하면 이어서 진행
+    (세션은 같은 묶음의 씬만 참조하므로 묶음마다 비움)
+    진행 상태(game_states)는 가져오지 않고 체크포인트 커밋 전에 묶음의 게임마다 세션/씬에서 다시 계산해 같은 트랜잭션에 저장
+    """
+    transfer_repo = GameTransferRepository(db)
+    state_repo = GameStateRepository(db)
+    offset = 0
+    id_maps = {table: {} for table in TRANSFER_TABLES}
+    if state_path and os.path.exists(state_path):
+        with open(state_path, encoding="utf-8") as f:
+            state = json.load(f)
+        offset = state["offset"]
+        id_maps.update(state["id_maps"])
+
+    report = {table: 0 for table in TRANSFER_TABLES}
+    report["checkpoints"] = 0
+    started = time.perf_counter()
+
+    chunk_counts = {table: 0 for table in TRANSFER_TABLES}  # 아직 커밋하지 않은 행 수
+    pending_model = None
+    pending = []
+    chunk_game_ids = []  # 아직 커밋하지 않은 게임의 새 ID
+    pending_forks = {}  # 분기 지점 씬을 체크포인트에서 변환할 게임의 새 ID → 원래 씬 ID
+
+    def flush() -> None:
+        nonlocal pending
+        if not pending:
+            return
+        table = pending_model.__tablename__
+        _assign_ids(pending, transfer_repo.next_id(pending_model), id_maps[table])
+        for row in pending:
+            unresolved_fork_scene_id = _remap_references(pending_model, row, id_maps)
+            if unresolved_fork_scene_id is not None:
+                pending_forks[row["id"]] = unresolved_fork_scene_id
+            if pending_model is Game:
+                chunk_game_ids.append(row["id"])
+        transfer_repo.insert_rows(pending_model, pending)
+        chunk_counts[table] += len(pending)
+        pending = []
+
+    try:
+        with open(path, "rb") as f:
+            f.seek(offset)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break  # 중단된 내보내기의 마지막 줄
+                offset += len(line)
+                record = json.loads(line)
+
+                if CHECKPOINT_KEY in record:
+                    flush()
+                    scene_ids = id_maps[Scene.__tablename__]
+                    transfer_repo.set_fork_scenes(
+                        {game_id: scene_ids.get(str(scene_id)) for game_id, scene_id in pending_forks.items()}
+                    )
+                    pending_forks.clear()
+                    for game_id in chunk_game_ids:
+                        state_repo.add_rebuilt_state(game_id)
+                    chunk_game_ids.clear()
+                    db.commit()
+                    id_maps[GameSession.__tablename__] = {}
+                    if state_path:
+                        with open(state_path, "w", encoding="utf-8") as state_file:
+                            json.dump({"offset": offset, "id_maps": id_maps, **record[CHECKPOINT_KEY]}, state_file)
+                    for table in TRANSFER_TABLES:
+                        report[table] += chunk_counts[table]
+                        chunk_counts[table] = 0
+                    report["checkpoints"] += 1
+                    _report_throughput(report, started)
+                    logger.info(
+                        f"Imported {report[Game.__tablename__]} games "
+                        f"({report['rows_per_second']:.0f} rows/s)"
+                    )
+                    continue
+
+                model = TRANSFER_TABLES[record["table"]]
+                row = from_json_row(model, record["row"])
+                if model is Game and user_id is not None:
+                    row["user_id"] = user_id
+
+                if model is not pending_model or len(pending) >= batch_size:
+                    flush()
+                    pending_model = model
+                pending.append(row)
+    finally:
+        # 마지막 체크포인트 뒤의 행은 묶음이 완전하지 않으므로 버림
+        db.rollback()
+
+    _report_throughput(report, started)
+    return report
@@ -0,0 +1,246 @@
+import json
+import logging
+import re
+import threading
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+from application.keyword_canonicalizer import canonical_key
+from application.perceptual_hash import find_nearest
+from core.metrics import metrics
+from core.static_files import CONTENT_HASH_PATTERN
+from core.storage import ImageStorage
+
+logger = logging.getLogger(__name__)
+
+# 콘텐츠 해시 도입 이전 파일명: {keyword}_{YYYYMMDD}_{HHMMSS}.png
+LEGACY_FILENAME_PATTERN = re.compile(r"^(?P<keyword>.+)_\d{8}_\d{6}\.png$")
+
+metrics.register_ratio("background_lookup_exact_hit_rate", "background_lookup_exact_hit_total", "background_lookup_total")
+metrics.register_ratio("background_lookup_hit_rate", "background_lookup_hit_total", "background_lookup_total")
+
+
+def clean_keyword(keyword: str) -> str:
+    """키워드를 파일명/인덱스 키로 쓸 수 있도록 정리"""
+    cleaned = re.sub(r'[^\w\s-]', '', keyword)
+    cleaned = re.sub(r'[\s]+', '_', cleaned)
+    return cleaned[:50]
+
+
+class ImageIndex:
+    """
+    배경 이미지 키워드 인덱스
+
+    콘텐츠 해시 파일의 키워드는 저장소의 index.json에,
+    이전 방식({keyword}_{timestamp}.png) 파일은 파일명에서 키워드를 읽음
+    (새 파일은 모두 콘텐츠 해시 방식이므로 저장소 전체 목록은 생성/reconcile 때만 조회)
+
+    index.json은 조건부 쓰기로 수정하므로 여러 워커가 동시에 추가해도 항목을 잃지 않음
+
+    index.json 형식:
+        {"<sha256>": {"keywords": ["rainy_school_corridor"], "filename": "<sha256>.png",
+                      "created_at": "...", "dhash": "<16자리 hex>"}}
+    """
+
+    INDEX_KEY = "index.json"
+    MAX_WRITE_ATTEMPTS = 5
+
+    def __init__(self, storage: ImageStorage):
+        self.__storage = storage
+        self.__lock = threading.Lock()
+        self.__entries: Dict[str, Dict] = {}
+        self.__legacy_keyword_to_filename: Dict[str, str] = {}
+        self.__keyword_to_filename: Dict[str, str] = {}
+        self.__canonical_to_filename: Dict[str, str] = {}
+        self.reconcile()
+
+    def reconcile(self) -> None:
+        """저장소 전체 목록에서 이전 방식 파일의 키워드를 다시 읽고 인덱스 재구성 (시작/정리 작업용)"""
+        try:
+            keys = self.__storage.list()
+        except Exception as e:
+            logger.error(f"Failed to list image storage: {e}")
+            keys = []
+
+        legacy_keyword_to_filename = {}
+        for key in keys:
+            match = LEGACY_FILENAME_PATTERN.match(key)
+            if match and not CONTENT_HASH_PATTERN.match(key[:-len(".png")]):
+                legacy_keyword_to_filename.setdefault(match.group("keyword"), key)
+        with self.__lock:
+            self.__legacy_keyword_to_filename = legacy_keyword_to_filename
+        self.reload()
+
+    def reload(self) -> None:
+        """index.json만 다시 읽어 키워드 / 정규화 키 인덱스 재구성"""
+        try:
+            raw = self.__storage.get(self.INDEX_KEY)
+            entries = json.loads(raw) if raw else {}
+        except Exception as e:
+            logger.error(f"Failed to load image index: {e}")
+            return
+        self.__apply(entries)
+
+    def __apply(self, entries: Dict[str, Dict]) -> None:
+        keyword_to_filename = dict(self.__legacy_keyword_to_filename)
+        # 콘텐츠 해시 파일이 같은 키워드의 이전 파일보다 우선
+        for entry in entries.values():
+            for keyword in entry.get("keywords", []):
+                keyword_to_filename[keyword] = entry["filename"]
+
+        canonical_to_filename = {}
+        for keyword, filename in keyword_to_filename.items():
+            canonical_to_filename.setdefault(canonical_key(keyword), filename)
+
+        with self.__lock:
+            self.__entries = entries
+            self.__keyword_to_filename = keyword_to_filename
+            self.__canonical_to_filename = canonical_to_filename
+
+    def __update(self, mutate: Callable[[Dict[str, Dict]], bool]) -> None:
+        """
+        최신 index.json에 mutate를 적용해 조건부로 저장 (mutate가 False를 돌려주면 저장하지 않음)
+        다른 워커가 먼저 저장했으면 다시 읽어서 재시도
+        """
+        for _ in range(self.MAX_WRITE_ATTEMPTS):
+            raw, version = self.__storage.get_versioned(self.INDEX_KEY)
+            entries = json.loads(raw) if raw else {}
+            if not mutate(entries):
+                self.__apply(entries)
+                return
+            data = json.dumps(entries, ensure_ascii=False).encode("utf-8")
+            if self.__storage.put_if_match(self.INDEX_KEY, data, "application/json", version):
+                self.__apply(entries)
+                return
+            metrics.inc("image_index_write_conflict_total")
+        error_msg = f"Failed to update image index after {self.MAX_WRITE_ATTEMPTS} attempts"
+        logger.error(error_msg)
+        raise RuntimeError(error_msg)
+
+    def keywords(self) -> List[str]:
+        """정규화 키 / 파일마다 대표 키워드 하나씩 (LLM에 전달할 재사용 후보 목록)"""
+        representatives = {}
+        seen_filenames = set()
+        for keyword, filename in self.__keyword_to_filename.items():
+            key = canonical_key(keyword)
+            if key in representatives or filename in seen_filenames:
+                continue
+            representatives[key] = keyword
+            seen_filenames.add(filename)
+        return list(representatives.values())
+
+    def __lookup(self, keyword: str) -> Optional[str]:
+        filename = self.__keyword_to_filename.get(clean_keyword(keyword))
+        if filename is not None:
+            metrics.inc("background_lookup_exact_hit_total")
+            metrics.inc("background_lookup_hit_total")
+            return filename
+        filename = self.__canonical_to_filename.get(canonical_key(keyword))
+        if filename is not None:
+            metrics.inc("background_lookup_canonical_hit_total")
+            metrics.inc("background_lookup_hit_total")
+        return filename
+
+    def find(self, keyword: str) -> Optional[str]:
+        """키워드에 해당하는 이미지 파일명 조회 (정확히 일치 → 정규화 키 일치 순)"""
+        metrics.inc("background_lookup_total")
+        filename = self.__lookup(keyword)
+        if filename is None:
+            # 다른 워커가 추가한 항목이 있을 수 있으므로 미스일 때만 index.json을 다시 읽음
+            self.reload()
+            filename = self.__lookup(keyword)
+        if filename is None:
+            metrics.inc("background_lookup_miss_total")
+        return filename
+
+    def contains(self, keyword: str) -> bool:
+        """같은 장면의 이미지가 인덱스에 있는지 (조회 지표에 집계하지 않음)"""
+        return (
+            clean_keyword(keyword) in self.__keyword_to_filename
+            or canonical_key(keyword) in self.__canonical_to_filename
+        )
+
+    def find_similar(self, dhash: str, max_distance: int) -> Optional[str]:
+        """지각 해시가 max_distance 이내인 가장 비슷한 이미지 파일명 조회"""
+        with self.__lock:
+            candidates = [
+                (entry["dhash"], entry["filename"]) for entry in self.__entries.values() if entry.get("dhash")
+            ]
+        nearest = find_nearest([candidate[0] for candidate in candidates], dhash, max_distance)
+        if nearest is None:
+            return None
+        return candidates[nearest[0]][1]
+
+    def dhashes(self) -> Dict[str, Optional[str]]:
+        """이미지 해시별 지각 해시 (아직 계산하지 않은 이미지는 None)"""
+        self.reload()
+        with self.__lock:
+            return {digest: entry.get("dhash") for digest, entry in self.__entries.items()}
+
+    def set_dhashes(self, dhashes: Dict[str, str]) -> None:
+        """지각 해시 일괄 기록 (기존 이미지 백필용)"""
+
+        def mutate(entries: Dict[str, Dict]) -> bool:
+            changed = False
+            for digest, dhash in dhashes.items():
+                if digest in entries and entries[digest].get("dhash") != dhash:
+                    entries[digest]["dhash"] = dhash
+                    changed = True
+            return changed
+
+        self.__update(mutate)
+
+    def merge(self, canonical_digest: str, duplicate_digests: List[str]) -> None:
+        """유사 이미지들의 키워드를 대표 이미지로 옮기고 나머지 항목은 인덱스에서 제거"""
+
+        def mutate(entries: Dict[str, Dict]) -> bool:
+            canonical = entries.get(canonical_digest)
+            if canonical is None:
+                return False
+            changed = False
+            for digest in duplicate_digests:
+                duplicate = entries.pop(digest, None)
+                if duplicate is None:
+                    continue
+                changed = True
+                for keyword in duplicate.get("keywords", []):
+                    if keyword not in canonical["keywords"]:
+                        canonical["keywords"].append(keyword)
+            return changed
+
+        self.__update(mutate)
+
+    def remove(self, digest: str) -> Optional[Dict]:
+        """이미지를 인덱스에서 제거하고 제거한 항목 반환 (디스크 정리 시 사용, 없었으면 None)"""
+        removed = {}
+
+        def mutate(entries: Dict[str, Dict]) -> bool:
+            removed["entry"] = entries.pop(digest, None)
+            return removed["entry"] is not None
+
+        self.__update(mutate)
+        return removed["entry"]
+
+    def restore(self, digest: str, entry: Dict) -> None:
+        """remove로 뺀 항목을 되돌림 (그 사이 다시 등록되었으면 그대로 둠)"""
+        self.__update(lambda entries: entries.setdefault(digest, entry) is entry)
+
+    def add(self, digest: str, filename: str, keyword: str, dhash: Optional[str] = None) -> None:
+        """이미지를 인덱스에 등록 (같은 해시면 키워드만 병합)"""
+        key = clean_keyword(keyword)
+
+        def mutate(entries: Dict[str, Dict]) -> bool:
+            entry = entries.get(digest)
+            if entry is None:
+                entry = entries[digest] = {
+                    "keywords": [], "filename": filename, "created_at": datetime.utcnow().isoformat()
+                }
+            elif key in entry["keywords"] and (not dhash or entry.get("dhash")):
+                return False
+            if key not in entry["keywords"]:
+                entry["keywords"].append(key)
+            if dhash and not entry.get("dhash"):
+                entry["dhash"] = dhash
+            return True
+
+        self.__update(mutate)
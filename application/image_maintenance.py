@@ -0,0 +1,153 @@
+import io
+import logging
+from datetime import datetime
+from typing import Dict, List
+
+from PIL import Image
+from sqlalchemy.orm import Session
+
+from application.image_index import ImageIndex
+from application.perceptual_hash import cluster_near_duplicates, dhash
+from core.storage import ImageStorage
+from domain.entity.image import GeneratedImage
+from domain.repository.image_repository import ImageRepository
+
+logger = logging.getLogger(__name__)
+
+
+def evict_images(
+    db: Session,
+    storage: ImageStorage,
+    image_index: ImageIndex,
+    quota_bytes: int,
+    batch_size: int = 100,
+    dry_run: bool = False,
+) -> Dict:
+    """
+    전체 용량이 quota_bytes 이하가 될 때까지 세션에서 참조하지 않는 이미지를
+    오래 사용하지 않은 순으로 삭제 (원본과 같은 해시로 시작하는 파생 파일 포함)
+    인덱스에서 먼저 빼서 새 게임이 고르지 못하게 한 뒤 참조를 다시 확인하고 파일 삭제
+    """
+    image_repo = ImageRepository(db)
+    total_bytes = image_repo.get_total_bytes()
+    report = {"total_bytes_before": total_bytes, "evicted": 0, "freed_bytes": 0, "skipped_referenced": 0}
+
+    evicted_hashes = set()
+    while total_bytes > quota_bytes:
+        candidates = [
+            image for image in image_repo.get_eviction_candidates(batch_size + len(evicted_hashes))
+            if image.hash not in evicted_hashes
+        ]
+        if not candidates:
+            logger.warning("No more unreferenced images to evict, quota still exceeded")
+            break
+
+        for image in candidates:
+            if total_bytes <= quota_bytes:
+                break
+
+            # 참조 수가 어긋난 경우를 대비해 실제 세션 URL과 보관된 게임을 다시 확인
+            if image_repo.is_referenced(image.hash):
+                report["skipped_referenced"] += 1
+                image.reference_count = max(image.reference_count, 1)
+                db.commit()
+                continue
+
+            evicted_hashes.add(image.hash)
+            if not dry_run:
+                entry = image_index.remove(image.hash)
+                # 확인과 인덱스 제거 사이에 이 이미지를 고른 세션이 있으면 되돌림
+                db.commit()
+                db.refresh(image)
+                if image.reference_count > 0 or image_repo.is_referenced(image.hash):
+                    report["skipped_referenced"] += 1
+                    if entry is not None:
+                        image_index.restore(image.hash, entry)
+                    continue
+
+            total_bytes -= image.bytes
+            report["evicted"] += 1
+            report["freed_bytes"] += image.bytes
+            logger.info(f"Evicting image {image.filename} (last used {image.last_used_at})")
+            if dry_run:
+                continue
+
+            for key in storage.list(image.hash):
+                storage.delete(key)
+            image_repo.delete_image(image)
+
+    report["total_bytes_after"] = total_bytes
+    return report
+
+
+def backfill_dhashes(storage: ImageStorage, image_index: ImageIndex) -> int:
+    """지각 해시가 없는 기존 이미지의 dHash 계산 후 인덱스에 기록 (계산한 개수 반환)"""
+    computed = {}
+    for digest, existing in image_index.dhashes().items():
+        if existing:
+            continue
+        data = storage.get(f"{digest}.png")
+        if data is None:
+            continue
+        try:
+            with Image.open(io.BytesIO(data)) as img:
+                computed[digest] = dhash(img)
+        except Exception as e:
+            logger.error(f"Failed to compute dhash for {digest}: {e}")
+    if computed:
+        image_index.set_dhashes(computed)
+    return len(computed)
+
+
+def dedupe_images(
+    db: Session,
+    storage: ImageStorage,
+    image_index: ImageIndex,
+    max_distance: int,
+    dry_run: bool = False,
+) -> Dict:
+    """
+    대표 이미지와 dHash 해밍 거리가 max_distance 이하인 이미지를 묶어 키워드를 대표 이미지 하나로 합치고
+    나머지 파일은 삭제 (세션이나 보관된 게임이 참조하는 파일은 인덱스에서만 빼고 남겨둠)
+    """
+    image_repo = ImageRepository(db)
+    report = {"hashed": 0, "clusters": 0, "merged": 0, "deleted": 0, "freed_bytes": 0, "kept_referenced": 0}
+
+    if not dry_run:
+        report["hashed"] = backfill_dhashes(storage, image_index)
+    hashes = {digest: value for digest, value in image_index.dhashes().items() if value}
+    images = image_repo.get_images(list(hashes))
+
+    for cluster in cluster_near_duplicates(hashes, max_distance, priority=_canonical_priority(images, hashes)):
+        report["clusters"] += 1
+        canonical, duplicates = cluster[0], cluster[1:]
+        report["merged"] += len(duplicates)
+        logger.info(f"Merging {len(duplicates)} near-duplicates into {canonical}")
+        if dry_run:
+            continue
+
+        image_index.merge(canonical, duplicates)
+        for digest in duplicates:
+            image = images.get(digest)
+            if (image is not None and image.reference_count > 0) or image_repo.is_referenced(digest):
+                report["kept_referenced"] += 1
+                continue
+            for key in storage.list(digest):
+                storage.delete(key)
+            if image is not None:
+                report["freed_bytes"] += image.bytes
+                image_repo.delete_image(image)
+            report["deleted"] += 1
+
+    return report
+
+
+def _canonical_priority(images: Dict[str, GeneratedImage], digests) -> List[str]:
+    """대표 이미지 우선순위 - 참조 수가 많고 먼저 생성된 이미지부터 (등록되지 않은 이미지는 마지막)"""
+    def sort_key(digest: str):
+        image = images.get(digest)
+        if image is None:
+            return (1, 0, datetime.max, digest)
+        return (0, -image.reference_count, image.created_at, digest)
+
+    return sorted(digests, key=sort_key)
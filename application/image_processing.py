@@ -0,0 +1,198 @@
+import binascii
+import io
+import logging
+import random
+import threading
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Optional
+
+from PIL import Image
+
+from application.perceptual_hash import dhash
+from core.config import get_settings
+from core.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# base64 디코딩 단위 (4의 배수여야 패딩 없이 잘림)
+DECODE_CHUNK_CHARS = 64 * 1024
+
+
+@dataclass
+class ProcessedImage:
+    """후처리(16:9 크롭 + PNG 인코딩)가 끝난 이미지"""
+
+    png_bytes: bytes
+    width: int
+    height: int
+    dhash: str  # 유사 이미지 판별용 지각 해시
+    cpu_seconds: float
+    peak_memory_bytes: Optional[int]  # measure_memory일 때만 측정 (아니면 None)
+
+
+def decode_base64_into_buffer(image_base64: str) -> io.BytesIO:
+    """
+    base64 문자열을 미리 할당한 버퍼에 조각 단위로 디코딩
+    (전체 디코딩 결과의 중간 사본 없이 PIL이 바로 읽을 수 있는 스트림 반환)
+    """
+    data = image_base64
+    if "\n" in data:
+        data = "".join(data.split())
+    padding = len(data) - len(data.rstrip("="))
+    decoded_size = len(data) // 4 * 3 - padding
+
+    stream = io.BytesIO(bytes(decoded_size))
+    with stream.getbuffer() as buffer:
+        offset = 0
+        for start in range(0, len(data), DECODE_CHUNK_CHARS):
+            chunk = binascii.a2b_base64(data[start:start + DECODE_CHUNK_CHARS])
+            buffer[offset:offset + len(chunk)] = chunk
+            offset += len(chunk)
+    stream.truncate(offset)
+    stream.seek(0)
+    return stream
+
+
+def process_background_image(image_base64: str, max_pixels: int, measure_memory: bool = False) -> ProcessedImage:
+    """
+    base64 이미지를 디코딩하여 16:9로 중앙 크롭 후 PNG로 인코딩
+    (프로세스 풀 워커에서 실행되므로 모듈 레벨 함수)
+    measure_memory면 tracemalloc으로 최대 메모리 측정 (할당마다 추적 비용이 들어 일부 이미지만)
+    """
+    cpu_started = time.process_time()
+    if measure_memory:
+        tracemalloc.start()
+    try:
+        image_stream = decode_base64_into_buffer(image_base64)
+
+        # 헤더만 읽은 상태에서 픽셀 수 확인 (디코딩 전에 거부)
+        img = Image.open(image_stream)
+        original_width, original_height = img.size
+        if original_width * original_height > max_pixels:
+            raise ValueError(
+                f"Image too large: {original_width}x{original_height} exceeds {max_pixels} pixels"
+            )
+
+        logger.info(f"Original image size: {original_width}x{original_height}")
+        # 픽셀 버퍼 크기 (Pillow의 C 메모리는 tracemalloc에 잡히지 않으므로 직접 계산)
+        pixel_bytes = original_width * original_height * len(img.getbands())
+
+        # Calculate 16:9 dimensions
+        target_ratio = 16 / 9
+        current_ratio = original_width / original_height
+
+        if abs(current_ratio - target_ratio) > 0.01:  # If not already 16:9
+            # Crop to 16:9 from center
+            if current_ratio > target_ratio:
+                # Image is wider, crop width
+                new_width = int(original_height * target_ratio)
+                left = (original_width - new_width) // 2
+                img = img.crop((left, 0, left + new_width, original_height))
+            else:
+                # Image is taller, crop height
+                new_height = int(original_width / target_ratio)
+                top = (original_height - new_height) // 2
+                img = img.crop((0, top, original_width, top + new_height))
+
+            logger.info(f"Cropped to 16:9: {img.size[0]}x{img.size[1]}")
+            pixel_bytes += img.size[0] * img.size[1] * len(img.getbands())
+
+        # Encode as PNG
+        output = io.BytesIO()
+        img.save(output, "PNG")
+        width, height = img.size
+        perceptual_hash = dhash(img)
+        img.close()
+        image_stream.close()
+
+        peak_memory_bytes = None
+        if measure_memory:
+            _, traced_peak = tracemalloc.get_traced_memory()
+            peak_memory_bytes = traced_peak + pixel_bytes
+        return ProcessedImage(
+            png_bytes=output.getvalue(),
+            width=width,
+            height=height,
+            dhash=perceptual_hash,
+            cpu_seconds=time.process_time() - cpu_started,
+            peak_memory_bytes=peak_memory_bytes,
+        )
+    finally:
+        if measure_memory:
+            tracemalloc.stop()
+
+
+class ImageProcessor:
+    """
+    이미지 후처리를 별도 프로세스에서 실행 (요청 스레드가 GIL을 잡지 않도록)
+    대기 + 실행 중인 작업 수를 제한하여 메모리 사용량 상한 유지
+    (슬롯은 워커 작업이 실제로 끝날 때 반환하므로 제한 시간을 넘긴 작업도 끝날 때까지 자리를 차지)
+    """
+
+    def __init__(
+        self, max_workers: int, queue_size: int, max_pixels: int, timeout: float, memory_sample_rate: float = 0.0
+    ):
+        self.__executor = ProcessPoolExecutor(max_workers=max_workers)
+        self.__slots = threading.BoundedSemaphore(max_workers + queue_size)
+        self.__max_pixels = max_pixels
+        self.__timeout = timeout
+        self.__memory_sample_rate = memory_sample_rate
+
+    def process(self, image_base64: str) -> ProcessedImage:
+        queued_at = time.perf_counter()
+        if not self.__slots.acquire(timeout=self.__timeout):
+            metrics.inc("image_process_rejected_total")
+            raise RuntimeError("Image processing queue is full")
+        measure_memory = random.random() < self.__memory_sample_rate
+        try:
+            future = self.__executor.submit(process_background_image, image_base64, self.__max_pixels, measure_memory)
+        except BaseException:
+            self.__slots.release()
+            raise
+        future.add_done_callback(lambda _: self.__slots.release())
+        result = future.result(timeout=max(self.__timeout - (time.perf_counter() - queued_at), 0))
+
+        metrics.observe("image_process_seconds", time.perf_counter() - queued_at)
+        metrics.observe("image_process_cpu_seconds", result.cpu_seconds)
+        memory = ""
+        if result.peak_memory_bytes is not None:
+            metrics.observe("image_process_peak_memory_bytes", result.peak_memory_bytes)
+            memory = f", peak memory {result.peak_memory_bytes / 1024 / 1024:.1f}MB"
+        logger.info(
+            f"Image processed: {result.width}x{result.height}, cpu {result.cpu_seconds * 1000:.0f}ms{memory}"
+        )
+        return result
+
+    def shutdown(self) -> None:
+        self.__executor.shutdown(wait=False, cancel_futures=True)
+
+
+_image_processor: Optional[ImageProcessor] = None
+_image_processor_lock = threading.Lock()
+
+
+def get_image_processor() -> ImageProcessor:
+    """프로세스 전체에서 공유하는 이미지 후처리 풀"""
+    global _image_processor
+    with _image_processor_lock:
+        if _image_processor is None:
+            settings = get_settings()
+            _image_processor = ImageProcessor(
+                max_workers=settings.IMAGE_PROCESS_WORKERS,
+                queue_size=settings.IMAGE_PROCESS_QUEUE_SIZE,
+                max_pixels=settings.IMAGE_MAX_PIXELS,
+                timeout=settings.IMAGE_PROCESS_TIMEOUT,
+                memory_sample_rate=settings.IMAGE_PROCESS_MEMORY_SAMPLE_RATE,
+            )
+        return _image_processor
+
+
+def shutdown_image_processor() -> None:
+    global _image_processor
+    with _image_processor_lock:
+        if _image_processor is not None:
+            _image_processor.shutdown()
+            _image_processor = None
@@ -0,0 +1,110 @@
+import hashlib
+import logging
+import re
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Callable, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from core.metrics import metrics
+from domain.repository.image_repository import BackgroundKeywordRepository
+
+logger = logging.getLogger(__name__)
+
+metrics.register_ratio("keyword_cache_hit_rate", "keyword_cache_hit_total", "keyword_cache_lookup_total")
+
+
+def normalize_story(story: str) -> str:
+    """거의 같은 장면 설명이 같은 키가 되도록 정규화 (유니코드/공백/대소문자/끝 문장부호)"""
+    story = unicodedata.normalize("NFC", story)
+    story = re.sub(r"\s+", " ", story).strip().lower()
+    return story.rstrip(".!?…~ ")
+
+
+def story_hash(story: str) -> str:
+    return hashlib.sha256(normalize_story(story).encode("utf-8")).hexdigest()
+
+
+class KeywordCache:
+    """
+    장면 설명 → 배경 키워드 캐시
+    메모리 LRU(TTL)를 먼저 보고, 없으면 DB 테이블(워커 간 공유, 재시작 후에도 유지)을 조회
+    """
+
+    def __init__(self, session_factory: Optional[Callable[[], Session]], max_size: int, ttl_seconds: int):
+        self.__session_factory = session_factory
+        self.__max_size = max_size
+        self.__ttl_seconds = ttl_seconds
+        self.__lock = threading.Lock()
+        self.__entries: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+
+    def get(self, story: str) -> Optional[str]:
+        key = story_hash(story)
+        metrics.inc("keyword_cache_lookup_total")
+
+        with self.__lock:
+            entry = self.__entries.get(key)
+            if entry is not None:
+                keyword, expires_at = entry
+                if expires_at > time.time():
+                    self.__entries.move_to_end(key)
+                    metrics.inc("keyword_cache_hit_total")
+                    metrics.inc("keyword_cache_memory_hit_total")
+                    return keyword
+                del self.__entries[key]
+
+        keyword = self.__load(key)
+        if keyword is not None:
+            self.__remember(key, keyword)
+            metrics.inc("keyword_cache_hit_total")
+            metrics.inc("keyword_cache_db_hit_total")
+            return keyword
+
+        metrics.inc("keyword_cache_miss_total")
+        return None
+
+    def set(self, story: str, keyword: str) -> None:
+        key = story_hash(story)
+        self.__remember(key, keyword)
+        self.__store(key, keyword)
+
+    def __remember(self, key: str, keyword: str) -> None:
+        with self.__lock:
+            self.__entries[key] = (keyword, time.time() + self.__ttl_seconds)
+            self.__entries.move_to_end(key)
+            while len(self.__entries) > self.__max_size:
+                self.__entries.popitem(last=False)
+
+    def __load(self, key: str) -> Optional[str]:
+        if self.__session_factory is None:
+            return None
+        db = self.__session_factory()
+        try:
+            entry = BackgroundKeywordRepository(db).get_keyword(key)
+            if entry is None:
+                return None
+            if entry.created_at < datetime.utcnow() - timedelta(seconds=self.__ttl_seconds):
+                return None
+            return entry.keyword
+        except Exception as e:
+            # 캐시 조회 실패는 LLM 호출로 대체
+            logger.error(f"Failed to load keyword cache entry: {e}")
+            return None
+        finally:
+            db.close()
+
+    def __store(self, key: str, keyword: str) -> None:
+        if self.__session_factory is None:
+            return
+        db = self.__session_factory()
+        try:
+            BackgroundKeywordRepository(db).save_keyword(key, keyword)
+        except Exception as e:
+            logger.error(f"Failed to store keyword cache entry: {e}")
+            db.rollback()
+        finally:
+            db.close()
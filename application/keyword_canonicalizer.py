@@ -0,0 +1,118 @@
+import re
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+# 검색어 의미에 영향을 주지 않는 단어 (inside/outside/view처럼 장면을 바꾸는 단어는 넣지 않음)
+STOP_WORDS = {
+    "a", "an", "the", "of", "in", "at", "on", "with", "and", "by", "near",
+    "scene", "background", "anime", "style",
+}
+
+# 동의어 → 대표 단어 (hall, shower, clear, bright처럼 장소/묘사로도 쓰이는 단어는 넣지 않음)
+SYNONYMS = {
+    "hallway": "corridor",
+    "passage": "corridor",
+    "evening": "sunset",
+    "dusk": "sunset",
+    "twilight": "sunset",
+    "sundown": "sunset",
+    "nighttime": "night",
+    "midnight": "night",
+    "dawn": "morning",
+    "sunrise": "morning",
+    "noon": "afternoon",
+    "midday": "afternoon",
+    "daytime": "afternoon",
+    "rain": "rainy",
+    "raining": "rainy",
+    "drizzle": "rainy",
+    "snow": "snowy",
+    "snowing": "snowy",
+    "sun": "sunny",
+    "sunlit": "sunny",
+    "cloud": "cloudy",
+    "clouds": "cloudy",
+    "overcast": "cloudy",
+    "fog": "foggy",
+    "mist": "foggy",
+    "misty": "foggy",
+    "storm": "stormy",
+    "thunderstorm": "stormy",
+    "roof": "rooftop",
+    "schoolyard": "playground",
+    "coffeeshop": "cafe",
+    "café": "cafe",
+    "classrooms": "classroom",
+    "streets": "street",
+    "parks": "park",
+}
+
+WEATHER_FACETS = {"sunny", "rainy", "cloudy", "snowy", "foggy", "stormy"}
+TIME_FACETS = {"morning", "afternoon", "sunset", "night"}
+
+
+@dataclass(frozen=True)
+class CanonicalKeyword:
+    """정규화된 배경 키워드 (장소 토큰 + 날씨/시간대 facet)"""
+
+    place: Tuple[str, ...]
+    weather: Optional[str] = None
+    time_of_day: Optional[str] = None
+
+    @property
+    def key(self) -> str:
+        """인덱스 조회용 키 - 단어 순서와 무관하게 같은 장면이면 같은 값"""
+        return "|".join([
+            "_".join(self.place),
+            self.weather or "",
+            self.time_of_day or "",
+        ])
+
+
+def canonicalize_keyword(keyword: str) -> CanonicalKeyword:
+    """
+    배경 키워드 정규화
+    소문자화 → 토큰 분리 → 불용어 제거 → 동의어 치환 → 날씨/시간대 facet 분리 → 정렬
+    예: "Rainy school hallway", "school corridor rainy" → ("corridor", "school"), rainy
+    """
+    tokens = re.split(r"[^\w]+|_", keyword.lower())
+
+    place = set()
+    weather = None
+    time_of_day = None
+    for token in tokens:
+        if not token or token in STOP_WORDS:
+            continue
+        token = SYNONYMS.get(token, token)
+        if token in WEATHER_FACETS:
+            weather = weather or token
+        elif token in TIME_FACETS:
+            time_of_day = time_of_day or token
+        else:
+            place.add(token)
+
+    return CanonicalKeyword(place=tuple(sorted(place)), weather=weather, time_of_day=time_of_day)
+
+
+def canonical_key(keyword: str) -> str:
+    return canonicalize_keyword(keyword).key
+
+
+def with_facet(keyword: str, facet: str) -> str:
+    """
+    키워드의 같은 종류 facet(날씨 또는 시간대)을 바꾼 변형 키워드
+    예: with_facet("sunny school rooftop", "rainy") → "rainy school rooftop"
+    """
+    facet = SYNONYMS.get(facet.lower(), facet.lower())
+    if facet in WEATHER_FACETS:
+        same_kind = WEATHER_FACETS
+    elif facet in TIME_FACETS:
+        same_kind = TIME_FACETS
+    else:
+        raise ValueError(f"Unknown facet: {facet}")
+
+    words = [
+        word for word in keyword.split()
+        if SYNONYMS.get(re.sub(r"[^\w]+", "", word.lower()), word.lower()) not in same_kind
+    ]
+    return " ".join([facet] + words)
@@ -1,6 +1,7 @@
 from google import genai
 import os
 import json
+import threading
 from typing import Dict, List, Optional, Tuple
 from dotenv import load_dotenv
 
@@ -14,6 +15,19 @@ class LLMService:
         GEMINI_API_KEY = os.getenv("GEMINI_TOKEN")
         self.__client = genai.Client(api_key=GEMINI_API_KEY)
         self.gemini_model = os.getenv("GEMINI_MODEL")
+        # 요청 스레드별 토큰 사용량 (인스턴스는 프로세스 전체에서 공유)
+        self.__usage = threading.local()
+
+    def __record_usage(self, response) -> None:
+        usage = getattr(response, "usage_metadata", None)
+        tokens = getattr(usage, "total_token_count", None) or 0
+        self.__usage.tokens = tokens
+
+    def consume_token_usage(self) -> int:
+        """현재 스레드의 마지막 생성 호출이 사용한 토큰 수 (확인 후 0으로 초기화)"""
+        tokens = getattr(self.__usage, "tokens", 0)
+        self.__usage.tokens = 0
+        return tokens
 
     def generate_game_structure(
         self, personality: str, genre: str, playtime: int, characters: List[Dict]
@@ -82,6 +96,7 @@ class LLMService:
             model=self.gemini_model,
             contents=[prompt],
         )
+        self.__record_usage(response)
 
         response_text = response.candidates[0].content.parts[0].text.strip()
 
@@ -271,6 +286,7 @@ class LLMService:
             model=self.gemini_model,
             contents=[prompt],
         )
+        self.__record_usage(response)
 
         response_text = response.candidates[0].content.parts[0].text.strip()
 
@@ -452,6 +468,7 @@ class LLMService:
             model=self.gemini_model,
             contents=[prompt],
         )
+        self.__record_usage(response)
 
         response_text = response.candidates[0].content.parts[0].text.strip()
 
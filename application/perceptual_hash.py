@@ -0,0 +1,69 @@
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from PIL import Image
+
+# dHash 크기 (HASH_SIZE x HASH_SIZE 비트 = 64비트)
+HASH_SIZE = 8
+
+# 바이트 값별 1인 비트 수 (XOR 결과의 해밍 거리 계산용)
+POPCOUNT = np.array([bin(value).count("1") for value in range(256)], dtype=np.uint8)
+
+
+def dhash(image: Image.Image) -> str:
+    """
+    difference hash - 흑백 (9x8) 축소본에서 좌우 인접 픽셀의 밝기 비교
+    크기/압축/색감이 조금 달라도 같은 장면이면 해밍 거리가 작음 (16자리 hex)
+    """
+    small = image.convert("L").resize((HASH_SIZE + 1, HASH_SIZE), Image.LANCZOS)
+    pixels = np.asarray(small, dtype=np.int16)
+    bits = pixels[:, 1:] > pixels[:, :-1]
+    return np.packbits(bits).tobytes().hex()
+
+
+def pack_hashes(hashes: List[str]) -> np.ndarray:
+    """hex 해시 목록을 (n, 8) uint8 비트 행렬로 변환"""
+    if not hashes:
+        return np.zeros((0, HASH_SIZE * HASH_SIZE // 8), dtype=np.uint8)
+    return np.frombuffer(bytes.fromhex("".join(hashes)), dtype=np.uint8).reshape(len(hashes), -1)
+
+
+def hamming_distances(packed: np.ndarray, target: np.ndarray) -> np.ndarray:
+    """packed의 각 행과 target 사이의 해밍 거리 (target은 (8,) 또는 (m, 1, 8))"""
+    return POPCOUNT[np.bitwise_xor(packed, target)].sum(axis=-1, dtype=np.int32)
+
+
+def find_nearest(hashes: List[str], target: str, max_distance: int) -> Optional[Tuple[int, int]]:
+    """max_distance 이내에서 가장 가까운 해시의 (인덱스, 거리) - 없으면 None"""
+    if not hashes or max_distance < 0:
+        return None
+    distances = hamming_distances(pack_hashes(hashes), pack_hashes([target])[0])
+    nearest = int(distances.argmin())
+    if distances[nearest] > max_distance:
+        return None
+    return nearest, int(distances[nearest])
+
+
+def cluster_near_duplicates(
+    hashes: Dict[str, str], max_distance: int, priority: Optional[List[str]] = None
+) -> List[List[str]]:
+    """
+    대표 이미지와의 해밍 거리가 max_distance 이하인 이미지끼리 묶음 (묶음의 첫 항목이 대표)
+    priority 순서대로 아직 묶이지 않은 이미지를 대표로 삼으므로 A~B, B~C여도 A와 C가 멀면 다른 묶음
+    hashes: {이미지 해시: dHash}, priority: 대표 우선순위 (빠진 이미지는 해시 순으로 뒤에), 반환: 2개 이상인 묶음 목록
+    """
+    ranked = [key for key in priority or [] if key in hashes]
+    keys = ranked + sorted(set(hashes) - set(ranked))
+    packed = pack_hashes([hashes[key] for key in keys])
+    unassigned = np.ones(len(keys), dtype=bool)
+
+    clusters = []
+    for i in range(len(keys)):
+        if not unassigned[i]:
+            continue
+        unassigned[i] = False
+        near = np.nonzero(unassigned & (hamming_distances(packed, packed[i]) <= max_distance))[0]
+        if len(near):
+            unassigned[near] = False
+            clusters.append([keys[i]] + [keys[j] for j in near.tolist()])
+    return clusters
@@ -0,0 +1,102 @@
+import logging
+import threading
+import time
+from datetime import datetime
+from typing import Callable, Dict, Optional
+
+from sqlalchemy.orm import Session
+
+from core.config import get_settings
+from core.database import SessionLocal
+from core.metrics import metrics
+from domain.repository.user_repository import UserRepository
+
+logger = logging.getLogger(__name__)
+
+
+def purge_expired_refresh_tokens(
+    db: Session, batch_size: int = 1000, max_batches: int = 0, pause_seconds: float = 0.0
+) -> Dict:
+    """
+    만료된 리프레시 토큰을 batch_size개씩 삭제 (배치마다 커밋해 잠금을 짧게 유지)
+    max_batches: 0이면 만료된 토큰이 없을 때까지
+    """
+    user_repo = UserRepository(db)
+    now = datetime.utcnow()
+    report = {"deleted": 0, "batches": 0}
+    while not max_batches or report["batches"] < max_batches:
+        token_ids = user_repo.get_expired_refresh_token_ids(now, batch_size)
+        if not token_ids:
+            break
+        report["deleted"] += user_repo.delete_refresh_tokens_by_ids(token_ids)
+        report["batches"] += 1
+        if len(token_ids) < batch_size:
+            break
+        if pause_seconds:
+            time.sleep(pause_seconds)
+    metrics.inc("refresh_token_purged_total", report["deleted"])
+    return report
+
+
+class RefreshTokenPurger:
+    """interval_seconds마다 만료된 리프레시 토큰을 정리하는 백그라운드 스레드 (워커마다 하나, 삭제는 중복 실행해도 안전)"""
+
+    def __init__(self, session_factory: Callable[[], Session], interval_seconds: float, batch_size: int):
+        self.session_factory = session_factory
+        self.interval_seconds = interval_seconds
+        self.batch_size = batch_size
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def run_once(self) -> Dict:
+        db = self.session_factory()
+        try:
+            return purge_expired_refresh_tokens(db, batch_size=self.batch_size)
+        finally:
+            db.close()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval_seconds):
+            try:
+                report = self.run_once()
+                if report["deleted"]:
+                    logger.info(f"Purged {report['deleted']} expired refresh tokens")
+            except Exception as e:
+                logger.warning(f"Refresh token purge failed: {e}")
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="refresh-token-purger", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+
+
+_purger: Optional[RefreshTokenPurger] = None
+_purger_lock = threading.Lock()
+
+
+def start_refresh_token_purger() -> None:
+    """서버 시작 시 백그라운드 정리 시작 (REFRESH_TOKEN_PURGE_INTERVAL_SECONDS가 0이면 시작하지 않음)"""
+    global _purger
+    settings = get_settings()
+    if settings.REFRESH_TOKEN_PURGE_INTERVAL_SECONDS <= 0:
+        return
+    with _purger_lock:
+        if _purger is None:
+            _purger = RefreshTokenPurger(
+                SessionLocal,
+                settings.REFRESH_TOKEN_PURGE_INTERVAL_SECONDS,
+                settings.REFRESH_TOKEN_PURGE_BATCH_SIZE,
+            )
+            _purger.start()
+
+
+def stop_refresh_token_purger() -> None:
+    global _purger
+    with _purger_lock:
+        if _purger is not None:
+            _purger.stop()
+            _purger = None
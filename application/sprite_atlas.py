@@ -0,0 +1,131 @@
+import hashlib
+import io
+import json
+import logging
+import math
+import os
+import uuid
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from PIL import Image
+
+from application.sprite_manifest import ATLAS_INDEX_FILENAME, Sprite, SpriteManifest, sprites_source_hash
+
+logger = logging.getLogger(__name__)
+
+# 프레임 사이 여백 (필터링 시 옆 프레임 픽셀이 번지지 않도록)
+FRAME_PADDING = 2
+
+
+def pack_frames(sprites: List[Sprite], padding: int = FRAME_PADDING) -> Tuple[int, int, Dict[str, Dict]]:
+    """
+    스프라이트를 정사각형에 가까운 격자로 배치 (행마다 높이는 그 행의 최대 높이)
+    반환: (아틀라스 너비, 높이, 표정별 프레임 좌표)
+    """
+    columns = max(1, math.ceil(math.sqrt(len(sprites))))
+    frames = {}
+    width = height = 0
+    for row_start in range(0, len(sprites), columns):
+        row = sprites[row_start:row_start + columns]
+        x = 0
+        for sprite in row:
+            frames[sprite.emotion] = {"x": x, "y": height, "width": sprite.width, "height": sprite.height}
+            x += sprite.width + padding
+        width = max(width, x - padding)
+        height += max(sprite.height for sprite in row) + padding
+    return width, max(0, height - padding), frames
+
+
+def build_character_atlas(
+    sprite_dir: Path,
+    sprites: List[Sprite],
+    lossless: bool = True,
+    quality: int = 90,
+) -> Tuple[bytes, Dict]:
+    """캐릭터 스프라이트를 WebP 아틀라스 한 장으로 합침 (아틀라스 바이트, 프레임 정보)"""
+    width, height, frames = pack_frames(sprites)
+    atlas = Image.new("RGBA", (width, height), (0, 0, 0, 0))
+    for sprite in sprites:
+        frame = frames[sprite.emotion]
+        with Image.open(sprite_dir / sprite.filename) as img:
+            atlas.paste(img.convert("RGBA"), (frame["x"], frame["y"]))
+
+    output = io.BytesIO()
+    atlas.save(output, "WEBP", lossless=lossless, quality=quality, method=6)
+    atlas.close()
+    return output.getvalue(), {"width": width, "height": height, "frames": frames}
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    tmp_path = path.with_name(f".{path.name}.{uuid.uuid4().hex}.tmp")
+    tmp_path.write_bytes(data)
+    os.replace(tmp_path, path)
+
+
+def build_atlases(
+    manifest: SpriteManifest,
+    sprite_dir: Path,
+    atlas_dir: Path,
+    force: bool = False,
+    lossless: bool = True,
+    quality: int = 90,
+) -> Dict:
+    """
+    스프라이트가 바뀐 캐릭터만 아틀라스를 다시 만들고 index.json 갱신
+    아틀라스/프레임 파일명은 내용의 sha256 ({hash}.webp, {hash}.json)
+    """
+    atlas_dir.mkdir(parents=True, exist_ok=True)
+    index_path = atlas_dir / ATLAS_INDEX_FILENAME
+    try:
+        index = json.loads(index_path.read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        index = {}
+
+    report = {"built": [], "skipped": [], "removed": [], "bytes": 0}
+    character_ids = manifest.character_ids()
+
+    for character_id in character_ids:
+        sprites = manifest.sprites(character_id)
+        source_hash = sprites_source_hash(sprites)
+        previous = index.get(str(character_id))
+        if (
+            not force
+            and previous
+            and previous.get("source_hash") == source_hash
+            and (atlas_dir / previous["image"]).is_file()
+        ):
+            report["skipped"].append(character_id)
+            continue
+
+        data, atlas = build_character_atlas(sprite_dir, sprites, lossless=lossless, quality=quality)
+        digest = hashlib.sha256(data).hexdigest()
+        frames_data = json.dumps(atlas["frames"], sort_keys=True).encode("utf-8")
+        _write_atomic(atlas_dir / f"{digest}.webp", data)
+        _write_atomic(atlas_dir / f"{digest}.json", frames_data)
+
+        index[str(character_id)] = {
+            "source_hash": source_hash,
+            "image": f"{digest}.webp",
+            "frames_file": f"{digest}.json",
+            **atlas,
+        }
+        if previous and previous.get("image") != f"{digest}.webp":
+            _remove_atlas_files(atlas_dir, previous)
+        report["built"].append(character_id)
+        report["bytes"] += len(data)
+        logger.info(f"Built sprite atlas for character {character_id}: {len(sprites)} frames, {len(data)} bytes")
+
+    # 스프라이트가 모두 삭제된 캐릭터의 아틀라스 정리
+    for character_id in [key for key in index if int(key) not in character_ids]:
+        _remove_atlas_files(atlas_dir, index.pop(character_id))
+        report["removed"].append(int(character_id))
+
+    _write_atomic(index_path, json.dumps(index, ensure_ascii=False, indent=2, sort_keys=True).encode("utf-8"))
+    return report
+
+
+def _remove_atlas_files(atlas_dir: Path, atlas: Dict) -> None:
+    for key in ("image", "frames_file"):
+        if atlas.get(key):
+            (atlas_dir / atlas[key]).unlink(missing_ok=True)
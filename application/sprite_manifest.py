@@ -0,0 +1,347 @@
+import hashlib
+import json
+import logging
+import re
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from PIL import Image
+
+from core.config import Settings, get_settings
+
+logger = logging.getLogger(__name__)
+
+# 스프라이트 파일명: {character_id}.png (기본 표정) 또는 {character_id}_{emotion}.png
+SPRITE_FILENAME_PATTERN = re.compile(r"^(?P<character_id>\d+)(?:_(?P<emotion>[a-z]+))?\.(?P<ext>png|webp)$")
+
+DEFAULT_EMOTION = "default"
+
+# 아틀라스 디렉터리의 캐릭터별 아틀라스 목록 파일
+ATLAS_INDEX_FILENAME = "index.json"
+
+# Scene.emotion에 저장되는 표정 목록 (기본 표정 제외)
+EMOTIONS = {"anger", "blush", "embarrassed", "laugh", "sad", "smile", "surprise", "thinking", "worry"}
+
+# LLM이 돌려주는 표정 문자열 → 스프라이트 표정
+EMOTION_SYNONYMS = {
+    "angry": "anger",
+    "mad": "anger",
+    "annoyed": "anger",
+    "furious": "anger",
+    "shy": "blush",
+    "flustered": "blush",
+    "blushing": "blush",
+    "love": "blush",
+    "embarrassment": "embarrassed",
+    "awkward": "embarrassed",
+    "laughing": "laugh",
+    "excited": "laugh",
+    "joyful": "laugh",
+    "happy": "smile",
+    "smiling": "smile",
+    "joy": "smile",
+    "glad": "smile",
+    "pleased": "smile",
+    "sadness": "sad",
+    "crying": "sad",
+    "upset": "sad",
+    "lonely": "sad",
+    "surprised": "surprise",
+    "shocked": "surprise",
+    "astonished": "surprise",
+    "think": "thinking",
+    "curious": "thinking",
+    "confused": "thinking",
+    "pondering": "thinking",
+    "worried": "worry",
+    "anxious": "worry",
+    "nervous": "worry",
+    "scared": "worry",
+    "afraid": "worry",
+    "neutral": DEFAULT_EMOTION,
+    "normal": DEFAULT_EMOTION,
+    "calm": DEFAULT_EMOTION,
+    "기본": DEFAULT_EMOTION,
+}
+
+
+def normalize_emotion(emotion: Optional[str]) -> str:
+    """표정 문자열을 스프라이트 표정 이름으로 변환 (알 수 없으면 기본 표정)"""
+    if not emotion:
+        return DEFAULT_EMOTION
+    emotion = emotion.strip().lower()
+    emotion = EMOTION_SYNONYMS.get(emotion, emotion)
+    return emotion if emotion in EMOTIONS else DEFAULT_EMOTION
+
+
+def sprite_filename(character_id: int, emotion: str, ext: str = "png") -> str:
+    if emotion == DEFAULT_EMOTION:
+        return f"{character_id}.{ext}"
+    return f"{character_id}_{emotion}.{ext}"
+
+
+@dataclass(frozen=True)
+class Sprite:
+    """캐릭터 표정 스프라이트 한 장"""
+
+    character_id: int
+    emotion: str
+    filename: str
+    digest: str  # 파일 내용의 sha256
+    width: int
+    height: int
+
+    @property
+    def hashed_filename(self) -> str:
+        return f"{self.digest}{Path(self.filename).suffix}"
+
+
+def sprites_source_hash(sprites: Iterable[Sprite]) -> str:
+    """캐릭터 스프라이트 구성의 해시 (스프라이트가 바뀌면 아틀라스를 다시 만들어야 함)"""
+    digest = hashlib.sha256()
+    for sprite in sorted(sprites, key=lambda sprite: sprite.emotion):
+        digest.update(f"{sprite.emotion}:{sprite.digest}\n".encode("utf-8"))
+    return digest.hexdigest()
+
+
+def _mtime_ns(path: Path) -> Optional[int]:
+    try:
+        return path.stat().st_mtime_ns
+    except OSError:
+        return None
+
+
+def _file_stat(path: Path) -> Optional[Tuple[int, int]]:
+    """파일 변경 판단용 (수정 시각, 크기), 없으면 None"""
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+class SpriteManifest:
+    """
+    스프라이트 디렉터리를 읽어 만든 캐릭터 → 표정 → 스프라이트 목록
+    응답에는 콘텐츠 해시 URL을 내려주어 클라이언트가 영구 캐시할 수 있도록 함
+    """
+
+    def __init__(
+        self,
+        sprite_dir: Path,
+        url_prefix: str,
+        atlas_dir: Optional[Path] = None,
+        atlas_url_prefix: str = "",
+    ):
+        self.__sprite_dir = sprite_dir
+        self.__url_prefix = url_prefix.rstrip("/")
+        self.__atlas_dir = atlas_dir
+        self.__atlas_url_prefix = atlas_url_prefix.rstrip("/")
+        self.__sprites: Dict[int, Dict[str, Sprite]] = {}
+        self.__by_hashed_filename: Dict[str, Sprite] = {}
+        self.__atlases: Dict[int, Dict] = {}
+        self.__stats: Dict[str, Tuple[int, int]] = {}  # 파일명 → 읽을 때의 (수정 시각, 크기)
+        self.__dir_mtime_ns: Optional[int] = None
+        self.__reload_lock = threading.Lock()
+        self.reload()
+
+    def reload(self) -> None:
+        """스프라이트 디렉터리를 다시 읽어 목록 재구성"""
+        with self.__reload_lock:
+            self.__reload()
+
+    def refresh(self) -> bool:
+        """디렉터리나 스프라이트 파일이 읽은 뒤 바뀌었으면 다시 읽음 (다시 읽었으면 True)"""
+        if self.__dir_mtime_ns == _mtime_ns(self.__sprite_dir) and all(
+            _file_stat(self.__sprite_dir / filename) == stat for filename, stat in self.__stats.items()
+        ):
+            return False
+        self.reload()
+        return True
+
+    def __reload(self) -> None:
+        sprites: Dict[int, Dict[str, Sprite]] = {}
+        stats: Dict[str, Tuple[int, int]] = {}
+        dir_mtime_ns = _mtime_ns(self.__sprite_dir)
+        if self.__sprite_dir.is_dir():
+            for path in sorted(self.__sprite_dir.iterdir()):
+                match = SPRITE_FILENAME_PATTERN.match(path.name)
+                if not match or not path.is_file():
+                    continue
+                try:
+                    stats[path.name] = _file_stat(path)
+                    data = path.read_bytes()
+                    with Image.open(path) as img:
+                        width, height = img.size
+                except Exception as e:
+                    logger.error(f"Failed to read sprite {path.name}: {e}")
+                    continue
+                sprite = Sprite(
+                    character_id=int(match.group("character_id")),
+                    emotion=match.group("emotion") or DEFAULT_EMOTION,
+                    filename=path.name,
+                    digest=hashlib.sha256(data).hexdigest(),
+                    width=width,
+                    height=height,
+                )
+                sprites.setdefault(sprite.character_id, {}).setdefault(sprite.emotion, sprite)
+        else:
+            logger.warning(f"Sprite directory not found: {self.__sprite_dir}")
+
+        self.__sprites = sprites
+        self.__stats = stats
+        self.__dir_mtime_ns = dir_mtime_ns
+        self.__by_hashed_filename = {
+            sprite.hashed_filename: sprite for emotions in sprites.values() for sprite in emotions.values()
+        }
+        self.__atlases = self.__load_atlases(sprites)
+        logger.info(
+            f"Sprite manifest loaded: {len(self.__by_hashed_filename)} sprites, {len(self.__atlases)} atlases"
+        )
+
+    def __load_atlases(self, sprites: Dict[int, Dict[str, Sprite]]) -> Dict[int, Dict]:
+        """아틀라스 목록 중 현재 스프라이트와 일치하는 것만 사용 (오래된 아틀라스는 무시)"""
+        if self.__atlas_dir is None:
+            return {}
+        index_path = self.__atlas_dir / ATLAS_INDEX_FILENAME
+        try:
+            index = json.loads(index_path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            logger.error(f"Failed to load sprite atlas index: {e}")
+            return {}
+
+        atlases = {}
+        for character_id, atlas in index.items():
+            character_sprites = sprites.get(int(character_id))
+            if not character_sprites:
+                continue
+            if atlas.get("source_hash") != sprites_source_hash(character_sprites.values()):
+                logger.warning(f"Sprite atlas for character {character_id} is stale, rebuild it")
+                continue
+            if not (self.__atlas_dir / atlas["image"]).is_file():
+                continue
+            atlases[int(character_id)] = atlas
+        return atlases
+
+    @property
+    def version(self) -> str:
+        """매니페스트 내용이 바뀔 때만 바뀌는 값 (ETag용)"""
+        digest = hashlib.sha256()
+        for name in sorted(self.__by_hashed_filename):
+            sprite = self.__by_hashed_filename[name]
+            digest.update(f"{sprite.filename}:{name}\n".encode("utf-8"))
+        for character_id, atlas in sorted(self.__atlases.items()):
+            digest.update(f"atlas:{character_id}:{atlas['image']}\n".encode("utf-8"))
+        return digest.hexdigest()[:32]
+
+    def character_ids(self) -> List[int]:
+        return sorted(self.__sprites)
+
+    def sprites(self, character_id: int) -> List[Sprite]:
+        """캐릭터의 스프라이트 목록 (표정 이름 순)"""
+        return [sprite for _, sprite in sorted(self.__sprites.get(character_id, {}).items())]
+
+    def atlas(self, character_id: Optional[int]) -> Optional[Dict]:
+        """캐릭터 스프라이트 아틀라스 (이미지 URL + 표정별 프레임 좌표), 없거나 오래되었으면 None"""
+        atlas = self.__atlases.get(character_id)
+        if atlas is None:
+            return None
+        return {
+            "url": f"{self.__atlas_url_prefix}/{atlas['image']}",
+            "width": atlas["width"],
+            "height": atlas["height"],
+            "frames": atlas["frames"],
+        }
+
+    def resolve(self, character_id: int, emotion: Optional[str]) -> Optional[Sprite]:
+        """표정에 맞는 스프라이트 조회 (정확히 일치 → 동의어 → 기본 표정 순)"""
+        emotions = self.__sprites.get(character_id)
+        if not emotions:
+            return None
+        if emotion and emotion.strip().lower() in emotions:
+            return emotions[emotion.strip().lower()]
+        return emotions.get(normalize_emotion(emotion)) or emotions.get(DEFAULT_EMOTION)
+
+    def filename(self, character_id: Optional[int], emotion: Optional[str]) -> Optional[str]:
+        """
+        캐릭터 이미지 파일명 - 존재하는 스프라이트로만 응답
+        (서버에 스프라이트가 없는 캐릭터는 표정 이름만 정규화)
+        """
+        if character_id is None:
+            return None
+        sprite = self.resolve(character_id, emotion)
+        if sprite:
+            return sprite.filename
+        return sprite_filename(character_id, normalize_emotion(emotion))
+
+    def url(self, character_id: Optional[int], emotion: Optional[str]) -> Optional[str]:
+        """콘텐츠 해시 URL (서버에 스프라이트가 없으면 None)"""
+        if character_id is None:
+            return None
+        sprite = self.resolve(character_id, emotion)
+        if sprite is None:
+            return None
+        return f"{self.__url_prefix}/{sprite.hashed_filename}"
+
+    def path_for(self, hashed_filename: str) -> Optional[Path]:
+        """
+        콘텐츠 해시 파일명에 해당하는 실제 스프라이트 경로
+        읽은 뒤 파일이 바뀌었으면 다시 읽어 해시가 여전히 맞을 때만 반환 (해시 URL은 영구 캐시되므로)
+        """
+        sprite = self.__by_hashed_filename.get(hashed_filename)
+        if sprite is None:
+            return None
+        path = self.__sprite_dir / sprite.filename
+        if _file_stat(path) != self.__stats.get(sprite.filename):
+            self.reload()
+            sprite = self.__by_hashed_filename.get(hashed_filename)
+            if sprite is None:
+                return None
+            path = self.__sprite_dir / sprite.filename
+        return path
+
+    def to_dict(self, character_ids: Optional[Iterable[int]] = None) -> Dict:
+        """클라이언트 미리 받기용 매니페스트 (character_ids가 있으면 해당 캐릭터만)"""
+        selected = set(character_ids) if character_ids is not None else None
+        characters = {}
+        for character_id, emotions in sorted(self.__sprites.items()):
+            if selected is not None and character_id not in selected:
+                continue
+            characters[str(character_id)] = {
+                emotion: {
+                    "url": f"{self.__url_prefix}/{sprite.hashed_filename}",
+                    "filename": sprite.filename,
+                    "width": sprite.width,
+                    "height": sprite.height,
+                }
+                for emotion, sprite in sorted(emotions.items())
+            }
+        atlases = {
+            character_id: self.atlas(int(character_id))
+            for character_id in characters
+            if self.atlas(int(character_id)) is not None
+        }
+        return {"version": self.version, "characters": characters, "atlases": atlases}
+
+
+_sprite_manifest: Optional[SpriteManifest] = None
+_sprite_manifest_lock = threading.Lock()
+
+
+def get_sprite_manifest(settings: Optional[Settings] = None) -> SpriteManifest:
+    """프로세스 전체에서 공유하는 스프라이트 매니페스트 (최초 호출 시 디렉터리를 읽음)"""
+    global _sprite_manifest
+    with _sprite_manifest_lock:
+        if _sprite_manifest is None:
+            settings = settings or get_settings()
+            _sprite_manifest = SpriteManifest(
+                Path(settings.SPRITE_DIR),
+                settings.SPRITE_URL_PREFIX,
+                atlas_dir=Path(settings.SPRITE_ATLAS_DIR),
+                atlas_url_prefix=settings.SPRITE_ATLAS_URL_PREFIX,
+            )
+        return _sprite_manifest
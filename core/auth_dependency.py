@@ -1,8 +1,12 @@
+import secrets
+from typing import Optional
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from core.config import get_settings
 from core.security import decode_token
 
 security = HTTPBearer()
+optional_security = HTTPBearer(auto_error=False)
 
 
 def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)) -> dict:
@@ -36,3 +40,19 @@ def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(securit
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail=str(e),
         )
+
+
+def require_metrics_token(credentials: Optional[HTTPAuthorizationCredentials] = Depends(optional_security)) -> None:
+    """
+    내부 모니터링용 토큰 확인 (사용자 액세스 토큰과 별개인 METRICS_TOKEN)
+    토큰이 설정되지 않았으면 엔드포인트 자체를 숨김
+    """
+    expected = get_settings().METRICS_TOKEN
+    if not expected:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    if credentials is None or not secrets.compare_digest(credentials.credentials.encode(), expected.encode()):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid metrics token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
@@ -1,21 +1,109 @@
+import threading
+from typing import AsyncIterator, Optional
+
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from core.config import get_settings
+from core.db_pool import instrument_pool, pool_options
+from core.db_routing import RoutingSession
+from core.sql_instrumentation import instrument_engine
 
 settings = get_settings()
 
 engine = create_engine(
     settings.DATABASE_URL,
     pool_pre_ping=True,
-    pool_recycle=3600,
-    echo=True
+    echo=settings.SQL_ECHO,
+    **pool_options(settings.DATABASE_URL, settings),
 )
+instrument_engine(engine)
+instrument_pool(engine)
+
+
+def _create_replica_engine(index: int, url: str):
+    replica = create_engine(
+        url,
+        pool_pre_ping=True,
+        echo=settings.SQL_ECHO,
+        **pool_options(url, settings),
+    )
+    instrument_engine(replica)
+    instrument_pool(replica, metrics_prefix=f"db_replica{index}_pool")
+    return replica
+
+
+# 읽기 전용 복제본 (@read_only 리포지토리 메서드만 사용)
+replica_engines = [
+    _create_replica_engine(index, url.strip())
+    for index, url in enumerate(settings.DATABASE_REPLICA_URLS.split(","))
+    if url.strip()
+]
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+SessionLocal = sessionmaker(
+    class_=RoutingSession, autocommit=False, autoflush=False, bind=engine, replicas=replica_engines
+)
 
 Base = declarative_base()
 
+# 동기 드라이버 → 같은 DB의 비동기 드라이버
+ASYNC_DRIVERS = {
+    "mysql": "mysql+aiomysql",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+
+def to_async_url(url: str) -> str:
+    """동기 DATABASE_URL을 비동기 드라이버 URL로 변환 (이미 비동기 드라이버면 그대로)"""
+    parsed = make_url(url)
+    if parsed.get_dialect(_is_async=True).is_async:
+        return url
+    backend = parsed.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver configured for database backend: {backend}")
+    return parsed.set(drivername=ASYNC_DRIVERS[backend]).render_as_string(hide_password=False)
+
+
+_async_engine: Optional[AsyncEngine] = None
+_async_session_factory: Optional[async_sessionmaker] = None
+_async_engine_lock = threading.Lock()
+
+
+def get_async_engine() -> AsyncEngine:
+    """비동기 엔진 (최초 호출 시 생성, 스크립트 등 동기 경로에서는 만들지 않음)"""
+    global _async_engine, _async_session_factory
+    with _async_engine_lock:
+        if _async_engine is None:
+            async_url = settings.ASYNC_DATABASE_URL or to_async_url(settings.DATABASE_URL)
+            _async_engine = create_async_engine(
+                async_url,
+                pool_pre_ping=True,
+                echo=settings.SQL_ECHO,
+                **pool_options(async_url, settings, is_async=True),
+            )
+            instrument_engine(_async_engine.sync_engine)
+            instrument_pool(_async_engine.sync_engine)
+            _async_session_factory = async_sessionmaker(
+                _async_engine, autoflush=False, expire_on_commit=False
+            )
+        return _async_engine
+
+
+def get_async_session_factory() -> async_sessionmaker:
+    get_async_engine()
+    return _async_session_factory
+
+
+async def dispose_async_engine() -> None:
+    """앱 종료 시 비동기 연결 풀 정리"""
+    global _async_engine, _async_session_factory
+    with _async_engine_lock:
+        async_engine, _async_engine, _async_session_factory = _async_engine, None, None
+    if async_engine is not None:
+        await async_engine.dispose()
+
 
 def get_db():
     db = SessionLocal()
@@ -23,3 +111,8 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+async def get_async_db() -> AsyncIterator[AsyncSession]:
+    async with get_async_session_factory()() as db:
+        yield db
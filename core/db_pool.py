@@ -0,0 +1,66 @@
+import time
+from typing import Dict, Optional
+
+from sqlalchemy import event, exc
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from core.config import Settings
+from core.metrics import metrics
+
+
+class TimedCheckoutMixin:
+    """풀에서 연결을 꺼낼 때까지 기다린 시간을 메트릭으로 기록 (풀이 가득 차면 여기서 대기)"""
+
+    metrics_prefix = "db_pool"
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            metrics.inc(f"{self.metrics_prefix}_checkout_timeout_total")
+            raise
+        finally:
+            metrics.observe(f"{self.metrics_prefix}_checkout_wait_ms", (time.perf_counter() - started) * 1000)
+
+
+class TimedQueuePool(TimedCheckoutMixin, QueuePool):
+    pass
+
+
+class TimedAsyncAdaptedQueuePool(TimedCheckoutMixin, AsyncAdaptedQueuePool):
+    metrics_prefix = "db_async_pool"
+
+
+def pool_options(url: str, settings: Settings, is_async: bool = False) -> Dict:
+    """create_engine에 넘길 연결 풀 설정 (메모리 SQLite는 큐 풀을 쓰지 않으므로 제외)"""
+    parsed = make_url(url)
+    if parsed.get_backend_name() == "sqlite" and parsed.database in (None, "", ":memory:"):
+        return {}
+    return {
+        "poolclass": TimedAsyncAdaptedQueuePool if is_async else TimedQueuePool,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+    }
+
+
+def instrument_pool(engine: Engine, metrics_prefix: Optional[str] = None) -> None:
+    """체크아웃/반환 때마다 사용 중인 연결 수와 오버플로 수를 게이지로 기록 (metrics_prefix: 복제본 등 엔진 구분)"""
+    pool = engine.pool
+    if not isinstance(pool, TimedCheckoutMixin):
+        return
+    if metrics_prefix:
+        pool.metrics_prefix = metrics_prefix
+    prefix = pool.metrics_prefix
+    metrics.set_gauge(f"{prefix}_size", pool.size())
+
+    def record_usage(in_use: int) -> None:
+        metrics.set_gauge(f"{prefix}_in_use", in_use)
+        metrics.set_gauge(f"{prefix}_overflow", max(0, pool.overflow()))
+
+    # checkin 이벤트는 연결이 풀에 돌아가기 직전에 호출되므로 1을 뺌
+    event.listen(pool, "checkout", lambda *args: record_usage(pool.checkedout()))
+    event.listen(pool, "checkin", lambda *args: record_usage(pool.checkedout() - 1))
@@ -0,0 +1,75 @@
+import contextlib
+import functools
+import random
+from typing import Callable, Optional, Sequence, TypeVar
+
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.dml import UpdateBase
+
+from core.metrics import metrics
+
+# Session.info 키
+READ_ONLY_DEPTH_KEY = "read_only_depth"  # @read_only 메서드 실행 중 (중첩 호출 수)
+WROTE_KEY = "wrote"  # 이 세션에서 쓰기가 있었음 → 이후 읽기는 모두 primary
+PRIMARY_DEPTH_KEY = "primary_depth"  # use_primary 블록 실행 중 (중첩 수)
+
+F = TypeVar("F", bound=Callable)
+
+
+class RoutingSession(Session):
+    """
+    @read_only 리포지토리 메서드의 쿼리는 복제본으로, 나머지는 primary로 보내는 세션
+    쓰기(flush, UPDATE/DELETE/INSERT)가 한 번이라도 있으면 세션이 끝날 때까지 primary만 사용 (read-your-writes)
+    """
+
+    def __init__(self, *args, replicas: Sequence[Engine] = (), **kwargs):
+        super().__init__(*args, **kwargs)
+        self.replicas = list(replicas)
+
+    def get_bind(self, mapper=None, *, clause=None, **kwargs):
+        if self._flushing or isinstance(clause, UpdateBase):
+            self.info[WROTE_KEY] = True
+        elif (
+            self.replicas
+            and self.info.get(READ_ONLY_DEPTH_KEY)
+            and not self.info.get(WROTE_KEY)
+            and not self.info.get(PRIMARY_DEPTH_KEY)
+        ):
+            metrics.inc("db_replica_read_total")
+            return random.choice(self.replicas)
+        return super().get_bind(mapper, clause=clause, **kwargs)
+
+
+def read_only(method: F) -> F:
+    """
+    복제본에서 읽어도 되는 리포지토리 메서드 표시 (self.db가 RoutingSession일 때만 효과)
+    복제 지연이 있으므로 결과로 쓰기 여부/번호를 정하는 조회나 턴/분기처럼 방금 쓴 행을 바로 읽는 조회에는 붙이지 않음
+    """
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        info: Optional[dict] = getattr(self.db, "info", None)
+        if info is None:
+            return method(self, *args, **kwargs)
+        info[READ_ONLY_DEPTH_KEY] = info.get(READ_ONLY_DEPTH_KEY, 0) + 1
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            info[READ_ONLY_DEPTH_KEY] -= 1
+
+    return wrapper
+
+
+@contextlib.contextmanager
+def use_primary(db):
+    """블록 안에서는 @read_only 메서드도 primary에서 읽음 (복제본에 아직 없는 행 재조회용)"""
+    info: Optional[dict] = getattr(db, "info", None)
+    if info is None:
+        yield
+        return
+    info[PRIMARY_DEPTH_KEY] = info.get(PRIMARY_DEPTH_KEY, 0) + 1
+    try:
+        yield
+    finally:
+        info[PRIMARY_DEPTH_KEY] -= 1
@@ -0,0 +1,89 @@
+import importlib.util
+import logging
+import threading
+import time
+from typing import Optional
+
+import httpx
+
+from core.config import Settings, get_settings
+from core.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+metrics.register_ratio("http_connection_reuse_rate", "http_reused_connection_total", "http_request_total")
+
+
+class PooledHttpClient:
+    """
+    앱 전체에서 공유하는 keep-alive HTTP 클라이언트
+    요청마다 새 연결을 맺었는지 추적하여 연결 재사용률과 핸드셰이크 시간을 기록
+    """
+
+    def __init__(self, settings: Settings):
+        http2 = settings.HTTP2_ENABLED and importlib.util.find_spec("h2") is not None
+        self.__client = httpx.Client(
+            http2=http2,
+            limits=httpx.Limits(
+                max_connections=settings.HTTP_POOL_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.HTTP_POOL_MAX_KEEPALIVE,
+                keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY,
+            ),
+            timeout=httpx.Timeout(
+                connect=settings.HTTP_CONNECT_TIMEOUT,
+                read=settings.HTTP_READ_TIMEOUT,
+                write=settings.HTTP_CONNECT_TIMEOUT,
+                pool=settings.HTTP_CONNECT_TIMEOUT,
+            ),
+        )
+        logger.info(f"HTTP client initialized (http2={http2})")
+
+    def post(self, url: str, **kwargs) -> httpx.Response:
+        return self.request("POST", url, **kwargs)
+
+    def request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        handshake = {"started": None, "ended": None}
+
+        def trace(event_name: str, info: dict) -> None:
+            # TCP 연결 시작 ~ TLS 완료(또는 평문이면 TCP 완료)까지를 핸드셰이크 시간으로 기록
+            if event_name == "connection.connect_tcp.started":
+                handshake["started"] = time.perf_counter()
+            elif event_name in ("connection.connect_tcp.complete", "connection.start_tls.complete"):
+                handshake["ended"] = time.perf_counter()
+
+        extensions = dict(kwargs.pop("extensions", None) or {})
+        extensions["trace"] = trace
+        try:
+            return self.__client.request(method, url, extensions=extensions, **kwargs)
+        finally:
+            metrics.inc("http_request_total")
+            if handshake["started"] is not None:
+                metrics.inc("http_new_connection_total")
+                if handshake["ended"] is not None:
+                    metrics.observe("http_handshake_seconds", handshake["ended"] - handshake["started"])
+            else:
+                metrics.inc("http_reused_connection_total")
+
+    def close(self) -> None:
+        self.__client.close()
+
+
+_http_client: Optional[PooledHttpClient] = None
+_http_client_lock = threading.Lock()
+
+
+def get_http_client() -> PooledHttpClient:
+    """프로세스 전체에서 공유하는 HTTP 클라이언트"""
+    global _http_client
+    with _http_client_lock:
+        if _http_client is None:
+            _http_client = PooledHttpClient(get_settings())
+        return _http_client
+
+
+def close_http_client() -> None:
+    global _http_client
+    with _http_client_lock:
+        if _http_client is not None:
+            _http_client.close()
+            _http_client = None
@@ -0,0 +1,65 @@
+import threading
+from typing import Dict, Tuple
+
+
+class MetricsRegistry:
+    """프로세스 단위 메트릭 저장소 (카운터, 관측값, 게이지, 비율)"""
+
+    def __init__(self):
+        self.__lock = threading.Lock()
+        self.__counters: Dict[str, float] = {}
+        self.__observations: Dict[str, Dict[str, float]] = {}
+        self.__gauges: Dict[str, float] = {}
+        self.__ratios: Dict[str, Tuple[str, str]] = {}
+
+    def inc(self, name: str, value: float = 1) -> None:
+        """카운터 증가"""
+        with self.__lock:
+            self.__counters[name] = self.__counters.get(name, 0) + value
+
+    def observe(self, name: str, value: float) -> None:
+        """관측값 기록 (횟수, 합계, 최대값)"""
+        with self.__lock:
+            stat = self.__observations.setdefault(name, {"count": 0, "sum": 0.0, "max": 0.0})
+            stat["count"] += 1
+            stat["sum"] += value
+            stat["max"] = max(stat["max"], value)
+
+    def set_gauge(self, name: str, value: float) -> None:
+        """현재 값 기록"""
+        with self.__lock:
+            self.__gauges[name] = value
+
+    def register_ratio(self, name: str, numerator: str, denominator: str) -> None:
+        """두 카운터의 비율을 스냅샷에 포함 (예: 캐시 적중률)"""
+        with self.__lock:
+            self.__ratios[name] = (numerator, denominator)
+
+    def counter(self, name: str) -> float:
+        return self.__counters.get(name, 0)
+
+    def snapshot(self) -> Dict:
+        with self.__lock:
+            observations = {
+                name: {**stat, "avg": stat["sum"] / stat["count"] if stat["count"] else 0.0}
+                for name, stat in self.__observations.items()
+            }
+            ratios = {}
+            for name, (numerator, denominator) in self.__ratios.items():
+                total = self.__counters.get(denominator, 0)
+                ratios[name] = self.__counters.get(numerator, 0) / total if total else None
+            return {
+                "counters": dict(self.__counters),
+                "observations": observations,
+                "gauges": dict(self.__gauges),
+                "ratios": ratios,
+            }
+
+    def reset(self) -> None:
+        with self.__lock:
+            self.__counters.clear()
+            self.__observations.clear()
+            self.__gauges.clear()
+
+
+metrics = MetricsRegistry()
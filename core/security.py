@@ -2,6 +2,7 @@ from datetime import datetime, timedelta
 from typing import Optional
 from jose import JWTError, jwt
 import bcrypt
+import hashlib
 import uuid
 from core.config import get_settings
 
@@ -68,3 +69,8 @@ def decode_token(token: str) -> dict:
         return payload
     except JWTError:
         raise ValueError("Invalid token")
+
+
+def hash_token(token: str) -> str:
+    """리프레시 토큰 저장/조회용 SHA-256 hex (토큰 자체가 무작위 jti를 포함하므로 솔트 없이 사용)"""
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
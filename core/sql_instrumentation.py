@@ -0,0 +1,163 @@
+import logging
+import random
+import re
+import sys
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from core.config import get_settings
+from core.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# 느린 쿼리의 호출 위치로 기록할 모듈 (리포지토리 메서드)
+CALLER_MODULE_PREFIX = "domain.repository"
+
+QUERY_COUNT_HEADER = "X-DB-Query-Count"
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?\b")
+_PLACEHOLDER_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+
+@dataclass
+class QueryStats:
+    """요청 하나에서 실행된 SQL 통계"""
+
+    count: int = 0
+    total_ms: float = 0.0
+    slowest_ms: float = 0.0
+    slowest_sql: Optional[str] = None
+
+    def record(self, statement: str, elapsed_ms: float) -> None:
+        self.count += 1
+        self.total_ms += elapsed_ms
+        if elapsed_ms > self.slowest_ms:
+            self.slowest_ms = elapsed_ms
+            self.slowest_sql = statement
+
+
+_query_stats: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+
+def current_query_stats() -> Optional[QueryStats]:
+    return _query_stats.get()
+
+
+def normalize_sql(statement: str) -> str:
+    """리터럴과 바인드 파라미터를 ?로 바꾸고 공백을 정리 (같은 모양의 쿼리끼리 묶기 위함)"""
+    statement = _STRING_LITERAL.sub("?", statement)
+    statement = _NUMBER_LITERAL.sub("?", statement)
+    statement = re.sub(r"%\(\w+\)s|%s|:\w+", "?", statement)
+    statement = _PLACEHOLDER_LIST.sub("(...)", statement)
+    return _WHITESPACE.sub(" ", statement).strip()
+
+
+def _find_caller(frame) -> Optional[str]:
+    while frame is not None:
+        if frame.f_globals.get("__name__", "").startswith(CALLER_MODULE_PREFIX):
+            owner = frame.f_locals.get("self")
+            name = frame.f_code.co_name
+            return f"{type(owner).__name__}.{name}" if owner is not None else name
+        frame = frame.f_back
+    return None
+
+
+def repository_caller() -> Optional[str]:
+    """
+    쿼리를 실행한 리포지토리 메서드 (예: "SessionRepository.create_session")
+    비동기 세션은 쿼리가 별도 greenlet에서 실행되므로 대기 중인 부모 greenlet의 스택도 확인
+    """
+    caller = _find_caller(sys._getframe(1))
+    if caller is not None:
+        return caller
+    try:
+        import greenlet
+    except ImportError:
+        return None
+    parent = greenlet.getcurrent().parent
+    return _find_caller(parent.gr_frame) if parent is not None else None
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    # 연결이 아니라 실행 컨텍스트에 두어 실패한 쿼리(after 이벤트 없음)의 시작 시각이 쌓이지 않도록 함
+    if context is not None:
+        context._query_start_time = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    start_time = getattr(context, "_query_start_time", None)
+    if start_time is None:
+        return
+    elapsed_ms = (time.perf_counter() - start_time) * 1000
+    metrics.inc("db_query_total")
+    metrics.observe("db_query_ms", elapsed_ms)
+
+    stats = _query_stats.get()
+    if stats is not None:
+        stats.record(statement, elapsed_ms)
+
+    settings = get_settings()
+    if elapsed_ms < settings.SQL_SLOW_QUERY_MS:
+        return
+    metrics.inc("db_slow_query_total")
+    if random.random() < settings.SQL_SLOW_QUERY_SAMPLE_RATE:
+        logger.warning(
+            "Slow query %.1fms caller=%s sql=%s",
+            elapsed_ms,
+            repository_caller() or "unknown",
+            normalize_sql(statement),
+        )
+
+
+def instrument_engine(engine: Engine) -> None:
+    """엔진에 쿼리 시간 측정 이벤트 등록 (비동기 엔진은 sync_engine을 전달)"""
+    if event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        return
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+class QueryStatsMiddleware:
+    """
+    요청마다 쿼리 수/총 DB 시간/가장 느린 쿼리 시간을 측정해 응답 헤더와 메트릭으로 기록
+    (X-DB-Query-Count, Server-Timing: db;dur=...)
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats()
+        token = _query_stats.set(stats)
+
+        async def send_with_stats(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                headers[QUERY_COUNT_HEADER] = str(stats.count)
+                headers.append(
+                    "Server-Timing",
+                    f'db;dur={stats.total_ms:.1f}, db-slowest;dur={stats.slowest_ms:.1f}',
+                )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_stats)
+        finally:
+            _query_stats.reset(token)
+            if stats.count:
+                metrics.observe("db_queries_per_request", stats.count)
+                metrics.observe("db_time_per_request_ms", stats.total_ms)
+                metrics.observe("db_slowest_query_ms", stats.slowest_ms)
@@ -0,0 +1,248 @@
+import gzip
+import hashlib
+import importlib.util
+import os
+import re
+import threading
+from collections import OrderedDict
+from email.utils import formatdate, parsedate
+from mimetypes import guess_type
+from pathlib import PurePath
+from typing import Dict, Optional, Tuple
+
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+from starlette.types import Scope
+
+from core.config import get_settings
+from core.metrics import metrics
+
+# 콘텐츠 해시(sha256) 기반 파일명: <64자리 hex>.<확장자>
+CONTENT_HASH_PATTERN = re.compile(r"^[0-9a-f]{64}$")
+
+# URL 안의 콘텐츠 해시 파일명 (로컬/CDN/서명 URL 모두)
+CONTENT_HASH_URL_PATTERN = re.compile(r"/([0-9a-f]{64})\.\w+(?:$|\?)")
+
+# 콘텐츠 해시 파일은 내용이 절대 바뀌지 않으므로 1년 동안 캐시
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+# 미리 압축해 두는 텍스트 파일 (매니페스트, 프레임 좌표, 인덱스)
+COMPRESSIBLE_SUFFIXES = {".json"}
+
+metrics.register_ratio("static_cache_hit_rate", "static_cache_hit_total", "static_request_total")
+
+
+def extract_content_hash(url: str) -> Optional[str]:
+    """이미지 URL에서 콘텐츠 해시 추출 (해시 파일이 아니면 None)"""
+    match = CONTENT_HASH_URL_PATTERN.search(url)
+    return match.group(1) if match else None
+
+
+def available_encodings() -> Tuple[str, ...]:
+    """서버가 만들 수 있는 압축 방식 (선호 순, brotli는 패키지가 설치된 경우에만)"""
+    if importlib.util.find_spec("brotli") is not None:
+        return ("br", "gzip")
+    return ("gzip",)
+
+
+def choose_encoding(accept_encoding: str) -> Optional[str]:
+    """Accept-Encoding에서 사용할 압축 방식 선택 (q=0은 제외)"""
+    accepted = set()
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        if params.strip().replace(" ", "") in ("q=0", "q=0.0", "q=0.00", "q=0.000"):
+            continue
+        accepted.add(name.strip().lower())
+    for encoding in available_encodings():
+        if encoding in accepted or "*" in accepted:
+            return encoding
+    return None
+
+
+def compress(data: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        import brotli
+
+        return brotli.compress(data, quality=11)
+    return gzip.compress(data, compresslevel=9, mtime=0)
+
+
+def precompressed_response(
+    data: bytes,
+    media_type: str,
+    etag: str,
+    request_headers: Headers,
+    cache: "AssetCache",
+    extra_headers: Optional[Dict[str, str]] = None,
+) -> Response:
+    """
+    압축본을 캐시에 보관해 두고 Accept-Encoding에 맞춰 응답 (조건부 GET이면 304)
+    etag는 따옴표를 포함한 원본 기준 값, 압축본은 인코딩 이름을 붙여 구분
+    """
+    encoding = choose_encoding(request_headers.get("accept-encoding", ""))
+    headers = {"vary": "Accept-Encoding", **(extra_headers or {})}
+    if encoding:
+        headers["content-encoding"] = encoding
+        headers["etag"] = f'{etag[:-1]}-{encoding}"'
+    else:
+        headers["etag"] = etag
+
+    metrics.inc("static_request_total")
+    response_headers = Response(headers=headers, media_type=media_type).headers
+    if is_not_modified(response_headers, request_headers):
+        metrics.inc("static_not_modified_total")
+        return NotModifiedResponse(response_headers)
+
+    if encoding:
+        key = (etag, encoding)
+        body = cache.get(key)
+        if body is None:
+            body = compress(data, encoding)
+            cache.put(key, body)
+        else:
+            metrics.inc("static_cache_hit_total")
+        _record_tier("precompressed", len(body))
+    else:
+        body = data
+        _record_tier("memory", len(body))
+    return Response(body, headers=headers, media_type=media_type)
+
+
+def is_not_modified(response_headers: Headers, request_headers: Headers) -> bool:
+    """조건부 GET 판단 (If-None-Match 우선, 없으면 If-Modified-Since)"""
+    if_none_match = request_headers.get("if-none-match")
+    if if_none_match:
+        if if_none_match.strip() == "*":
+            return True
+        return response_headers["etag"] in [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+
+    if_modified_since = parsedate(request_headers.get("if-modified-since", ""))
+    last_modified = parsedate(response_headers.get("last-modified", ""))
+    return if_modified_since is not None and last_modified is not None and if_modified_since >= last_modified
+
+
+def _record_tier(tier: str, size: int) -> None:
+    metrics.inc(f"static_{tier}_request_total")
+    metrics.inc(f"static_{tier}_bytes_total", size)
+
+
+class AssetCache:
+    """자주 요청되는 정적 파일 바이트를 보관하는 LRU (전체 바이트 수로 크기 제한)"""
+
+    def __init__(self, max_bytes: int, max_entry_bytes: int):
+        self.__max_bytes = max_bytes
+        self.__max_entry_bytes = max_entry_bytes
+        self.__lock = threading.Lock()
+        self.__entries: "OrderedDict[Tuple, bytes]" = OrderedDict()
+        self.__size = 0
+
+    @property
+    def max_entry_bytes(self) -> int:
+        return self.__max_entry_bytes
+
+    @property
+    def size(self) -> int:
+        return self.__size
+
+    def get(self, key: Tuple) -> Optional[bytes]:
+        with self.__lock:
+            data = self.__entries.get(key)
+            if data is not None:
+                self.__entries.move_to_end(key)
+            return data
+
+    def put(self, key: Tuple, data: bytes) -> None:
+        if len(data) > self.__max_entry_bytes or len(data) > self.__max_bytes:
+            return
+        with self.__lock:
+            previous = self.__entries.pop(key, None)
+            if previous is not None:
+                self.__size -= len(previous)
+            self.__entries[key] = data
+            self.__size += len(data)
+            while self.__size > self.__max_bytes:
+                _, evicted = self.__entries.popitem(last=False)
+                self.__size -= len(evicted)
+                metrics.inc("static_cache_eviction_total")
+            metrics.set_gauge("static_cache_bytes", self.__size)
+
+
+class ContentAddressedStaticFiles(StaticFiles):
+    """
+    정적 파일 서빙
+    - 콘텐츠 해시 파일명(<sha256>.<ext>)은 immutable 캐시 헤더와 해시 기반 strong ETag
+    - 작은 파일은 메모리 LRU에서, 큰 파일/Range 요청은 FileResponse(pathsend 지원 서버는 zero-copy)로 응답
+    - JSON은 gzip/brotli 압축본을 한 번만 만들어 캐시
+    """
+
+    def __init__(self, *args, cache: Optional[AssetCache] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if cache is None:
+            settings = get_settings()
+            cache = AssetCache(
+                max_bytes=settings.STATIC_CACHE_MAX_MB * 1024 * 1024,
+                max_entry_bytes=settings.STATIC_CACHE_MAX_FILE_KB * 1024,
+            )
+        self.cache = cache
+
+    def file_response(
+        self,
+        full_path: os.PathLike,
+        stat_result: os.stat_result,
+        scope: Scope,
+        status_code: int = 200,
+    ) -> Response:
+        if status_code != 200:
+            return super().file_response(full_path, stat_result, scope, status_code)
+
+        request_headers = Headers(scope=scope)
+        path = PurePath(full_path)
+        media_type = guess_type(path.name)[0] or "text/plain"
+        digest = path.stem
+        if CONTENT_HASH_PATTERN.match(digest):
+            headers = {"cache-control": IMMUTABLE_CACHE_CONTROL, "etag": f'"{digest}"'}
+        else:
+            etag_base = f"{stat_result.st_mtime}-{stat_result.st_size}"
+            headers = {
+                "etag": f'"{hashlib.md5(etag_base.encode(), usedforsecurity=False).hexdigest()}"',
+                "last-modified": formatdate(stat_result.st_mtime, usegmt=True),
+            }
+        # 파일이 바뀌면 (수정 시각, 크기)가 바뀌므로 이전 캐시 항목은 더 이상 조회되지 않음
+        cache_key = (str(full_path), stat_result.st_mtime_ns, stat_result.st_size)
+        fits_in_cache = stat_result.st_size <= self.cache.max_entry_bytes
+
+        if path.suffix in COMPRESSIBLE_SUFFIXES and fits_in_cache and "range" not in request_headers:
+            data, _ = self.__read(cache_key, full_path)
+            etag = headers.pop("etag")
+            return precompressed_response(data, media_type, etag, request_headers, self.cache, headers)
+
+        metrics.inc("static_request_total")
+        response_headers = Response(headers=headers, media_type=media_type).headers
+        if is_not_modified(response_headers, request_headers):
+            metrics.inc("static_not_modified_total")
+            return NotModifiedResponse(response_headers)
+
+        if fits_in_cache and "range" not in request_headers:
+            data, hit = self.__read(cache_key, full_path)
+            if hit:
+                metrics.inc("static_cache_hit_total")
+            _record_tier("memory" if hit else "disk", len(data))
+            return Response(data, status_code=status_code, headers=headers, media_type=media_type)
+
+        # 큰 파일과 Range 요청은 디스크에서 바로 전송
+        _record_tier("sendfile", stat_result.st_size)
+        return FileResponse(
+            full_path, status_code=status_code, headers=headers, media_type=media_type, stat_result=stat_result
+        )
+
+    def __read(self, cache_key: Tuple, full_path: os.PathLike) -> Tuple[bytes, bool]:
+        """캐시에서 읽고 없으면 디스크에서 읽어 캐시에 넣음 (데이터, 캐시 적중 여부)"""
+        data = self.cache.get(cache_key)
+        if data is not None:
+            return data, True
+        with open(full_path, "rb") as f:
+            data = f.read()
+        self.cache.put(cache_key, data)
+        return data, False
@@ -0,0 +1,244 @@
+import hashlib
+import io
+import logging
+import os
+import threading
+import uuid
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows: 프로세스 간 잠금 없이 스레드 잠금만 사용
+    fcntl = None
+
+from core.config import Settings, get_settings
+from core.static_files import IMMUTABLE_CACHE_CONTROL
+
+logger = logging.getLogger(__name__)
+
+
+class ImageStorage(ABC):
+    """생성된 에셋 저장소 인터페이스 (키는 저장소 내부의 상대 경로)"""
+
+    @abstractmethod
+    def put(self, key: str, data: bytes, content_type: str, immutable: bool = False) -> None:
+        """데이터 저장 (immutable=True면 장기 캐시 헤더 지정)"""
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[bytes]:
+        """데이터 조회 (없으면 None)"""
+
+    @abstractmethod
+    def get_versioned(self, key: str) -> Tuple[Optional[bytes], Optional[str]]:
+        """데이터와 버전 조회 (없으면 (None, None)), 버전은 put_if_match에 넘길 값"""
+
+    @abstractmethod
+    def put_if_match(self, key: str, data: bytes, content_type: str, version: Optional[str]) -> bool:
+        """
+        저장된 버전이 version일 때만 저장 (version=None이면 키가 없을 때만)
+        다른 쓰기가 먼저 일어났으면 저장하지 않고 False
+        """
+
+    @abstractmethod
+    def exists(self, key: str) -> bool:
+        """키 존재 여부"""
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        """데이터 삭제 (없으면 무시)"""
+
+    @abstractmethod
+    def list(self, prefix: str = "") -> List[str]:
+        """prefix로 시작하는 모든 키 목록"""
+
+    @abstractmethod
+    def url(self, key: str) -> str:
+        """클라이언트에 내려줄 고정 URL (세션 배경과 인덱스에 저장되므로 만료되면 안 됨)"""
+
+
+class LocalImageStorage(ImageStorage):
+    """로컬 파일시스템 저장소 - /static 마운트로 서빙"""
+
+    def __init__(self, root_dir: Path, url_prefix: str):
+        self.__root_dir = root_dir
+        self.__url_prefix = url_prefix.rstrip("/")
+        self.__write_lock = threading.Lock()
+        try:
+            self.__root_dir.mkdir(parents=True, exist_ok=True)
+        except Exception as e:
+            error_msg = f"Failed to create image storage directory: {e}"
+            logger.error(error_msg)
+            raise RuntimeError(error_msg)
+
+    @property
+    def root_dir(self) -> Path:
+        return self.__root_dir
+
+    def put(self, key: str, data: bytes, content_type: str, immutable: bool = False) -> None:
+        path = self.__root_dir / key
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # 임시 파일에 쓴 뒤 교체하여 읽는 쪽이 반쯤 쓰인 파일을 보지 않도록 함
+        tmp_path = path.with_name(f".{path.name}.{uuid.uuid4().hex}.tmp")
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, path)
+
+    def get(self, key: str) -> Optional[bytes]:
+        try:
+            return (self.__root_dir / key).read_bytes()
+        except FileNotFoundError:
+            return None
+
+    def get_versioned(self, key: str) -> Tuple[Optional[bytes], Optional[str]]:
+        data = self.get(key)
+        if data is None:
+            return None, None
+        return data, hashlib.sha256(data).hexdigest()
+
+    def put_if_match(self, key: str, data: bytes, content_type: str, version: Optional[str]) -> bool:
+        path = self.__root_dir / key
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # 같은 호스트의 다른 워커와는 잠금 파일로 비교-교체를 직렬화
+        with self.__write_lock, open(path.with_name(f".{path.name}.lock"), "a") as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            if self.get_versioned(key)[1] != version:
+                return False
+            self.put(key, data, content_type)
+            return True
+
+    def exists(self, key: str) -> bool:
+        return (self.__root_dir / key).is_file()
+
+    def delete(self, key: str) -> None:
+        (self.__root_dir / key).unlink(missing_ok=True)
+
+    def list(self, prefix: str = "") -> List[str]:
+        return sorted(
+            path.relative_to(self.__root_dir).as_posix()
+            for path in self.__root_dir.rglob("*")
+            if path.is_file()
+            and not path.name.startswith(".")
+            and path.relative_to(self.__root_dir).as_posix().startswith(prefix)
+        )
+
+    def url(self, key: str) -> str:
+        return f"{self.__url_prefix}/{key}"
+
+
+class S3ImageStorage(ImageStorage):
+    """S3 호환 오브젝트 스토리지 (AWS S3, MinIO, R2 등), 객체는 CDN/공개 버킷 주소로 서빙"""
+
+    def __init__(
+        self,
+        bucket: str,
+        public_base_url: str,
+        prefix: str = "",
+        client=None,
+        endpoint_url: str = "",
+        region: str = "",
+        access_key_id: str = "",
+        secret_access_key: str = "",
+    ):
+        if not public_base_url:
+            raise ValueError("public_base_url is required for S3ImageStorage")
+        if client is None:
+            import boto3
+
+            client = boto3.client(
+                "s3",
+                endpoint_url=endpoint_url or None,
+                region_name=region or None,
+                aws_access_key_id=access_key_id or None,
+                aws_secret_access_key=secret_access_key or None,
+            )
+        self.__client = client
+        self.__bucket = bucket
+        self.__prefix = prefix.strip("/") + "/" if prefix.strip("/") else ""
+        self.__public_base_url = public_base_url.rstrip("/")
+
+    def __object_key(self, key: str) -> str:
+        return f"{self.__prefix}{key}"
+
+    def put(self, key: str, data: bytes, content_type: str, immutable: bool = False) -> None:
+        extra_args = {"ContentType": content_type}
+        if immutable:
+            extra_args["CacheControl"] = IMMUTABLE_CACHE_CONTROL
+        # 디코딩된 버퍼를 그대로 스트리밍 업로드 (임시 파일 없음)
+        self.__client.upload_fileobj(
+            io.BytesIO(data), self.__bucket, self.__object_key(key), ExtraArgs=extra_args
+        )
+
+    def get(self, key: str) -> Optional[bytes]:
+        try:
+            response = self.__client.get_object(Bucket=self.__bucket, Key=self.__object_key(key))
+        except self.__client.exceptions.NoSuchKey:
+            return None
+        return response["Body"].read()
+
+    def get_versioned(self, key: str) -> Tuple[Optional[bytes], Optional[str]]:
+        try:
+            response = self.__client.get_object(Bucket=self.__bucket, Key=self.__object_key(key))
+        except self.__client.exceptions.NoSuchKey:
+            return None, None
+        return response["Body"].read(), response["ETag"]
+
+    def put_if_match(self, key: str, data: bytes, content_type: str, version: Optional[str]) -> bool:
+        # S3 조건부 쓰기: 버전이 있으면 If-Match(ETag), 없으면 If-None-Match: *
+        condition = {"IfMatch": version} if version is not None else {"IfNoneMatch": "*"}
+        try:
+            self.__client.put_object(
+                Bucket=self.__bucket, Key=self.__object_key(key), Body=data, ContentType=content_type, **condition
+            )
+        except Exception as e:
+            code = getattr(e, "response", {}).get("Error", {}).get("Code")
+            if code in ("PreconditionFailed", "ConditionalRequestConflict"):
+                return False
+            raise
+        return True
+
+    def exists(self, key: str) -> bool:
+        object_key = self.__object_key(key)
+        response = self.__client.list_objects_v2(Bucket=self.__bucket, Prefix=object_key, MaxKeys=1)
+        return any(obj["Key"] == object_key for obj in response.get("Contents", []))
+
+    def delete(self, key: str) -> None:
+        self.__client.delete_object(Bucket=self.__bucket, Key=self.__object_key(key))
+
+    def list(self, prefix: str = "") -> List[str]:
+        keys = []
+        paginator = self.__client.get_paginator("list_objects_v2")
+        for page in paginator.paginate(Bucket=self.__bucket, Prefix=self.__object_key(prefix)):
+            for obj in page.get("Contents", []):
+                keys.append(obj["Key"][len(self.__prefix):])
+        return keys
+
+    def url(self, key: str) -> str:
+        return f"{self.__public_base_url}/{self.__object_key(key)}"
+
+
+def create_image_storage(settings: Optional[Settings] = None) -> ImageStorage:
+    """설정에 따라 생성 이미지 저장소 생성"""
+    settings = settings or get_settings()
+
+    if settings.IMAGE_STORAGE_BACKEND == "local":
+        return LocalImageStorage(Path("static/generated_images"), "/static/generated_images")
+
+    if settings.IMAGE_STORAGE_BACKEND == "s3":
+        if not settings.S3_BUCKET:
+            raise ValueError("S3_BUCKET is required when IMAGE_STORAGE_BACKEND=s3")
+        # 서명된 URL은 만료되고 호출마다 바뀌어 DB/인덱스에 저장할 수 없음
+        if not settings.S3_PUBLIC_BASE_URL:
+            raise ValueError("S3_PUBLIC_BASE_URL is required when IMAGE_STORAGE_BACKEND=s3")
+        return S3ImageStorage(
+            bucket=settings.S3_BUCKET,
+            prefix=settings.S3_PREFIX,
+            public_base_url=settings.S3_PUBLIC_BASE_URL,
+            endpoint_url=settings.S3_ENDPOINT_URL,
+            region=settings.S3_REGION,
+            access_key_id=settings.S3_ACCESS_KEY_ID,
+            secret_access_key=settings.S3_SECRET_ACCESS_KEY,
+        )
+
+    raise ValueError(f"Unknown IMAGE_STORAGE_BACKEND: {settings.IMAGE_STORAGE_BACKEND}")
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey, JSON
+from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey, JSON, LargeBinary
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from core.database import Base
@@ -25,6 +25,8 @@ class Game(Base):
     genre = Column(String(100), nullable=False)  # 게임 장르
     playtime = Column(Integer, nullable=False)  # 분 단위 플레이 시간
     main_character_id = Column(Integer, ForeignKey("characters.id"), nullable=False)  # 게임의 메인 캐릭터
+    parent_game_id = Column(Integer, ForeignKey("games.id"), nullable=True, index=True)  # 분기한 원본 게임 (분기 게임만)
+    fork_scene_id = Column(Integer, nullable=True)  # 분기 지점 씬 (원본 히스토리는 이 씬 이전까지 공유, 이 씬은 복사)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
 
@@ -68,3 +70,53 @@ class Scene(Base):
 
     # Relationships
     session = relationship("Session", back_populates="scenes")
+
+
+# 게임 진행 단계 (GameState.phase)
+GAME_PHASE_DIALOGUE = "dialogue"  # 대사 씬 다음 진행 대기
+GAME_PHASE_SELECTION = "selection"  # 사용자 선택 대기
+GAME_PHASE_ENDED = "ended"  # 엔딩 ("끝") 이후
+
+
+class GameState(Base):
+    """게임 진행 상태 스냅샷 - 씬이 생성될 때 같은 트랜잭션에서 갱신 (턴마다 기본 키 조회 한 번)"""
+    __tablename__ = "game_states"
+
+    game_id = Column(Integer, ForeignKey("games.id"), primary_key=True)
+    current_session_id = Column(Integer, ForeignKey("sessions.id"), nullable=False)
+    current_scene_id = Column(Integer, ForeignKey("scenes.id"), nullable=True)
+    next_session_number = Column(Integer, nullable=False)
+    next_scene_number = Column(Integer, nullable=False)  # 현재 세션의 다음 씬 번호
+    phase = Column(String(20), nullable=False, default=GAME_PHASE_DIALOGUE)
+    main_character_id = Column(Integer, nullable=False)
+    last_emotion = Column(String(20), nullable=True)  # 마지막 턴의 사용자 주요 감정
+    token_usage = Column(Integer, default=0, nullable=False)  # 누적 LLM 토큰 사용량
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+
+    # Relationships (상태 조회 한 번에 게임과 현재 세션까지 조인해서 로드)
+    game = relationship("Game", lazy="joined")
+    current_session = relationship("Session", lazy="joined")
+
+
+class GameArchive(Base):
+    """
+    보관된 게임 - 끝난 지 오래된 게임의 세션/씬/상태를 gzip JSONL 한 덩어리로 보관
+    games 행은 그대로 두고 (목록 조회용 스텁) 조회하거나 이어서 진행할 때 다시 풀어서 복원
+    """
+    __tablename__ = "game_archives"
+
+    game_id = Column(Integer, ForeignKey("games.id"), primary_key=True)
+    format_version = Column(Integer, nullable=False, default=1)
+    data = Column(LargeBinary(length=2**24 - 1), nullable=False)  # gzip JSONL (MySQL MEDIUMBLOB)
+    session_count = Column(Integer, nullable=False)
+    scene_count = Column(Integer, nullable=False)
+    latest_scene_id = Column(Integer, nullable=True)  # 목록 조회용 (복원하지 않고 응답)
+    archived_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+
+class ArchivedBackground(Base):
+    """보관된 게임의 세션이 배경으로 쓰는 이미지 (보관 데이터 안의 URL은 조회할 수 없어 따로 기록, 이미지 정리 시 확인)"""
+    __tablename__ = "archived_backgrounds"
+
+    game_id = Column(Integer, ForeignKey("game_archives.game_id"), primary_key=True)
+    image_hash = Column(String(64), primary_key=True, index=True)
@@ -0,0 +1,27 @@
+from sqlalchemy import Column, Integer, String, DateTime
+from datetime import datetime
+from core.database import Base
+
+
+class BackgroundKeyword(Base):
+    """장면 설명 → 배경 검색 키워드 캐시 테이블 (LLM 호출 결과 재사용)"""
+    __tablename__ = "background_keywords"
+
+    story_hash = Column(String(64), primary_key=True)  # 정규화된 장면 설명의 sha256
+    keyword = Column(String(200), nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+
+class GeneratedImage(Base):
+    """생성된 배경 이미지 테이블 - 콘텐츠 해시 파일의 메타데이터와 사용 기록"""
+    __tablename__ = "images"
+
+    hash = Column(String(64), primary_key=True)  # 파일 내용의 sha256 (파일명: {hash}.png)
+    filename = Column(String(100), nullable=False)
+    keyword = Column(String(200), nullable=False)  # 처음 생성할 때 사용한 키워드
+    width = Column(Integer, nullable=False)
+    height = Column(Integer, nullable=False)
+    bytes = Column(Integer, nullable=False)
+    reference_count = Column(Integer, default=0, nullable=False)  # 이 이미지를 배경으로 쓰는 세션 수
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    last_used_at = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime
+from sqlalchemy import CHAR, Column, Integer, String, DateTime
 from datetime import datetime
 from core.database import Base
 
@@ -19,6 +19,6 @@ class RefreshToken(Base):
 
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
     user_id = Column(Integer, nullable=False, index=True)
-    token = Column(String(500), unique=True, nullable=False, index=True)
+    token_hash = Column(CHAR(64), unique=True, nullable=False)  # 토큰 원문의 SHA-256 hex (원문은 저장하지 않음)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
-    expires_at = Column(DateTime, nullable=False)
+    expires_at = Column(DateTime, nullable=False, index=True)  # 만료 토큰 정리용
@@ -0,0 +1,282 @@
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from domain.entity.game import Character, Game, GameState, Session as GameSession, Scene
+from domain.repository.game_repository import (
+    advance_game_state,
+    copy_fork_scene,
+    copy_fork_session,
+    fork_game_state,
+    history_scene_filter,
+    history_segments,
+    history_sessions_query,
+    initial_game_state,
+    new_fork_game,
+    record_background_use,
+    user_games_query,
+)
+from typing import List, Optional, Tuple
+
+
+class AsyncCharacterRepository:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def get_all_characters(self) -> List[Character]:
+        """모든 캐릭터 조회"""
+        result = await self.db.scalars(select(Character))
+        return list(result.all())
+
+    async def get_character_by_id(self, character_id: int) -> Optional[Character]:
+        """ID로 캐릭터 조회"""
+        return await self.db.get(Character, character_id)
+
+    async def create_character(self, name: str, personality: str) -> Character:
+        """캐릭터 생성"""
+        character = Character(name=name, personality=personality)
+        self.db.add(character)
+        await self.db.commit()
+        await self.db.refresh(character)
+        return character
+
+
+class AsyncGameRepository:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def create_game(
+        self,
+        user_id: int,
+        title: str,
+        personality: str,
+        genre: str,
+        playtime: int,
+        main_character_id: int,
+    ) -> Game:
+        """새 게임 생성"""
+        game = Game(
+            user_id=user_id,
+            title=title,
+            personality=personality,
+            genre=genre,
+            playtime=playtime,
+            main_character_id=main_character_id,
+        )
+        self.db.add(game)
+        await self.db.commit()
+        await self.db.refresh(game)
+        return game
+
+    async def get_game_by_id(self, game_id: int) -> Optional[Game]:
+        """ID로 게임 조회"""
+        return await self.db.get(Game, game_id)
+
+    async def get_games_by_user(
+        self, user_id: int, before_id: Optional[int] = None, limit: Optional[int] = None
+    ) -> List[Game]:
+        """
+        사용자의 게임 조회
+        limit을 주면 최신 게임부터 keyset 페이지 (before_id보다 작은 ID만)
+        """
+        result = await self.db.scalars(user_games_query(user_id, before_id, limit))
+        return list(result.all())
+
+    async def get_game_with_scenes(
+        self, game_id: int, after_scene_id: int = 0, limit: Optional[int] = None
+    ) -> Tuple[Optional[Game], List[GameSession]]:
+        """
+        게임과 히스토리의 세션 + 씬 조회 (selectinload로 씬은 쿼리 1번)
+        분기 게임은 원본 게임들의 분기 지점 이전 세션/씬도 포함 (세션 번호 순)
+        씬은 after_scene_id 이후 limit개만 (씬 ID는 히스토리 순서대로 증가)
+        """
+        game = await self.db.get(Game, game_id)
+        if game is None:
+            return None, []
+        segments = await self.db.run_sync(history_segments, game_id)
+        result = await self.db.scalars(
+            history_sessions_query(segments, after_scene_id, limit).execution_options(populate_existing=True)
+        )
+        return game, list(result.all())
+
+    async def create_fork(self, parent: Game, scene: Scene) -> GameState:
+        """
+        scene에서 분기한 게임과 진행 상태 생성 (한 트랜잭션)
+        원본 히스토리는 복사하지 않고 scene이 속한 세션과 scene 한 행씩만 복사 (분기 게임의 첫 세션/씬)
+        """
+        session = await self.db.get(GameSession, scene.session_id)
+        fork = new_fork_game(parent, scene)
+        self.db.add(fork)
+        await self.db.flush()
+        fork_session = copy_fork_session(fork, session)
+        self.db.add(fork_session)
+        await self.db.run_sync(record_background_use, session.background_url)
+        await self.db.flush()
+        fork_scene = copy_fork_scene(fork_session, scene)
+        self.db.add(fork_scene)
+        await self.db.flush()
+        state = fork_game_state(fork, fork_session, fork_scene)
+        self.db.add(state)
+        await self.db.commit()
+        return state
+
+    async def update_game(self, game: Game) -> Game:
+        """게임 업데이트"""
+        await self.db.commit()
+        await self.db.refresh(game)
+        return game
+
+
+class AsyncSessionRepository:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def create_session(
+        self,
+        game_id: int,
+        session_number: int,
+        content: str,
+        background_url: Optional[str] = None,
+    ) -> GameSession:
+        """새 세션 생성"""
+        session = GameSession(
+            game_id=game_id,
+            session_number=session_number,
+            content=content,
+            background_url=background_url,
+        )
+        self.db.add(session)
+        await self.db.run_sync(record_background_use, background_url)
+        await self.db.commit()
+        await self.db.refresh(session)
+        return session
+
+    async def get_session_by_id(self, session_id: int) -> Optional[GameSession]:
+        """ID로 세션 조회"""
+        return await self.db.get(GameSession, session_id)
+
+    async def get_sessions_by_game(self, game_id: int) -> List[GameSession]:
+        """게임의 모든 세션 조회"""
+        result = await self.db.scalars(
+            select(GameSession)
+            .where(GameSession.game_id == game_id)
+            .order_by(GameSession.session_number)
+        )
+        return list(result.all())
+
+    async def get_latest_session(self, game_id: int) -> Optional[GameSession]:
+        """게임의 가장 최근 세션 조회"""
+        return await self.db.scalar(
+            select(GameSession)
+            .where(GameSession.game_id == game_id)
+            .order_by(GameSession.session_number.desc())
+            .limit(1)
+        )
+
+    async def update_session(self, session: GameSession) -> GameSession:
+        """세션 업데이트"""
+        await self.db.commit()
+        await self.db.refresh(session)
+        return session
+
+    async def mark_session_completed(self, session_id: int) -> Optional[GameSession]:
+        """세션을 완료 상태로 표시"""
+        session = await self.get_session_by_id(session_id)
+        if session:
+            session.is_completed = 1
+            return await self.update_session(session)
+        return None
+
+
+class AsyncSceneRepository:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def create_scene(
+        self,
+        session_id: int,
+        scene_number: int,
+        role: str,
+        scene_type: str,
+        dialogue: Optional[str] = None,
+        selections: Optional[dict] = None,
+        character_id: Optional[int] = None,
+        emotion: Optional[str] = None,
+        game_state: Optional[GameState] = None,
+        user_emotion: Optional[str] = None,
+        token_usage: int = 0,
+    ) -> Scene:
+        """새 씬 생성 (game_state가 있으면 같은 트랜잭션에서 진행 상태도 갱신)"""
+        scene = Scene(
+            session_id=session_id,
+            scene_number=scene_number,
+            role=role,
+            type=scene_type,
+            dialogue=dialogue,
+            selections=selections,
+            character_id=character_id,
+            emotion=emotion,
+        )
+        self.db.add(scene)
+
+        if game_state is not None:
+            await self.db.flush()  # 새 씬 ID
+            advance_game_state(game_state, scene, user_emotion, token_usage)
+            self.db.add(game_state)
+
+        await self.db.commit()
+        await self.db.refresh(scene)
+        return scene
+
+    async def get_scene_by_id(self, scene_id: int) -> Optional[Scene]:
+        """ID로 씬 조회"""
+        return await self.db.get(Scene, scene_id)
+
+    async def get_scenes_by_session(self, session_id: int) -> List[Scene]:
+        """세션의 모든 씬 조회"""
+        result = await self.db.scalars(
+            select(Scene)
+            .where(Scene.session_id == session_id)
+            .order_by(Scene.scene_number)
+        )
+        return list(result.all())
+
+    async def get_latest_scene(self, session_id: int) -> Optional[Scene]:
+        """세션의 가장 최근 씬 조회"""
+        return await self.db.scalar(
+            select(Scene)
+            .where(Scene.session_id == session_id)
+            .order_by(Scene.scene_number.desc())
+            .limit(1)
+        )
+
+    async def update_scene_selection(self, scene_id: int, selected_option: int) -> Optional[Scene]:
+        """씬의 선택지 업데이트"""
+        scene = await self.get_scene_by_id(scene_id)
+        if scene:
+            scene.selected_option = selected_option
+            await self.db.commit()
+            await self.db.refresh(scene)
+        return scene
+
+    async def get_all_scenes_in_game(self, game_id: int) -> List[Scene]:
+        """게임의 모든 씬 조회 (대화 히스토리 용, 분기 게임은 원본의 분기 지점 이전 씬 포함)"""
+        segments = await self.db.run_sync(history_segments, game_id)
+        result = await self.db.scalars(
+            select(Scene)
+            .join(GameSession)
+            .where(history_scene_filter(segments))
+            .order_by(GameSession.session_number, Scene.scene_number)
+        )
+        return list(result.all())
+
+
+class AsyncGameStateRepository:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def get_state(self, game_id: int) -> Optional[GameState]:
+        """게임 진행 상태 조회 (게임, 현재 세션까지 한 번의 쿼리)"""
+        return await self.db.get(GameState, game_id)
+
+    def build_state(self, game: Game, session: GameSession) -> GameState:
+        """새 게임의 첫 세션 상태 (첫 씬 생성 시 함께 저장)"""
+        return initial_game_state(game, session)
@@ -0,0 +1,128 @@
+from sqlalchemy import delete, select
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession
+from domain.entity.user import User, RefreshToken
+from domain.repository.user_repository import (
+    LEGACY_TOKEN_LOOKUP,
+    disable_legacy_token_lookup,
+    legacy_token_lookup_enabled,
+)
+from core.security import hash_token
+from typing import List, Optional
+from datetime import datetime
+
+
+class AsyncUserRepository:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def create_user(self, username: str, email: str, hashed_password: str) -> User:
+        user = User(
+            username=username,
+            email=email,
+            hashed_password=hashed_password
+        )
+        self.db.add(user)
+        await self.db.commit()
+        await self.db.refresh(user)
+        return user
+
+    async def get_user_by_username(self, username: str) -> Optional[User]:
+        return await self.db.scalar(select(User).where(User.username == username))
+
+    async def get_user_by_email(self, email: str) -> Optional[User]:
+        return await self.db.scalar(select(User).where(User.email == email))
+
+    async def get_user_by_id(self, user_id: int) -> Optional[User]:
+        return await self.db.get(User, user_id)
+
+    async def save_refresh_token(
+        self, user_id: int, token: str, expires_at: datetime, max_active: int = 0
+    ) -> RefreshToken:
+        """
+        토큰 해시 저장 (max_active > 0이면 같은 트랜잭션에서 만료된 토큰과
+        유효한 토큰 중 max_active개를 넘는 오래된 토큰 삭제)
+        """
+        refresh_token = RefreshToken(
+            user_id=user_id,
+            token_hash=hash_token(token),
+            expires_at=expires_at
+        )
+        self.db.add(refresh_token)
+        if max_active > 0:
+            await self.db.flush()
+            await self._evict_refresh_tokens(user_id, max_active)
+        await self.db.commit()
+        await self.db.refresh(refresh_token)
+        return refresh_token
+
+    async def _evict_refresh_tokens(self, user_id: int, max_active: int) -> None:
+        now = datetime.utcnow()
+        # 사용자당 토큰 수가 적으므로 ID를 먼저 읽고 삭제 (MySQL은 IN 서브쿼리에 LIMIT/OFFSET 미지원)
+        active_ids = (
+            await self.db.scalars(
+                select(RefreshToken.id)
+                .where(RefreshToken.user_id == user_id, RefreshToken.expires_at >= now)
+                .order_by(RefreshToken.created_at.desc(), RefreshToken.id.desc())
+            )
+        ).all()
+        evicted_ids = active_ids[max_active:]
+        await self.db.execute(
+            delete(RefreshToken).where(
+                RefreshToken.user_id == user_id,
+                (RefreshToken.expires_at < now) | RefreshToken.id.in_(evicted_ids),
+            )
+        )
+
+    async def get_refresh_token(self, token: str) -> Optional[RefreshToken]:
+        refresh_token = await self.db.scalar(select(RefreshToken).where(RefreshToken.token_hash == hash_token(token)))
+        if refresh_token is None and legacy_token_lookup_enabled():
+            refresh_token = await self._get_legacy_refresh_token(token)
+        return refresh_token
+
+    async def _get_legacy_refresh_token(self, token: str) -> Optional[RefreshToken]:
+        """해시가 아직 없는 (마이그레이션 중 구버전 서버가 발급한) 토큰을 원문 컬럼으로 찾고 해시를 채움"""
+        try:
+            token_id = await self.db.scalar(LEGACY_TOKEN_LOOKUP, {"token": token})
+        except DBAPIError as e:
+            disable_legacy_token_lookup(e)
+            return None
+        if token_id is None:
+            return None
+        refresh_token = await self.db.get(RefreshToken, token_id)
+        refresh_token.token_hash = hash_token(token)
+        await self.db.commit()
+        return refresh_token
+
+    async def delete_refresh_token(self, token: str) -> None:
+        await self.db.execute(delete(RefreshToken).where(RefreshToken.token_hash == hash_token(token)))
+        await self.db.commit()
+
+    async def replace_refresh_token(self, old_token: str, user_id: int, new_token: str, expires_at: datetime) -> RefreshToken:
+        """기존 토큰을 삭제하고 새 토큰을 저장하는 원자적 작업"""
+        await self.db.execute(delete(RefreshToken).where(RefreshToken.token_hash == hash_token(old_token)))
+        refresh_token = RefreshToken(
+            user_id=user_id,
+            token_hash=hash_token(new_token),
+            expires_at=expires_at
+        )
+        self.db.add(refresh_token)
+        await self.db.commit()
+        await self.db.refresh(refresh_token)
+        return refresh_token
+
+    async def get_expired_refresh_token_ids(self, now: datetime, limit: int) -> List[int]:
+        """만료된 토큰 ID (오래 전에 만료된 순, expires_at 인덱스 사용)"""
+        rows = await self.db.scalars(
+            select(RefreshToken.id)
+            .where(RefreshToken.expires_at < now)
+            .order_by(RefreshToken.expires_at)
+            .limit(limit)
+        )
+        return list(rows.all())
+
+    async def delete_refresh_tokens_by_ids(self, token_ids: List[int]) -> int:
+        """ID 목록의 토큰 삭제 후 커밋 (삭제한 행 수)"""
+        result = await self.db.execute(delete(RefreshToken).where(RefreshToken.id.in_(token_ids)))
+        await self.db.commit()
+        return result.rowcount
@@ -1,16 +1,214 @@
-from sqlalchemy.orm import Session
-from domain.entity.game import Character, Game, Session as GameSession, Scene
-from typing import List, Optional
+from sqlalchemy import and_, case, delete, func, insert, or_, select, update
+from sqlalchemy.orm import Session, aliased, selectinload
+from domain.entity.game import (
+    GAME_PHASE_DIALOGUE,
+    GAME_PHASE_ENDED,
+    GAME_PHASE_SELECTION,
+    ArchivedBackground,
+    Character,
+    Game,
+    GameArchive,
+    GameState,
+    Scene,
+    Session as GameSession,
+)
+from domain.entity.image import GeneratedImage
+from core.db_routing import read_only
+from core.static_files import extract_content_hash
+from typing import Dict, List, Optional, Tuple
+from collections import Counter
+from datetime import datetime
+
+
+def scene_phase(scene: Scene) -> str:
+    """씬 다음에 기다리는 게임 진행 단계"""
+    if scene.type == "selection":
+        return GAME_PHASE_SELECTION
+    if (scene.dialogue or "").strip() == "끝":
+        return GAME_PHASE_ENDED
+    return GAME_PHASE_DIALOGUE
+
+
+def initial_game_state(game: Game, session: GameSession) -> GameState:
+    """새 게임의 첫 세션 상태 (첫 씬 생성 시 함께 저장)"""
+    return GameState(
+        game_id=game.id,
+        current_session_id=session.id,
+        next_session_number=session.session_number + 1,
+        next_scene_number=1,
+        phase=GAME_PHASE_DIALOGUE,
+        main_character_id=game.main_character_id,
+        token_usage=0,
+    )
+
+
+def advance_game_state(
+    state: GameState, scene: Scene, user_emotion: Optional[str] = None, token_usage: int = 0
+) -> None:
+    """새 씬(ID가 부여된 뒤)으로 진행 상태 갱신 (동기/비동기 리포지토리 공용)"""
+    state.current_session_id = scene.session_id
+    state.current_scene_id = scene.id
+    state.next_scene_number = scene.scene_number + 1
+    state.phase = scene_phase(scene)
+    if user_emotion:
+        state.last_emotion = user_emotion
+    state.token_usage = (state.token_usage or 0) + token_usage
+
+
+def history_segments(db: Session, game_id: int) -> List[Tuple[int, Optional[int]]]:
+    """
+    게임 히스토리를 이루는 (게임 ID, 이 ID 미만의 씬만 - None이면 전부) 목록
+    분기 게임은 자기 씬 + 원본 게임들의 분기 지점 이전 씬 (분기 깊이만큼 기본 키 조회, 이미 로드된 게임은 조회 없음)
+    비동기 세션에서는 AsyncSession.run_sync(history_segments, game_id)로 사용
+    """
+    segments = [(game_id, None)]
+    game = db.get(Game, game_id)
+    before_scene_id = None
+    while game is not None and game.parent_game_id is not None:
+        if before_scene_id is None or game.fork_scene_id < before_scene_id:
+            before_scene_id = game.fork_scene_id
+        segments.append((game.parent_game_id, before_scene_id))
+        game = db.get(Game, game.parent_game_id)
+    return segments
+
+
+def history_scene_filter(segments: List[Tuple[int, Optional[int]]], scene=Scene):
+    """history_segments의 씬만 고르는 조건 (scene 컬럼만 참조하므로 관계 로더 조건에도 사용 가능)"""
+    conditions = []
+    for game_id, before_scene_id in segments:
+        owner = aliased(GameSession)
+        condition = scene.session_id.in_(select(owner.id).where(owner.game_id == game_id))
+        if before_scene_id is not None:
+            condition = and_(condition, scene.id < before_scene_id)
+        conditions.append(condition)
+    return or_(*conditions)
+
+
+def user_games_query(user_id: int, before_id: Optional[int] = None, limit: Optional[int] = None):
+    """사용자 게임 조회문 (limit을 주면 최신 게임부터 before_id보다 작은 ID의 keyset 페이지)"""
+    query = select(Game).where(Game.user_id == user_id)
+    if limit is None:
+        return query
+    if before_id is not None:
+        query = query.where(Game.id < before_id)
+    return query.order_by(Game.id.desc()).limit(limit)
+
+
+def history_sessions_query(
+    segments: List[Tuple[int, Optional[int]]], after_scene_id: int = 0, limit: Optional[int] = None
+):
+    """히스토리 세션 조회문 (씬은 selectinload로 after_scene_id 이후 limit개만)"""
+    scene_filter = [Scene.id > after_scene_id, history_scene_filter(segments)]
+    if limit is not None:
+        # 페이지의 마지막 씬 ID (남은 씬이 limit개보다 적으면 NULL → 전부)
+        page_scene = aliased(Scene)
+        page_end = (
+            select(page_scene.id)
+            .where(history_scene_filter(segments, page_scene), page_scene.id > after_scene_id)
+            .order_by(page_scene.id)
+            .offset(limit - 1)
+            .limit(1)
+            .scalar_subquery()
+        )
+        scene_filter.append(Scene.id <= func.coalesce(page_end, Scene.id))
+    return (
+        select(GameSession)
+        .where(GameSession.game_id.in_([segment_game_id for segment_game_id, _ in segments]))
+        .options(selectinload(GameSession.scenes.and_(*scene_filter)))
+        .order_by(GameSession.session_number, GameSession.id)
+    )
+
+
+def new_fork_game(parent: Game, scene: Scene) -> Game:
+    """scene에서 분기한 새 게임 (원본 설정 복사)"""
+    return Game(
+        user_id=parent.user_id,
+        title=parent.title,
+        personality=parent.personality,
+        genre=parent.genre,
+        playtime=parent.playtime,
+        main_character_id=parent.main_character_id,
+        parent_game_id=parent.id,
+        fork_scene_id=scene.id,
+    )
+
+
+def copy_fork_session(fork: Game, session: GameSession) -> GameSession:
+    """분기 지점 씬이 속한 세션의 복사본 (분기 게임의 첫 세션)"""
+    return GameSession(
+        game_id=fork.id,
+        session_number=session.session_number,
+        content=session.content,
+        background_url=session.background_url,
+    )
+
+
+def copy_fork_scene(fork_session: GameSession, scene: Scene) -> Scene:
+    """분기 지점 씬의 복사본 (선택 결과(selected_option)는 복사하지 않음 → 다른 선택지를 고를 수 있음)"""
+    return Scene(
+        session_id=fork_session.id,
+        scene_number=scene.scene_number,
+        role=scene.role,
+        type=scene.type,
+        dialogue=scene.dialogue,
+        selections=scene.selections,
+        character_id=scene.character_id,
+        emotion=scene.emotion,
+    )
+
+
+def fork_game_state(fork: Game, fork_session: GameSession, fork_scene: Scene) -> GameState:
+    """분기 게임의 진행 상태 (복사한 씬 다음부터)"""
+    return GameState(
+        game_id=fork.id,
+        current_session_id=fork_session.id,
+        current_scene_id=fork_scene.id,
+        next_session_number=fork_session.session_number + 1,
+        next_scene_number=fork_scene.scene_number + 1,
+        phase=scene_phase(fork_scene),
+        main_character_id=fork.main_character_id,
+        token_usage=0,
+    )
+
+
+def record_background_use(db: Session, background_url: Optional[str]) -> None:
+    """배경 이미지 사용 기록 (같은 트랜잭션에서 참조 수 증가, 비동기 세션은 run_sync로 사용)"""
+    image_hash = extract_content_hash(background_url) if background_url else None
+    if image_hash:
+        db.query(GeneratedImage).filter(GeneratedImage.hash == image_hash).update(
+            {
+                GeneratedImage.reference_count: GeneratedImage.reference_count + 1,
+                GeneratedImage.last_used_at: datetime.utcnow(),
+            },
+            synchronize_session=False,
+        )
+
+
+def release_background_use(db: Session, background_urls: List[Optional[str]]) -> None:
+    """세션이 빠질 때 배경 이미지 참조 수 감소 (같은 트랜잭션, URL이 나온 횟수만큼, 0 미만으로는 내려가지 않음)"""
+    released = Counter(extract_content_hash(url) for url in background_urls if url)
+    released.pop(None, None)
+    for image_hash, count in released.items():
+        db.query(GeneratedImage).filter(GeneratedImage.hash == image_hash).update(
+            {
+                GeneratedImage.reference_count: case(
+                    (GeneratedImage.reference_count > count, GeneratedImage.reference_count - count), else_=0
+                ),
+            },
+            synchronize_session=False,
+        )
 
 
 class CharacterRepository:
     def __init__(self, db: Session):
         self.db = db
 
+    @read_only
     def get_all_characters(self) -> List[Character]:
         """모든 캐릭터 조회"""
         return self.db.query(Character).all()
 
+    @read_only
     def get_character_by_id(self, character_id: int) -> Optional[Character]:
         """ID로 캐릭터 조회"""
         return self.db.query(Character).filter(Character.id == character_id).first()
@@ -55,9 +253,54 @@ class GameRepository:
         """ID로 게임 조회"""
         return self.db.query(Game).filter(Game.id == game_id).first()
 
-    def get_games_by_user(self, user_id: int) -> List[Game]:
-        """사용자의 모든 게임 조회"""
-        return self.db.query(Game).filter(Game.user_id == user_id).all()
+    @read_only
+    def get_games_by_user(
+        self, user_id: int, before_id: Optional[int] = None, limit: Optional[int] = None
+    ) -> List[Game]:
+        """
+        사용자의 게임 조회
+        limit을 주면 최신 게임부터 keyset 페이지 (before_id보다 작은 ID만)
+        """
+        return list(self.db.scalars(user_games_query(user_id, before_id, limit)))
+
+    @read_only
+    def get_game_with_scenes(
+        self, game_id: int, after_scene_id: int = 0, limit: Optional[int] = None
+    ) -> Tuple[Optional[Game], List[GameSession]]:
+        """
+        게임과 히스토리의 세션 + 씬 조회 (selectinload로 씬은 쿼리 1번, 지연 로딩 없음)
+        분기 게임은 원본 게임들의 분기 지점 이전 세션/씬도 포함 (세션 번호 순)
+        씬은 after_scene_id 이후 limit개만 (씬 ID는 히스토리 순서대로 증가)
+        """
+        game = self.db.get(Game, game_id)
+        if game is None:
+            return None, []
+        segments = history_segments(self.db, game_id)
+        sessions = self.db.scalars(
+            history_sessions_query(segments, after_scene_id, limit).execution_options(populate_existing=True)
+        ).all()
+        return game, list(sessions)
+
+    def create_fork(self, parent: Game, scene: Scene) -> GameState:
+        """
+        scene에서 분기한 게임과 진행 상태 생성 (한 트랜잭션)
+        원본 히스토리는 복사하지 않고 scene이 속한 세션과 scene 한 행씩만 복사 (분기 게임의 첫 세션/씬)
+        """
+        session = scene.session
+        fork = new_fork_game(parent, scene)
+        self.db.add(fork)
+        self.db.flush()
+        fork_session = copy_fork_session(fork, session)
+        self.db.add(fork_session)
+        record_background_use(self.db, session.background_url)
+        self.db.flush()
+        fork_scene = copy_fork_scene(fork_session, scene)
+        self.db.add(fork_scene)
+        self.db.flush()
+        state = fork_game_state(fork, fork_session, fork_scene)
+        self.db.add(state)
+        self.db.commit()
+        return state
 
     def update_game(self, game: Game) -> Game:
         """게임 업데이트"""
@@ -85,6 +328,7 @@ class SessionRepository:
             background_url=background_url,
         )
         self.db.add(session)
+        record_background_use(self.db, background_url)
         self.db.commit()
         self.db.refresh(session)
         return session
@@ -93,6 +337,7 @@ class SessionRepository:
         """ID로 세션 조회"""
         return self.db.query(GameSession).filter(GameSession.id == session_id).first()
 
+    @read_only
     def get_sessions_by_game(self, game_id: int) -> List[GameSession]:
         """게임의 모든 세션 조회"""
         return (
@@ -140,8 +385,11 @@ class SceneRepository:
         selections: Optional[dict] = None,
         character_id: Optional[int] = None,
         emotion: Optional[str] = None,
+        game_state: Optional[GameState] = None,
+        user_emotion: Optional[str] = None,
+        token_usage: int = 0,
     ) -> Scene:
-        """새 씬 생성"""
+        """새 씬 생성 (game_state가 있으면 같은 트랜잭션에서 진행 상태도 갱신)"""
         scene = Scene(
             session_id=session_id,
             scene_number=scene_number,
@@ -153,6 +401,12 @@ class SceneRepository:
             emotion=emotion,
         )
         self.db.add(scene)
+
+        if game_state is not None:
+            self.db.flush()  # 새 씬 ID
+            advance_game_state(game_state, scene, user_emotion, token_usage)
+            self.db.add(game_state)
+
         self.db.commit()
         self.db.refresh(scene)
         return scene
@@ -161,6 +415,7 @@ class SceneRepository:
         """ID로 씬 조회"""
         return self.db.query(Scene).filter(Scene.id == scene_id).first()
 
+    @read_only
     def get_scenes_by_session(self, session_id: int) -> List[Scene]:
         """세션의 모든 씬 조회"""
         return (
@@ -188,12 +443,268 @@ class SceneRepository:
             self.db.refresh(scene)
         return scene
 
+    @read_only
+    def get_latest_scene_ids(self, game_ids: List[int]) -> Dict[int, int]:
+        """게임별 가장 최근 씬 ID (씬이 없는 게임은 제외)"""
+        if not game_ids:
+            return {}
+        rows = (
+            self.db.query(GameSession.game_id, func.max(Scene.id))
+            .join(Scene, Scene.session_id == GameSession.id)
+            .filter(GameSession.game_id.in_(game_ids))
+            .group_by(GameSession.game_id)
+            .all()
+        )
+        return {game_id: scene_id for game_id, scene_id in rows}
+
     def get_all_scenes_in_game(self, game_id: int) -> List[Scene]:
-        """게임의 모든 씬 조회 (대화 히스토리 용)"""
+        """게임의 모든 씬 조회 (대화 히스토리 용, 분기 게임은 원본의 분기 지점 이전 씬 포함)"""
         return (
             self.db.query(Scene)
             .join(GameSession)
-            .filter(GameSession.game_id == game_id)
+            .filter(history_scene_filter(history_segments(self.db, game_id)))
             .order_by(GameSession.session_number, Scene.scene_number)
             .all()
         )
+
+    def get_history_scene(self, game_id: int, scene_id: int) -> Optional[Scene]:
+        """게임 히스토리(분기 게임은 원본의 분기 지점 이전 포함)에 있는 씬"""
+        return (
+            self.db.query(Scene)
+            .filter(Scene.id == scene_id, history_scene_filter(history_segments(self.db, game_id)))
+            .first()
+        )
+
+
+class GameStateRepository:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get_state(self, game_id: int) -> Optional[GameState]:
+        """게임 진행 상태 조회 (게임, 현재 세션까지 한 번의 쿼리)"""
+        return self.db.get(GameState, game_id)
+
+    def build_state(self, game: Game, session: GameSession) -> GameState:
+        """새 게임의 첫 세션 상태 (첫 씬 생성 시 함께 저장)"""
+        return initial_game_state(game, session)
+
+    def rebuild_state(self, game_id: int) -> Optional[GameState]:
+        """
+        상태 행이 없는 기존 게임의 상태를 세션/씬에서 다시 계산해 저장
+        (세션이 없는 게임은 None)
+        """
+        state = self.add_rebuilt_state(game_id)
+        if state is not None:
+            self.db.commit()
+        return state
+
+    def add_rebuilt_state(self, game_id: int) -> Optional[GameState]:
+        """rebuild_state와 같지만 커밋하지 않음 (가져오기처럼 호출하는 쪽 트랜잭션에 포함할 때)"""
+        game = self.db.get(Game, game_id)
+        if game is None:
+            return None
+        session = (
+            self.db.query(GameSession)
+            .filter(GameSession.game_id == game_id)
+            .order_by(GameSession.session_number.desc())
+            .first()
+        )
+        if session is None:
+            return None
+        scene = (
+            self.db.query(Scene)
+            .filter(Scene.session_id == session.id)
+            .order_by(Scene.scene_number.desc())
+            .first()
+        )
+        state = self.build_state(game, session)
+        if scene is not None:
+            state.current_scene_id = scene.id
+            state.next_scene_number = scene.scene_number + 1
+            state.phase = scene_phase(scene)
+        self.db.add(state)
+        return state
+
+
+class GameArchiveRepository:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def is_archived(self, game_id: int) -> bool:
+        return self.db.query(GameArchive.game_id).filter(GameArchive.game_id == game_id).first() is not None
+
+    def get_archive(self, game_id: int) -> Optional[GameArchive]:
+        return self.db.get(GameArchive, game_id)
+
+    def get_latest_scene_ids(self, game_ids: List[int]) -> Dict[int, int]:
+        """보관된 게임의 마지막 씬 ID (복원하지 않고 목록에 표시)"""
+        if not game_ids:
+            return {}
+        rows = (
+            self.db.query(GameArchive.game_id, GameArchive.latest_scene_id)
+            .filter(GameArchive.game_id.in_(game_ids), GameArchive.latest_scene_id.isnot(None))
+            .all()
+        )
+        return {game_id: scene_id for game_id, scene_id in rows}
+
+    def get_archive_candidates(self, finished_before: datetime, limit: int) -> List[int]:
+        """엔딩 후 finished_before 이전부터 진행이 없는 게임 ID (오래된 순, 분기 게임이 참조하는 원본은 제외)"""
+        forks = aliased(Game)
+        rows = (
+            self.db.query(GameState.game_id)
+            .filter(
+                GameState.phase == GAME_PHASE_ENDED,
+                GameState.updated_at < finished_before,
+                ~select(forks.id).where(forks.parent_game_id == GameState.game_id).exists(),
+            )
+            .order_by(GameState.updated_at)
+            .limit(limit)
+            .all()
+        )
+        return [game_id for (game_id,) in rows]
+
+    def get_game_rows(self, game_id: int) -> Tuple[List[GameSession], List[Scene], Optional[GameState]]:
+        """보관할 세션/씬/상태 (primary에서 조회)"""
+        sessions = (
+            self.db.query(GameSession)
+            .filter(GameSession.game_id == game_id)
+            .order_by(GameSession.session_number)
+            .all()
+        )
+        scenes = (
+            self.db.query(Scene)
+            .join(GameSession)
+            .filter(GameSession.game_id == game_id)
+            .order_by(Scene.id)
+            .all()
+        )
+        return sessions, scenes, self.db.get(GameState, game_id)
+
+    def archive_game(
+        self,
+        game_id: int,
+        data: bytes,
+        session_ids: List[int],
+        scene_ids: List[int],
+        background_hashes: List[str] = (),
+    ) -> GameArchive:
+        """
+        보관 행 저장과 원본 행 삭제를 한 트랜잭션으로 (게임 하나 단위라 잠금이 짧음)
+        background_hashes: 세션 배경 이미지 해시 (보관 중에도 이미지 정리에서 참조로 취급)
+        보관 데이터를 만든 뒤 씬이 추가되었거나 분기 게임이 생겼다면 롤백하고 ValueError
+        """
+        archive = GameArchive(
+            game_id=game_id,
+            format_version=1,
+            data=data,
+            session_count=len(session_ids),
+            scene_count=len(scene_ids),
+            latest_scene_id=max(scene_ids) if scene_ids else None,
+        )
+        self.db.add(archive)
+        self.db.flush()
+        if background_hashes:
+            self.db.execute(
+                insert(ArchivedBackground),
+                [{"game_id": game_id, "image_hash": image_hash} for image_hash in background_hashes],
+            )
+        self.db.execute(delete(GameState).where(GameState.game_id == game_id))
+        if scene_ids:
+            self.db.execute(delete(Scene).where(Scene.id.in_(scene_ids)))
+        if session_ids and self.db.query(Scene.id).filter(Scene.session_id.in_(session_ids)).first():
+            self.db.rollback()
+            raise ValueError(f"Game {game_id} has new scenes, skipping archive")
+        if self.db.query(Game.id).filter(Game.parent_game_id == game_id).first():
+            self.db.rollback()
+            raise ValueError(f"Game {game_id} has forks, skipping archive")
+        if session_ids:
+            release_background_use(
+                self.db,
+                list(self.db.scalars(select(GameSession.background_url).where(GameSession.id.in_(session_ids)))),
+            )
+            self.db.execute(delete(GameSession).where(GameSession.id.in_(session_ids)))
+        self.db.commit()
+        return archive
+
+    def restore_game(
+        self,
+        archive: GameArchive,
+        sessions: List[dict],
+        scenes: List[dict],
+        states: List[dict],
+    ) -> None:
+        """보관된 행을 원래 ID 그대로 다시 넣고 보관 행 삭제 (한 트랜잭션)"""
+        if sessions:
+            self.db.execute(insert(GameSession), sessions)
+            for session in sessions:
+                record_background_use(self.db, session.get("background_url"))
+        if scenes:
+            self.db.execute(insert(Scene), scenes)
+        if states:
+            self.db.execute(insert(GameState), states)
+        self.db.execute(delete(ArchivedBackground).where(ArchivedBackground.game_id == archive.game_id))
+        self.db.delete(archive)
+        self.db.commit()
+
+
+class GameTransferRepository:
+    """JSONL 내보내기/가져오기용 조회와 일괄 insert (ORM 객체를 만들지 않고 컬럼 값만 다룸)"""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    @read_only
+    def get_games_after(self, after_game_id: int, limit: int, user_id: Optional[int] = None) -> List[dict]:
+        """after_game_id 다음 게임 행 (ID 순, 키셋 페이지네이션)"""
+        stmt = select(*Game.__table__.columns).where(Game.id > after_game_id)
+        if user_id is not None:
+            stmt = stmt.where(Game.user_id == user_id)
+        return [dict(row) for row in self.db.execute(stmt.order_by(Game.id).limit(limit)).mappings()]
+
+    @read_only
+    def stream_sessions(self, game_ids: List[int], yield_per: int):
+        """게임들의 세션 행을 yield_per개씩 서버 측 커서로 읽는 결과 (순회가 끝날 때까지 다른 쿼리 금지)"""
+        stmt = (
+            select(*GameSession.__table__.columns)
+            .where(GameSession.game_id.in_(game_ids))
+            .order_by(GameSession.game_id, GameSession.session_number)
+        )
+        return self.db.execute(stmt.execution_options(yield_per=yield_per)).mappings()
+
+    @read_only
+    def stream_scenes(self, game_ids: List[int], yield_per: int):
+        """게임들의 씬 행을 yield_per개씩 서버 측 커서로 읽는 결과"""
+        stmt = (
+            select(*Scene.__table__.columns)
+            .join(GameSession, Scene.session_id == GameSession.id)
+            .where(GameSession.game_id.in_(game_ids))
+            .order_by(Scene.session_id, Scene.scene_number)
+        )
+        return self.db.execute(stmt.execution_options(yield_per=yield_per)).mappings()
+
+    @read_only
+    def get_archived_game_ids(self, game_ids: List[int]) -> List[int]:
+        rows = self.db.execute(
+            select(GameArchive.game_id).where(GameArchive.game_id.in_(game_ids)).order_by(GameArchive.game_id)
+        )
+        return list(rows.scalars())
+
+    def next_id(self, model) -> int:
+        """model 테이블의 다음 ID (primary에서 조회)"""
+        return (self.db.scalar(select(func.max(model.id))) or 0) + 1
+
+    def set_fork_scenes(self, fork_scene_ids: Dict[int, Optional[int]]) -> None:
+        """분기 게임의 분기 지점 씬 설정 (씬이 없으면 원본 참조를 비움, 커밋은 호출하는 쪽에서)"""
+        for game_id, scene_id in fork_scene_ids.items():
+            values = {"fork_scene_id": scene_id}
+            if scene_id is None:
+                values["parent_game_id"] = None
+            self.db.execute(update(Game).where(Game.id == game_id).values(**values))
+
+    def insert_rows(self, model, rows: List[dict]) -> None:
+        """executemany 한 번으로 insert (커밋은 호출하는 쪽에서, 세션은 배경 이미지 참조 수도 증가)"""
+        if rows:
+            self.db.execute(insert(model), rows)
+        if model is GameSession:
+            for row in rows:
+                record_background_use(self.db, row.get("background_url"))
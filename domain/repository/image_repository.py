@@ -0,0 +1,102 @@
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from domain.entity.game import ArchivedBackground, Session as GameSession
+from domain.entity.image import BackgroundKeyword, GeneratedImage
+from typing import Dict, List, Optional
+from datetime import datetime
+
+
+class BackgroundKeywordRepository:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get_keyword(self, story_hash: str) -> Optional[BackgroundKeyword]:
+        """장면 설명 해시로 캐시된 키워드 조회"""
+        return self.db.query(BackgroundKeyword).filter(BackgroundKeyword.story_hash == story_hash).first()
+
+    def save_keyword(self, story_hash: str, keyword: str) -> BackgroundKeyword:
+        """키워드 저장 (이미 있으면 갱신)"""
+        entry = self.get_keyword(story_hash)
+        if entry:
+            entry.keyword = keyword
+            entry.created_at = datetime.utcnow()
+        else:
+            entry = BackgroundKeyword(story_hash=story_hash, keyword=keyword)
+            self.db.add(entry)
+        self.db.commit()
+        return entry
+
+
+class ImageRepository:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get_image(self, image_hash: str) -> Optional[GeneratedImage]:
+        """해시로 이미지 조회"""
+        return self.db.query(GeneratedImage).filter(GeneratedImage.hash == image_hash).first()
+
+    def record_image(
+        self,
+        image_hash: str,
+        filename: str,
+        keyword: str,
+        width: int,
+        height: int,
+        size_bytes: int,
+    ) -> GeneratedImage:
+        """생성된 이미지 등록 (같은 해시가 이미 있으면 사용 시각만 갱신)"""
+        image = self.get_image(image_hash)
+        if image:
+            image.last_used_at = datetime.utcnow()
+        else:
+            image = GeneratedImage(
+                hash=image_hash,
+                filename=filename,
+                keyword=keyword,
+                width=width,
+                height=height,
+                bytes=size_bytes,
+            )
+            self.db.add(image)
+        self.db.commit()
+        return image
+
+    def get_total_bytes(self) -> int:
+        """등록된 이미지 전체 용량"""
+        return self.db.query(func.coalesce(func.sum(GeneratedImage.bytes), 0)).scalar()
+
+    def get_eviction_candidates(self, limit: int) -> List[GeneratedImage]:
+        """참조하는 세션이 없는 이미지를 오래 사용하지 않은 순으로 조회"""
+        return (
+            self.db.query(GeneratedImage)
+            .filter(GeneratedImage.reference_count <= 0)
+            .order_by(GeneratedImage.last_used_at)
+            .limit(limit)
+            .all()
+        )
+
+    def get_images(self, image_hashes: List[str]) -> Dict[str, GeneratedImage]:
+        """해시별 이미지 (등록되지 않은 해시는 제외)"""
+        if not image_hashes:
+            return {}
+        images = self.db.query(GeneratedImage).filter(GeneratedImage.hash.in_(image_hashes)).all()
+        return {image.hash: image for image in images}
+
+    def is_referenced(self, image_hash: str) -> bool:
+        """세션 background_url이나 보관된 게임에서 실제로 참조되는지 확인 (reference_count 보정용)"""
+        if (
+            self.db.query(GameSession.id)
+            .filter(GameSession.background_url.like(f"%{image_hash}%"))
+            .first()
+            is not None
+        ):
+            return True
+        return (
+            self.db.query(ArchivedBackground.game_id).filter(ArchivedBackground.image_hash == image_hash).first()
+            is not None
+        )
+
+    def delete_image(self, image: GeneratedImage) -> None:
+        """이미지 행 삭제"""
+        self.db.delete(image)
+        self.db.commit()
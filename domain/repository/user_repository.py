@@ -1,8 +1,31 @@
+import logging
+from sqlalchemy import delete, select, text
+from sqlalchemy.exc import DBAPIError
 from sqlalchemy.orm import Session
 from domain.entity.user import User, RefreshToken
-from typing import Optional
+from core.security import hash_token
+from typing import List, Optional
 from datetime import datetime
 
+logger = logging.getLogger(__name__)
+
+# 해시 마이그레이션(scripts/migrate_refresh_token_hashes.py) 1단계와 --cutover 사이에만 남아 있는 원문 컬럼 조회
+LEGACY_TOKEN_LOOKUP = text("SELECT id FROM refresh_tokens WHERE token = :token AND token_hash IS NULL LIMIT 1")
+_legacy_token_column = True  # 원문 컬럼이 없음을 확인하면 False (cutover 이후에는 조회하지 않음)
+
+
+def legacy_token_lookup_enabled() -> bool:
+    return _legacy_token_column
+
+
+def disable_legacy_token_lookup(error: DBAPIError) -> None:
+    """원문 컬럼 조회가 실패하면 (cutover로 컬럼 삭제) 이후 조회 생략 (연결 오류는 그대로 전달)"""
+    global _legacy_token_column
+    if error.connection_invalidated:
+        raise error
+    logger.info(f"Legacy refresh token column unavailable, disabling fallback lookup: {error.orig}")
+    _legacy_token_column = False
+
 
 class UserRepository:
     def __init__(self, db: Session):
@@ -28,33 +51,75 @@ class UserRepository:
     def get_user_by_id(self, user_id: int) -> Optional[User]:
         return self.db.query(User).filter(User.id == user_id).first()
 
-    def save_refresh_token(self, user_id: int, token: str, expires_at: datetime) -> RefreshToken:
+    def save_refresh_token(
+        self, user_id: int, token: str, expires_at: datetime, max_active: int = 0
+    ) -> RefreshToken:
+        """
+        토큰 해시 저장 (max_active > 0이면 같은 트랜잭션에서 만료된 토큰과
+        유효한 토큰 중 max_active개를 넘는 오래된 토큰 삭제)
+        """
         refresh_token = RefreshToken(
             user_id=user_id,
-            token=token,
+            token_hash=hash_token(token),
             expires_at=expires_at
         )
         self.db.add(refresh_token)
+        if max_active > 0:
+            self.db.flush()
+            self._evict_refresh_tokens(user_id, max_active)
         self.db.commit()
         self.db.refresh(refresh_token)
         return refresh_token
 
+    def _evict_refresh_tokens(self, user_id: int, max_active: int) -> None:
+        now = datetime.utcnow()
+        # 사용자당 토큰 수가 적으므로 ID를 먼저 읽고 삭제 (MySQL은 IN 서브쿼리에 LIMIT/OFFSET 미지원)
+        active_ids = self.db.scalars(
+            select(RefreshToken.id)
+            .where(RefreshToken.user_id == user_id, RefreshToken.expires_at >= now)
+            .order_by(RefreshToken.created_at.desc(), RefreshToken.id.desc())
+        ).all()
+        evicted_ids = active_ids[max_active:]
+        self.db.execute(
+            delete(RefreshToken).where(
+                RefreshToken.user_id == user_id,
+                (RefreshToken.expires_at < now) | RefreshToken.id.in_(evicted_ids),
+            )
+        )
+
     def get_refresh_token(self, token: str) -> Optional[RefreshToken]:
-        return self.db.query(RefreshToken).filter(RefreshToken.token == token).first()
+        refresh_token = self.db.query(RefreshToken).filter(RefreshToken.token_hash == hash_token(token)).first()
+        if refresh_token is None and legacy_token_lookup_enabled():
+            refresh_token = self._get_legacy_refresh_token(token)
+        return refresh_token
+
+    def _get_legacy_refresh_token(self, token: str) -> Optional[RefreshToken]:
+        """해시가 아직 없는 (마이그레이션 중 구버전 서버가 발급한) 토큰을 원문 컬럼으로 찾고 해시를 채움"""
+        try:
+            token_id = self.db.scalar(LEGACY_TOKEN_LOOKUP, {"token": token})
+        except DBAPIError as e:
+            disable_legacy_token_lookup(e)
+            return None
+        if token_id is None:
+            return None
+        refresh_token = self.db.get(RefreshToken, token_id)
+        refresh_token.token_hash = hash_token(token)
+        self.db.commit()
+        return refresh_token
 
     def delete_refresh_token(self, token: str) -> None:
-        self.db.query(RefreshToken).filter(RefreshToken.token == token).delete()
+        self.db.query(RefreshToken).filter(RefreshToken.token_hash == hash_token(token)).delete()
         self.db.commit()
 
     def replace_refresh_token(self, old_token: str, user_id: int, new_token: str, expires_at: datetime) -> RefreshToken:
         """기존 토큰을 삭제하고 새 토큰을 저장하는 원자적 작업"""
         # 기존 토큰 삭제
-        self.db.query(RefreshToken).filter(RefreshToken.token == old_token).delete()
+        self.db.query(RefreshToken).filter(RefreshToken.token_hash == hash_token(old_token)).delete()
         
         # 새 토큰 생성
         refresh_token = RefreshToken(
             user_id=user_id,
-            token=new_token,
+            token_hash=hash_token(new_token),
             expires_at=expires_at
         )
         self.db.add(refresh_token)
@@ -63,3 +128,19 @@ class UserRepository:
         self.db.commit()
         self.db.refresh(refresh_token)
         return refresh_token
+
+    def get_expired_refresh_token_ids(self, now: datetime, limit: int) -> List[int]:
+        """만료된 토큰 ID (오래 전에 만료된 순, expires_at 인덱스 사용)"""
+        rows = self.db.scalars(
+            select(RefreshToken.id)
+            .where(RefreshToken.expires_at < now)
+            .order_by(RefreshToken.expires_at)
+            .limit(limit)
+        )
+        return list(rows)
+
+    def delete_refresh_tokens_by_ids(self, token_ids: List[int]) -> int:
+        """ID 목록의 토큰 삭제 후 커밋 (삭제한 행 수)"""
+        result = self.db.execute(delete(RefreshToken).where(RefreshToken.id.in_(token_ids)))
+        self.db.commit()
+        return result.rowcount
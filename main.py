@@ -1,12 +1,17 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
 from pathlib import Path
 
-from core.database import Base, engine
+from application.container import shutdown_container, warm_container
+from application.refresh_token_purge import start_refresh_token_purger, stop_refresh_token_purger
+from core.database import Base, dispose_async_engine, engine
+from core.sql_instrumentation import QueryStatsMiddleware
+from core.static_files import ContentAddressedStaticFiles
 from insert_characters import insert_characters
 from presentation.auth_router import router as auth_router
 from presentation.game_router import router as game_router
+from presentation.metrics_router import router as metrics_router
+from presentation.sprite_router import router as sprite_router
 
 app = FastAPI(
     title="GSTAR API",
@@ -21,7 +26,10 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-DB-Query-Count", "Server-Timing"],
 )
+# 요청별 SQL 실행 횟수/시간 측정
+app.add_middleware(QueryStatsMiddleware)
 
 static_dir = Path("static")
 if not static_dir.exists():
@@ -31,13 +39,26 @@ if not static_dir.exists():
 def on_startup():
     Base.metadata.create_all(bind=engine)
     insert_characters()
+    # Gemini 클라이언트, HTTP 연결 풀, 이미지 인덱스를 첫 요청 전에 미리 생성
+    warm_container()
+    # 만료된 리프레시 토큰 주기적 정리
+    start_refresh_token_purger()
+
+
+@app.on_event("shutdown")
+async def on_shutdown():
+    stop_refresh_token_purger()
+    shutdown_container()
+    await dispose_async_engine()
 
 # 라우터 등록 (정적 파일보다 먼저)
 app.include_router(auth_router)
 app.include_router(game_router)
+app.include_router(metrics_router)
+app.include_router(sprite_router)
 
 # 정적 파일 서빙 설정 (라우터 다음에)
-app.mount("/static", StaticFiles(directory="static"), name="static")
+app.mount("/static", ContentAddressedStaticFiles(directory="static"), name="static")
 
 
 @app.get("/")
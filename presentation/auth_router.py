@@ -1,6 +1,6 @@
 from fastapi import APIRouter, Depends, status
-from sqlalchemy.orm import Session
-from core.database import get_db
+from sqlalchemy.ext.asyncio import AsyncSession
+from core.database import get_async_db
 from application.auth_service import AuthService
 from presentation.schemas import (
     SignupRequest, SignupResponse,
@@ -12,9 +12,9 @@ router = APIRouter(prefix="/api/v2", tags=["auth"])
 
 
 @router.post("/signup", response_model=SignupResponse, status_code=status.HTTP_200_OK)
-def signup(request: SignupRequest, db: Session = Depends(get_db)):
+async def signup(request: SignupRequest, db: AsyncSession = Depends(get_async_db)):
     auth_service = AuthService(db)
-    result = auth_service.signup(
+    result = await auth_service.signup(
         username=request.username,
         email=request.email,
         password=request.password
@@ -23,9 +23,9 @@ def signup(request: SignupRequest, db: Session = Depends(get_db)):
 
 
 @router.post("/login", response_model=LoginResponse, status_code=status.HTTP_200_OK)
-def login(request: LoginRequest, db: Session = Depends(get_db)):
+async def login(request: LoginRequest, db: AsyncSession = Depends(get_async_db)):
     auth_service = AuthService(db)
-    result = auth_service.login(
+    result = await auth_service.login(
         username=request.username,
         password=request.password
     )
@@ -33,7 +33,7 @@ def login(request: LoginRequest, db: Session = Depends(get_db)):
 
 
 @router.post("/reissue", response_model=ReissueResponse, status_code=status.HTTP_200_OK)
-def reissue(request: ReissueRequest, db: Session = Depends(get_db)):
+async def reissue(request: ReissueRequest, db: AsyncSession = Depends(get_async_db)):
     auth_service = AuthService(db)
-    result = auth_service.reissue_token(refresh_token=request.refresh_token)
+    result = await auth_service.reissue_token(refresh_token=request.refresh_token)
     return result
@@ -1,23 +1,130 @@
-from fastapi import APIRouter, Depends, status
-from sqlalchemy.orm import Session
-from core.database import get_db
+import hashlib
+import json
+from typing import Dict, List, Optional
+
+from fastapi import APIRouter, Depends, Query, Request, Response, status
 from core.auth_dependency import get_current_user
+from application.container import get_game_service
 from application.game_service import GameService
 from presentation.schemas import (
     CreateGameRequest,
     CreateGameResponse,
+    ForkGameResponse,
+    GameDetailResponse,
+    GameListResponse,
     NextSceneRequest,
     NextSceneResponse,
 )
 
 router = APIRouter(prefix="/api/v2", tags=["game"])
 
+# 저장된 게임 조회 응답은 매번 재검증 (바뀌지 않았으면 304)
+GAME_READ_CACHE_CONTROL = "private, no-cache"
+
+
+def build_link_header(preload: List[Optional[str]], prefetch: List[Optional[str]]) -> Optional[str]:
+    """지금 그릴 에셋은 preload, 다음 씬 에셋은 prefetch로 알리는 Link 헤더 값"""
+    links = []
+    seen = set()
+    for rel, urls in (("preload", preload), ("prefetch", prefetch)):
+        for url in urls:
+            if url and url not in seen:
+                seen.add(url)
+                links.append(f"<{url}>; rel={rel}; as=image")
+    return ", ".join(links) or None
+
+
+def _set_preload_hints(response: Response, result: Dict, current_session_id: int) -> None:
+    preload = [scene.get("character_url") for scene in result["scenes"]]
+    # 새 세션이 시작되면 새 배경을 가장 먼저 받도록
+    if result["session_id"] != current_session_id:
+        preload.insert(0, result.get("background_url"))
+    link = build_link_header(preload, result.get("prefetch", []))
+    if link:
+        response.headers["Link"] = link
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """If-None-Match 약한 비교 (W/ 접두사 무시)"""
+    if_none_match = request.headers.get("if-none-match", "")
+    tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return etag.removeprefix("W/") in tags
+
+
+def _not_modified(etag: str) -> Response:
+    return Response(
+        status_code=status.HTTP_304_NOT_MODIFIED,
+        headers={"etag": etag, "cache-control": GAME_READ_CACHE_CONTROL},
+    )
+
+
+@router.get("/games", response_model=GameListResponse)
+def list_games(
+    request: Request,
+    response: Response,
+    before_id: Optional[int] = Query(None, description="이전 페이지의 next_before_id"),
+    limit: int = Query(20, ge=1, le=100),
+    current_user: dict = Depends(get_current_user),
+    game_service: GameService = Depends(get_game_service),
+):
+    """
+    내 게임 목록 (최신 게임부터)
+
+    - **before_id**: 다음 페이지 커서
+    - **limit**: 페이지 크기
+    """
+    result = game_service.list_games(current_user["user_id"], before_id=before_id, limit=limit)
+    version = json.dumps(
+        [[game["game_id"], game["latest_scene_id"]] for game in result["games"]] + [before_id, limit]
+    )
+    etag = f'W/"games-{hashlib.sha256(version.encode()).hexdigest()[:16]}"'
+    if etag_matches(request, etag):
+        return _not_modified(etag)
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = GAME_READ_CACHE_CONTROL
+    return result
+
+
+@router.get("/game/{game_id}", response_model=GameDetailResponse)
+def get_game(
+    game_id: int,
+    request: Request,
+    response: Response,
+    after_scene_id: int = Query(0, ge=0, description="이 씬 이후부터 (이전 페이지의 next_after_scene_id)"),
+    limit: int = Query(100, ge=1, le=500),
+    current_user: dict = Depends(get_current_user),
+    game_service: GameService = Depends(get_game_service),
+):
+    """
+    저장된 게임 조회 (이어하기/크래시 복구)
+
+    - **game_id**: 게임 ID
+    - **after_scene_id**: 씬 페이지 커서
+    - **limit**: 페이지당 씬 수
+
+    ETag는 게임의 가장 최근 씬 ID로 만들어 새 씬이 없으면 304로 응답
+    """
+    latest_scene_id = game_service.get_game_version(current_user["user_id"], game_id)
+    etag = f'W/"game-{game_id}-{latest_scene_id}-{after_scene_id}-{limit}"'
+    if etag_matches(request, etag):
+        return _not_modified(etag)
+    result = game_service.get_game(
+        current_user["user_id"],
+        game_id,
+        after_scene_id=after_scene_id,
+        limit=limit,
+        latest_scene_id=latest_scene_id,
+    )
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = GAME_READ_CACHE_CONTROL
+    return result
+
 
 @router.post("/game", response_model=CreateGameResponse, status_code=status.HTTP_200_OK)
 def create_game(
     request: CreateGameRequest,
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    game_service: GameService = Depends(get_game_service),
 ):
     """
     새 게임 생성
@@ -26,7 +133,6 @@ def create_game(
     - **genre**: 게임 장르
     - **playtime**: 플레이 시간 (분 단위)
     """
-    game_service = GameService(db)
     result = game_service.create_new_game(
         user_id=current_user["user_id"],
         personality=request.personality,
@@ -36,6 +142,24 @@ def create_game(
     return result
 
 
+@router.post("/game/{game_id}/fork", response_model=ForkGameResponse, status_code=status.HTTP_200_OK)
+def fork_game(
+    game_id: int,
+    from_scene_id: int = Query(..., description="분기할 씬 ID (이 게임 히스토리의 씬)"),
+    current_user: dict = Depends(get_current_user),
+    game_service: GameService = Depends(get_game_service),
+):
+    """
+    게임 분기 (이전 씬으로 돌아가 다른 선택지로 진행)
+
+    - **game_id**: 원본 게임 ID
+    - **from_scene_id**: 분기할 씬 ID
+
+    원본 히스토리는 복사하지 않고 참조하며, 분기 지점 씬의 복사본부터 새 게임으로 진행
+    """
+    return game_service.fork_game(current_user["user_id"], game_id, from_scene_id)
+
+
 @router.post(
     "/game/{game_id}/{session_id}/{scene_id}",
     response_model=NextSceneResponse,
@@ -46,8 +170,9 @@ def generate_next_scene(
     session_id: int,
     scene_id: int,
     request: NextSceneRequest,
+    response: Response,
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    game_service: GameService = Depends(get_game_service),
 ):
     """
     다음 씬 생성
@@ -58,7 +183,6 @@ def generate_next_scene(
     - **emotion**: 사용자 얼굴 감정 데이터
     - **time**: 현재 진행 시간 (초 단위)
     """
-    game_service = GameService(db)
     result = game_service.generate_next_scene(
         game_id=game_id,
         session_id=session_id,
@@ -66,6 +190,7 @@ def generate_next_scene(
         emotion=request.emotion.dict(),
         elapsed_time=request.time,
     )
+    _set_preload_hints(response, result, session_id)
     return result
 
 
@@ -80,8 +205,9 @@ def generate_scene_after_selection(
     scene_id: int,
     selection_id: int,
     request: NextSceneRequest,
+    response: Response,
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    game_service: GameService = Depends(get_game_service),
 ):
     """
     선택지 선택 후 다음 씬 생성
@@ -93,7 +219,6 @@ def generate_scene_after_selection(
     - **emotion**: 사용자 얼굴 감정 데이터
     - **time**: 현재 진행 시간 (초 단위)
     """
-    game_service = GameService(db)
     result = game_service.generate_scene_after_selection(
         game_id=game_id,
         session_id=session_id,
@@ -102,4 +227,5 @@ def generate_scene_after_selection(
         emotion=request.emotion.dict(),
         elapsed_time=request.time,
     )
+    _set_preload_hints(response, result, session_id)
     return result
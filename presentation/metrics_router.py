@@ -0,0 +1,14 @@
+from fastapi import APIRouter, Depends
+from core.auth_dependency import require_metrics_token
+from core.metrics import metrics
+
+router = APIRouter(prefix="/api/v2", tags=["metrics"])
+
+
+@router.get("/metrics", dependencies=[Depends(require_metrics_token)])
+def get_metrics():
+    """
+    프로세스 메트릭 조회 (카운터, 관측값, 게이지, 비율)
+    METRICS_TOKEN을 Bearer 토큰으로 보내야 함
+    """
+    return metrics.snapshot()
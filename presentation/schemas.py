@@ -1,3 +1,5 @@
+from datetime import datetime
+
 from pydantic import BaseModel, EmailStr, Field
 from typing import Dict, List, Optional
 
@@ -46,6 +48,8 @@ class SceneData(BaseModel):
     dialogue: Optional[str] = None
     selections: Dict[str, str] = {}
     character_filename: Optional[str] = None  # 캐릭터 이미지 파일명 (예: "1_smile.png")
+    character_url: Optional[str] = None  # 캐릭터 이미지 콘텐츠 해시 URL (서버에 스프라이트가 있을 때)
+    selected_option: Optional[int] = None  # 사용자가 고른 선택지 번호 (게임 조회 시)
 
 
 class SessionData(BaseModel):
@@ -55,6 +59,20 @@ class SessionData(BaseModel):
     background_url: Optional[str] = None
 
 
+class SpriteFrame(BaseModel):
+    x: int
+    y: int
+    width: int
+    height: int
+
+
+class SpriteAtlas(BaseModel):
+    url: str  # WebP 아틀라스 콘텐츠 해시 URL
+    width: int
+    height: int
+    frames: Dict[str, SpriteFrame]  # 표정 → 아틀라스 안의 좌표
+
+
 class CreateGameResponse(BaseModel):
     game_id: int
     personality: str
@@ -63,9 +81,47 @@ class CreateGameResponse(BaseModel):
     playtime: int
     main_character_id: int
     main_character_name: str
+    main_character_atlas: Optional[SpriteAtlas] = None  # 메인 캐릭터 표정 스프라이트를 한 번에 받기 위한 아틀라스
     sessions: List[SessionData]
 
 
+class ForkGameResponse(CreateGameResponse):
+    parent_game_id: int  # 원본 게임
+    fork_scene_id: int  # 분기한 원본 씬 (sessions에는 이 씬의 복사본이 들어 있음)
+
+
+class GameDetailResponse(BaseModel):
+    game_id: int
+    personality: str
+    genre: str
+    title: str
+    playtime: int
+    main_character_id: int
+    main_character_atlas: Optional[SpriteAtlas] = None
+    parent_game_id: Optional[int] = None  # 분기 게임이면 원본 게임 (원본의 분기 지점 이전 세션/씬도 sessions에 포함)
+    sessions: List[SessionData]  # 이번 페이지의 씬이 있는 세션만 (세션/씬 순서대로)
+    latest_scene_id: Optional[int] = None  # 게임의 가장 최근 씬 (이어하기 위치)
+    next_after_scene_id: Optional[int] = None  # 다음 페이지 커서 (없으면 마지막 페이지)
+
+
+class GameSummary(BaseModel):
+    game_id: int
+    title: str
+    personality: str
+    genre: str
+    playtime: int
+    main_character_id: int
+    parent_game_id: Optional[int] = None  # 분기 게임이면 원본 게임
+    latest_scene_id: Optional[int] = None
+    created_at: datetime
+    updated_at: datetime
+
+
+class GameListResponse(BaseModel):
+    games: List[GameSummary]  # 최신 게임부터
+    next_before_id: Optional[int] = None  # 다음 페이지 커서 (없으면 마지막 페이지)
+
+
 class EmotionData(BaseModel):
     angry: int = Field(..., ge=0, le=100)
     disgust: int = Field(..., ge=0, le=100)
@@ -86,3 +142,4 @@ class NextSceneResponse(BaseModel):
     content: str
     scenes: List[SceneData]
     background_url: Optional[str] = None
+    prefetch: List[str] = []  # 다음 씬에서 필요할 가능성이 높은 에셋 URL (미리 받아 두기용)
@@ -0,0 +1,49 @@
+import hashlib
+import json
+from typing import List, Optional
+
+from fastapi import APIRouter, HTTPException, Query, Request, status
+from fastapi.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse
+
+from application.sprite_manifest import get_sprite_manifest
+from core.static_files import IMMUTABLE_CACHE_CONTROL, AssetCache, is_not_modified, precompressed_response
+
+router = APIRouter(prefix="/api/v2", tags=["sprites"])
+
+# 매니페스트 gzip/brotli 압축본 (버전 + 캐릭터 필터별)
+_manifest_cache = AssetCache(max_bytes=4 * 1024 * 1024, max_entry_bytes=1024 * 1024)
+
+
+@router.get("/sprites")
+def get_sprites(request: Request, character_id: Optional[List[int]] = Query(None)):
+    """
+    캐릭터 스프라이트 매니페스트 조회 (게임 시작 시 미리 받기용)
+
+    - **character_id**: 지정하면 해당 캐릭터만 (여러 번 지정 가능)
+    """
+    manifest = get_sprite_manifest()
+    manifest.refresh()
+    selection = ",".join(str(value) for value in sorted(set(character_id or [])))
+    etag = f'"{manifest.version}-{hashlib.sha256(selection.encode()).hexdigest()[:8]}"'
+    body = json.dumps(manifest.to_dict(character_id), ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return precompressed_response(
+        body, "application/json", etag, request.headers, _manifest_cache, {"cache-control": "no-cache"}
+    )
+
+
+@router.get("/sprites/{hashed_filename}")
+def get_sprite(request: Request, hashed_filename: str):
+    """
+    콘텐츠 해시 URL로 스프라이트 이미지 조회 (내용이 바뀌면 URL도 바뀌므로 영구 캐시)
+    """
+    path = get_sprite_manifest().path_for(hashed_filename)
+    if path is None or not path.is_file():
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Sprite not found")
+
+    etag = f'"{hashed_filename.rsplit(".", 1)[0]}"'
+    headers = {"etag": etag, "cache-control": IMMUTABLE_CACHE_CONTROL}
+    response_headers = Response(headers=headers).headers
+    if is_not_modified(response_headers, request.headers):
+        return NotModifiedResponse(response_headers)
+    return FileResponse(path, headers=headers)
@@ -0,0 +1,66 @@
+"""
+게임 테이블에 분기용 컬럼(parent_game_id, fork_scene_id) 추가 마이그레이션 스크립트
+"""
+import sys
+from pathlib import Path
+
+# 프로젝트 루트를 Python 경로에 추가
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from sqlalchemy import text
+from core.database import SessionLocal
+
+
+def column_exists(db, column_name: str) -> bool:
+    result = db.execute(
+        text("""
+            SELECT COUNT(*)
+            FROM INFORMATION_SCHEMA.COLUMNS
+            WHERE TABLE_SCHEMA = DATABASE()
+            AND TABLE_NAME = 'games'
+            AND COLUMN_NAME = :column_name
+        """),
+        {"column_name": column_name},
+    )
+    return result.fetchone()[0] > 0
+
+
+def migrate():
+    """parent_game_id, fork_scene_id 컬럼 추가"""
+    db = SessionLocal()
+
+    try:
+        if column_exists(db, "parent_game_id"):
+            print("✓ parent_game_id 컬럼이 이미 존재합니다.")
+        else:
+            print("parent_game_id 컬럼 추가 중...")
+            db.execute(text("ALTER TABLE games ADD COLUMN parent_game_id INT NULL"))
+            db.execute(text("CREATE INDEX ix_games_parent_game_id ON games (parent_game_id)"))
+            db.execute(text("""
+                ALTER TABLE games
+                ADD CONSTRAINT fk_games_parent_game
+                FOREIGN KEY (parent_game_id) REFERENCES games(id)
+            """))
+
+        if column_exists(db, "fork_scene_id"):
+            print("✓ fork_scene_id 컬럼이 이미 존재합니다.")
+        else:
+            print("fork_scene_id 컬럼 추가 중...")
+            db.execute(text("ALTER TABLE games ADD COLUMN fork_scene_id INT NULL"))
+
+        db.commit()
+        print("✓ 분기 컬럼이 준비되었습니다.")
+
+    except Exception as e:
+        print(f"✗ 마이그레이션 실패: {e}")
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    print("=== 게임 테이블 마이그레이션 시작 ===")
+    migrate()
+    print("=== 마이그레이션 완료 ===")
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+끝난 게임 보관 스크립트
+
+엔딩 후 오래 진행이 없는 게임의 세션/씬/진행 상태를 gzip JSONL로 압축해 game_archives로 옮기고
+원본 행을 삭제 (games 행은 목록 조회용으로 남고, 조회하거나 이어서 진행하면 자동으로 복원)
+"""
+import argparse
+import logging
+import sys
+from pathlib import Path
+
+# 프로젝트 루트를 Python 경로에 추가
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from application.game_archive import archive_games
+from core.config import get_settings
+from core.database import SessionLocal
+
+
+def main():
+    settings = get_settings()
+    parser = argparse.ArgumentParser(description="끝난 게임 보관")
+    parser.add_argument(
+        "--older-than-days", type=int, default=settings.GAME_ARCHIVE_AFTER_DAYS, help="엔딩 후 경과 일수"
+    )
+    parser.add_argument("--batch-size", type=int, default=settings.GAME_ARCHIVE_BATCH_SIZE, help="배치당 게임 수")
+    parser.add_argument("--max-games", type=int, default=0, help="이번 실행에서 보관할 최대 게임 수 (0: 제한 없음)")
+    parser.add_argument("--pause", type=float, default=0.5, help="배치 사이 대기 시간 (초)")
+    parser.add_argument("--dry-run", action="store_true", help="보관 대상만 출력")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    db = SessionLocal()
+    try:
+        report = archive_games(
+            db,
+            args.older_than_days,
+            batch_size=args.batch_size,
+            max_games=args.max_games,
+            pause_seconds=args.pause,
+            dry_run=args.dry_run,
+        )
+    finally:
+        db.close()
+
+    print("=== 게임 보관 결과 ===")
+    if args.dry_run:
+        print(f"보관 대상 (첫 배치): {report['candidates']}")
+        return
+    print(f"보관한 게임: {report['archived']}개 (세션 {report['sessions']}개, 씬 {report['scenes']}개)")
+    print(f"압축 데이터: {report['bytes'] / 1024:.1f}KB")
+    print(f"실패하여 건너뜀: {report['skipped']}개")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+GameService 생성 비용 비교 스크립트
+
+요청마다 BackgroundGenerator/LLMService를 새로 만들던 방식과
+ServiceContainer의 공유 인스턴스를 주입하는 방식의 생성 시간을 비교
+"""
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+# 프로젝트 루트를 Python 경로에 추가
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+# 클라이언트 생성만 측정하므로 실제 API 키가 없어도 실행 가능
+os.environ.setdefault("GEMINI_TOKEN", "benchmark-dummy-key")
+
+from application.background_generator import BackgroundGenerator
+from application.container import get_container
+from application.game_service import GameService
+from application.llm_service import LLMService
+
+
+def measure(label: str, build, iterations: int) -> float:
+    started = time.perf_counter()
+    for _ in range(iterations):
+        build()
+    per_call_ms = (time.perf_counter() - started) / iterations * 1000
+    print(f"{label:<32} {per_call_ms:8.3f} ms / request")
+    return per_call_ms
+
+
+def main():
+    parser = argparse.ArgumentParser(description="GameService 생성 비용 비교")
+    parser.add_argument("--iterations", type=int, default=200, help="반복 횟수")
+    args = parser.parse_args()
+
+    # DB 세션은 두 방식 모두 요청마다 주입되므로 측정에서 제외
+    db = None
+
+    started = time.perf_counter()
+    container = get_container()
+    print(f"{'container startup (1회)':<32} {(time.perf_counter() - started) * 1000:8.3f} ms")
+
+    before = measure(
+        "per-request construction",
+        lambda: GameService(db, bg_generator=BackgroundGenerator(), llm_service=LLMService()),
+        args.iterations,
+    )
+    after = measure("container injection", lambda: container.game_service(db), args.iterations)
+
+    print(f"\n요청당 절감: {before - after:.3f} ms ({before / after if after else float('inf'):.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+캐릭터 스프라이트 아틀라스 빌드 스크립트
+
+캐릭터마다 표정 스프라이트를 WebP 아틀라스 한 장 + JSON 프레임 좌표로 합침
+스프라이트가 바뀐 캐릭터만 다시 만들며, 서버는 시작 시 index.json을 읽어 게임 생성 응답에 포함
+"""
+import argparse
+import sys
+from pathlib import Path
+
+# 프로젝트 루트를 Python 경로에 추가
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from application.sprite_atlas import build_atlases
+from application.sprite_manifest import SpriteManifest
+from core.config import get_settings
+
+
+def main():
+    settings = get_settings()
+    parser = argparse.ArgumentParser(description="캐릭터 스프라이트 아틀라스 빌드")
+    parser.add_argument("--sprite-dir", default=settings.SPRITE_DIR, help="스프라이트 디렉터리")
+    parser.add_argument("--atlas-dir", default=settings.SPRITE_ATLAS_DIR, help="아틀라스 출력 디렉터리")
+    parser.add_argument("--force", action="store_true", help="변경 여부와 관계없이 모두 다시 빌드")
+    parser.add_argument("--lossy", type=int, metavar="QUALITY", help="손실 압축 품질 (지정하지 않으면 무손실)")
+    args = parser.parse_args()
+
+    sprite_dir = Path(args.sprite_dir)
+    manifest = SpriteManifest(sprite_dir, settings.SPRITE_URL_PREFIX)
+    report = build_atlases(
+        manifest,
+        sprite_dir,
+        Path(args.atlas_dir),
+        force=args.force,
+        lossless=args.lossy is None,
+        quality=args.lossy or 90,
+    )
+
+    print("=== 스프라이트 아틀라스 빌드 결과 ===")
+    print(f"빌드: {report['built']} ({report['bytes'] / 1024:.1f}KB)")
+    print(f"변경 없음: {report['skipped']}")
+    print(f"삭제: {report['removed']}")
+
+
+if __name__ == "__main__":
+    main()
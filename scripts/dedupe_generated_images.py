@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+유사 배경 이미지 정리 스크립트
+
+dHash 해밍 거리로 거의 같은 이미지를 묶어 키워드를 대표 이미지 하나로 합치고
+나머지 파일을 삭제 (지각 해시가 없는 기존 이미지는 먼저 계산하여 인덱스에 기록)
+"""
+import argparse
+import sys
+from pathlib import Path
+
+# 프로젝트 루트를 Python 경로에 추가
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from application.image_index import ImageIndex
+from application.image_maintenance import dedupe_images
+from core.config import get_settings
+from core.database import SessionLocal
+from core.storage import create_image_storage
+
+
+def main():
+    settings = get_settings()
+    parser = argparse.ArgumentParser(description="유사 배경 이미지 정리")
+    parser.add_argument(
+        "--max-distance", type=int, default=settings.IMAGE_DEDUP_MAX_DISTANCE, help="같은 이미지로 볼 최대 해밍 거리"
+    )
+    parser.add_argument("--dry-run", action="store_true", help="합칠 대상만 출력")
+    args = parser.parse_args()
+
+    storage = create_image_storage(settings)
+    db = SessionLocal()
+    try:
+        report = dedupe_images(db, storage, ImageIndex(storage), args.max_distance, dry_run=args.dry_run)
+    finally:
+        db.close()
+
+    print("=== 유사 이미지 정리 결과 ===")
+    print(f"새로 계산한 지각 해시: {report['hashed']}개")
+    print(f"유사 이미지 묶음: {report['clusters']}개")
+    print(f"대표 이미지로 합친 이미지: {report['merged']}개")
+    print(f"삭제{' 예정' if args.dry_run else ''}: {report['deleted']}개 ({report['freed_bytes'] / 1024 / 1024:.1f}MB)")
+    print(f"세션 참조로 파일 유지: {report['kept_referenced']}개")
+
+
+if __name__ == "__main__":
+    main()
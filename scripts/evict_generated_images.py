@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+생성 이미지 디스크 용량 정리 스크립트
+
+세션에서 참조하지 않는 이미지를 오래 사용하지 않은 순으로 삭제하여
+전체 용량을 할당량 이하로 유지 (진행 중인 세션의 배경 URL은 유지됨)
+"""
+import argparse
+import sys
+from pathlib import Path
+
+# 프로젝트 루트를 Python 경로에 추가
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from application.image_index import ImageIndex
+from application.image_maintenance import evict_images
+from core.config import get_settings
+from core.database import SessionLocal
+from core.storage import create_image_storage
+
+
+def main():
+    settings = get_settings()
+    parser = argparse.ArgumentParser(description="생성 이미지 용량 정리")
+    parser.add_argument("--quota-mb", type=int, default=settings.IMAGE_DISK_QUOTA_MB, help="최대 용량 (MB)")
+    parser.add_argument("--batch-size", type=int, default=100, help="한 번에 조회할 후보 수")
+    parser.add_argument("--dry-run", action="store_true", help="삭제 대상만 출력")
+    args = parser.parse_args()
+
+    storage = create_image_storage(settings)
+    db = SessionLocal()
+    try:
+        report = evict_images(
+            db,
+            storage,
+            ImageIndex(storage),
+            quota_bytes=args.quota_mb * 1024 * 1024,
+            batch_size=args.batch_size,
+            dry_run=args.dry_run,
+        )
+    finally:
+        db.close()
+
+    print("=== 이미지 정리 결과 ===")
+    print(f"정리 전 용량: {report['total_bytes_before'] / 1024 / 1024:.1f}MB")
+    print(f"정리 후 용량: {report['total_bytes_after'] / 1024 / 1024:.1f}MB")
+    print(f"삭제{' 예정' if args.dry_run else ''}: {report['evicted']}개 ({report['freed_bytes'] / 1024 / 1024:.1f}MB)")
+    print(f"세션 참조로 건너뜀: {report['skipped_referenced']}개")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+게임 JSONL 내보내기 스크립트
+
+게임 → 세션 → 씬을 한 줄에 한 행씩 JSONL 파일로 스트리밍해서 내보냄
+(환경 간 이동, 백업, 부하 테스트용 실제 플레이 기록 준비)
+"""
+import argparse
+import logging
+import sys
+from pathlib import Path
+
+# 프로젝트 루트를 Python 경로에 추가
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from application.game_transfer import export_games
+from core.database import SessionLocal
+
+
+def main():
+    parser = argparse.ArgumentParser(description="게임 JSONL 내보내기")
+    parser.add_argument("output", help="출력 JSONL 파일")
+    parser.add_argument("--resume", action="store_true", help="출력 파일의 마지막 체크포인트부터 이어서 내보내기")
+    parser.add_argument("--user-id", type=int, default=None, help="이 사용자의 게임만 내보내기")
+    parser.add_argument("--chunk-size", type=int, default=200, help="체크포인트당 게임 수")
+    parser.add_argument("--yield-per", type=int, default=1000, help="세션/씬을 한 번에 가져올 행 수")
+    parser.add_argument("--max-games", type=int, default=0, help="이번 실행에서 내보낼 최대 게임 수 (0: 제한 없음)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    db = SessionLocal()
+    try:
+        report = export_games(
+            db,
+            args.output,
+            resume=args.resume,
+            user_id=args.user_id,
+            chunk_size=args.chunk_size,
+            yield_per=args.yield_per,
+            max_games=args.max_games,
+        )
+    finally:
+        db.close()
+
+    print("=== 게임 내보내기 결과 ===")
+    print(f"게임: {report['games']}개, 세션: {report['sessions']}개, 씬: {report['scenes']}개")
+    print(f"파일 크기 증가: {report['bytes'] / 1024 / 1024:.1f}MB, 마지막 게임 ID: {report['last_game_id']}")
+    print(f"소요 시간: {report['seconds']:.1f}초 ({report['rows_per_second']:.0f} rows/s)")
+
+
+if __name__ == "__main__":
+    main()
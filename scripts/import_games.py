@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+게임 JSONL 가져오기 스크립트
+
+export_games.py로 만든 JSONL 파일을 새 ID로 가져옴 (세션/씬의 참조는 새 ID로 바뀜)
+"""
+import argparse
+import logging
+import sys
+from pathlib import Path
+
+# 프로젝트 루트를 Python 경로에 추가
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from application.game_transfer import import_games
+from core.database import SessionLocal
+
+
+def main():
+    parser = argparse.ArgumentParser(description="게임 JSONL 가져오기")
+    parser.add_argument("input", help="export_games.py로 만든 JSONL 파일")
+    parser.add_argument(
+        "--state", default=None, help="진행 위치를 기록할 파일 (기본값: <input>.import_state.json)"
+    )
+    parser.add_argument("--user-id", type=int, default=None, help="가져온 게임의 소유자를 이 사용자로 변경")
+    parser.add_argument("--batch-size", type=int, default=1000, help="insert 한 번에 넣을 행 수")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    db = SessionLocal()
+    try:
+        report = import_games(
+            db,
+            args.input,
+            state_path=args.state or f"{args.input}.import_state.json",
+            user_id=args.user_id,
+            batch_size=args.batch_size,
+        )
+    finally:
+        db.close()
+
+    print("=== 게임 가져오기 결과 ===")
+    print(f"게임: {report['games']}개, 세션: {report['sessions']}개, 씬: {report['scenes']}개")
+    print(f"커밋한 체크포인트: {report['checkpoints']}개")
+    print(f"소요 시간: {report['seconds']:.1f}초 ({report['rows_per_second']:.0f} rows/s)")
+
+
+if __name__ == "__main__":
+    main()
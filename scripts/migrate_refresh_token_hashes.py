@@ -0,0 +1,151 @@
+"""
+리프레시 토큰 해시 저장 마이그레이션 스크립트
+
+refresh_tokens.token(VARCHAR(500) 원문) → token_hash(CHAR(64) SHA-256 hex)
+
+1. 배포 전 (옵션 없이): 만료된 토큰을 배치로 삭제하고 남은 행의 해시를 채움,
+   token_hash는 NULL 허용으로 두고 token은 NULL 허용으로 변경 (구버전/새 버전 서버 공존)
+   새 버전 서버는 해시가 없는 행을 원문 컬럼으로 찾아 해시를 채움
+2. 모든 서버 배포 후 (--cutover): 롤아웃 중 구버전 서버가 쓴 행의 해시를 채우고
+   token_hash NOT NULL, 원문 컬럼 삭제 (이후 서버는 원문 조회를 멈춤)
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# 프로젝트 루트를 Python 경로에 추가
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from sqlalchemy import text
+from application.refresh_token_purge import purge_expired_refresh_tokens
+from core.database import SessionLocal
+
+
+def column_exists(db, column_name: str) -> bool:
+    result = db.execute(
+        text("""
+            SELECT COUNT(*)
+            FROM INFORMATION_SCHEMA.COLUMNS
+            WHERE TABLE_SCHEMA = DATABASE()
+            AND TABLE_NAME = 'refresh_tokens'
+            AND COLUMN_NAME = :column_name
+        """),
+        {"column_name": column_name},
+    )
+    return result.fetchone()[0] > 0
+
+
+def index_exists(db, index_name: str) -> bool:
+    result = db.execute(
+        text("""
+            SELECT COUNT(*)
+            FROM INFORMATION_SCHEMA.STATISTICS
+            WHERE TABLE_SCHEMA = DATABASE()
+            AND TABLE_NAME = 'refresh_tokens'
+            AND INDEX_NAME = :index_name
+        """),
+        {"index_name": index_name},
+    )
+    return result.fetchone()[0] > 0
+
+
+def fill_hashes(db, batch_size: int, pause_seconds: float) -> int:
+    """token_hash가 빈 행을 배치로 채움 (MySQL SHA2는 hashlib.sha256().hexdigest()와 같은 소문자 hex)"""
+    filled = 0
+    while True:
+        result = db.execute(
+            text("UPDATE refresh_tokens SET token_hash = SHA2(token, 256) WHERE token_hash IS NULL LIMIT :limit"),
+            {"limit": batch_size},
+        )
+        db.commit()
+        filled += result.rowcount
+        if result.rowcount < batch_size:
+            return filled
+        time.sleep(pause_seconds)
+
+
+def expand(db, batch_size: int, pause_seconds: float):
+    """
+    1단계 (배포 전): 구버전/새 버전 서버가 함께 쓸 수 있는 상태로 변경
+    token_hash는 NULL 허용으로 두어 구버전 서버의 INSERT(원문만)가 실패하지 않도록 하고,
+    token은 NULL 허용으로 바꿔 새 서버의 INSERT(해시만)가 실패하지 않도록 함
+    """
+    # 1. 해시 컬럼 추가
+    if not column_exists(db, "token_hash"):
+        print("token_hash 컬럼 추가 중...")
+        db.execute(text("ALTER TABLE refresh_tokens ADD COLUMN token_hash CHAR(64) NULL"))
+        db.commit()
+    if not column_exists(db, "token"):
+        print("✓ token 컬럼이 이미 삭제되었습니다 (cutover 완료).")
+        return
+
+    # 2. 만료된 토큰 삭제 (채울 행 줄이기)
+    if not index_exists(db, "ix_refresh_tokens_expires_at"):
+        print("expires_at 인덱스 추가 중...")
+        db.execute(text("CREATE INDEX ix_refresh_tokens_expires_at ON refresh_tokens (expires_at)"))
+        db.commit()
+    report = purge_expired_refresh_tokens(db, batch_size=batch_size, pause_seconds=pause_seconds)
+    print(f"✓ 만료된 토큰 {report['deleted']}개 삭제")
+
+    # 3. 남은 행의 해시를 배치로 채움
+    print(f"✓ 토큰 {fill_hashes(db, batch_size, pause_seconds)}개의 해시 저장")
+
+    # 4. 유니크 인덱스 (NULL은 여러 개 허용되므로 구버전 서버의 행과 충돌하지 않음)
+    if not index_exists(db, "ux_refresh_tokens_token_hash"):
+        print("token_hash 유니크 인덱스 추가 중...")
+        db.execute(text("CREATE UNIQUE INDEX ux_refresh_tokens_token_hash ON refresh_tokens (token_hash)"))
+    db.execute(text("ALTER TABLE refresh_tokens MODIFY token VARCHAR(500) NULL"))
+    db.commit()
+    print("✓ token 컬럼을 NULL 허용으로 변경 - 모든 서버를 새 버전으로 배포한 뒤 --cutover 실행")
+
+
+def cutover(db, batch_size: int, pause_seconds: float):
+    """2단계 (모든 서버가 새 버전일 때): 롤아웃 중 구버전 서버가 쓴 행의 해시를 채우고 원문 컬럼 삭제"""
+    if not column_exists(db, "token_hash") or not index_exists(db, "ux_refresh_tokens_token_hash"):
+        raise RuntimeError("expand 단계를 먼저 실행하세요 (옵션 없이 실행)")
+
+    if column_exists(db, "token"):
+        print(f"✓ 토큰 {fill_hashes(db, batch_size, pause_seconds)}개의 해시 저장 (롤아웃 중 발급분)")
+    db.execute(text("ALTER TABLE refresh_tokens MODIFY token_hash CHAR(64) NOT NULL"))
+    db.commit()
+    print("✓ token_hash 컬럼을 NOT NULL로 변경")
+
+    if column_exists(db, "token"):
+        db.execute(text("ALTER TABLE refresh_tokens DROP COLUMN token"))
+        db.commit()
+        print("✓ token 컬럼과 인덱스 삭제")
+
+
+def migrate(batch_size: int, pause_seconds: float, run_cutover: bool):
+    """expand(기본) 또는 cutover 단계 실행"""
+    db = SessionLocal()
+
+    try:
+        if run_cutover:
+            cutover(db, batch_size, pause_seconds)
+        else:
+            expand(db, batch_size, pause_seconds)
+    except Exception as e:
+        print(f"✗ 마이그레이션 실패: {e}")
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="리프레시 토큰 해시 저장 마이그레이션")
+    parser.add_argument("--batch-size", type=int, default=1000, help="한 트랜잭션에서 처리할 행 수")
+    parser.add_argument("--pause", type=float, default=0.1, help="배치 사이 대기 시간 (초)")
+    parser.add_argument(
+        "--cutover",
+        action="store_true",
+        help="모든 서버가 새 버전으로 배포된 뒤 실행: 남은 해시를 채우고 token_hash NOT NULL, 원문 token 컬럼 삭제",
+    )
+    args = parser.parse_args()
+
+    print("=== 리프레시 토큰 마이그레이션 시작 ===")
+    migrate(args.batch_size, args.pause, args.cutover)
+    print("=== 마이그레이션 완료 ===")
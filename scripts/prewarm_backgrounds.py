@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+배경 이미지 사전 생성 스크립트
+
+자주 쓰이는 장소 × 날씨 × 시간대 조합(또는 기존 세션 내용)에 대한 배경을 미리 만들어
+게임 진행 중 이미지 생성 대기 없이 기존 이미지를 재사용하도록 함
+"""
+import argparse
+import hashlib
+import json
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+
+# 프로젝트 루트를 Python 경로에 추가
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from application.background_generator import BackgroundGenerator
+from application.keyword_canonicalizer import canonical_key
+
+DEFAULT_LOCATIONS = [
+    "classroom",
+    "school rooftop",
+    "school corridor",
+    "library",
+    "park",
+    "cafe",
+    "street",
+    "train station",
+]
+DEFAULT_WEATHER = ["sunny", "rainy", "cloudy", "snowy"]
+DEFAULT_TIMES = ["morning", "afternoon", "sunset", "night"]
+
+
+def build_matrix_jobs(locations, weather, times):
+    """장소 × 날씨 × 시간대 조합을 키워드 작업으로 변환 (같은 장면으로 정규화되는 조합은 하나만)"""
+    jobs = {}
+    for loc in locations:
+        for w in weather:
+            for t in times:
+                keyword = f"{w} {t} {loc}"
+                key = canonical_key(keyword)
+                jobs.setdefault(key, {"id": f"keyword:{key}", "keyword": keyword})
+    return list(jobs.values())
+
+
+def build_session_jobs(limit):
+    """기존 세션 내용(Session.content)을 스토리 작업으로 변환 (중복 내용 제거)"""
+    from core.database import SessionLocal
+    from domain.entity.game import Session as GameSession
+
+    db = SessionLocal()
+    try:
+        query = db.query(GameSession.content).distinct().order_by(GameSession.content)
+        if limit:
+            query = query.limit(limit)
+        return [
+            {"id": "story:" + hashlib.sha256(content.encode("utf-8")).hexdigest(), "story": content}
+            for (content,) in query
+        ]
+    finally:
+        db.close()
+
+
+class PrewarmState:
+    """완료된 작업 ID를 JSONL 파일에 기록하여 중단 후 이어서 실행"""
+
+    def __init__(self, path: Path):
+        self.__path = path
+        self.__lock = threading.Lock()
+        self.done = set()
+        if path.exists():
+            with path.open(encoding="utf-8") as f:
+                self.done = {json.loads(line)["id"] for line in f if line.strip()}
+
+    def mark_done(self, job_id: str, result: dict) -> None:
+        with self.__lock:
+            self.done.add(job_id)
+            with self.__path.open("a", encoding="utf-8") as f:
+                f.write(json.dumps({"id": job_id, **result}, ensure_ascii=False) + "\n")
+
+
+def run_job(generator: BackgroundGenerator, job: dict) -> dict:
+    """작업 하나 실행 - 기존 이미지가 있으면 재사용, 없으면 생성"""
+    llm_calls = 0
+    keyword = job.get("keyword")
+    if keyword is None:
+        keyword, called_llm = generator.resolve_background_keyword(job["story"])
+        llm_calls += called_llm
+
+    existing = generator.find_matching_image(keyword)
+    if existing:
+        return {"status": "hit", "keyword": keyword, "url": existing, "llm_calls": llm_calls}
+
+    url = generator.create_background_image_by_keyword(keyword)
+    return {"status": "generated", "keyword": keyword, "url": url, "llm_calls": llm_calls}
+
+
+def prewarm(jobs, state: PrewarmState, concurrency: int, image_cost: float, dry_run: bool) -> dict:
+    pending = [job for job in jobs if job["id"] not in state.done]
+    print(f"전체 {len(jobs)}개 중 {len(jobs) - len(pending)}개 완료됨, {len(pending)}개 실행 예정")
+
+    report = {"hit": 0, "generated": 0, "failed": 0, "llm_calls": 0}
+    if dry_run or not pending:
+        for job in pending:
+            print(f"  - {job.get('keyword') or job['story'][:50]}")
+        return report
+
+    generator = BackgroundGenerator()
+    started = time.time()
+
+    # 동시 실행 수를 제한하여 이미지 API 레이트 리밋을 넘지 않도록 함
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        futures = {executor.submit(run_job, generator, job): job for job in pending}
+        for done_count, future in enumerate(as_completed(futures), start=1):
+            job = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                report["failed"] += 1
+                print(f"✗ [{done_count}/{len(pending)}] {job['id'][:60]}: {e}")
+                continue
+
+            report[result["status"]] += 1
+            report["llm_calls"] += result["llm_calls"]
+            state.mark_done(job["id"], result)
+
+            elapsed = time.time() - started
+            eta = elapsed / done_count * (len(pending) - done_count)
+            print(
+                f"✓ [{done_count}/{len(pending)}] {result['status']:9} {result['keyword']} "
+                f"(경과 {elapsed:.0f}s, 남은 시간 약 {eta:.0f}s)"
+            )
+
+    report["elapsed_seconds"] = round(time.time() - started, 1)
+    report["estimated_image_cost"] = round(report["generated"] * image_cost, 4)
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="배경 이미지 사전 생성")
+    parser.add_argument("--locations", nargs="+", default=DEFAULT_LOCATIONS, help="장소 목록")
+    parser.add_argument("--weather", nargs="+", default=DEFAULT_WEATHER, help="날씨 목록")
+    parser.add_argument("--times", nargs="+", default=DEFAULT_TIMES, help="시간대 목록")
+    parser.add_argument("--from-sessions", action="store_true", help="조합 대신 기존 세션 내용에서 작업 생성")
+    parser.add_argument("--session-limit", type=int, default=0, help="--from-sessions 사용 시 최대 세션 수 (0: 전체)")
+    parser.add_argument("--concurrency", type=int, default=4, help="동시 생성 수")
+    parser.add_argument("--state", default="prewarm_state.jsonl", help="진행 상태 파일 (이어서 실행용)")
+    parser.add_argument("--image-cost", type=float, default=0.039, help="이미지 1장당 예상 비용 (USD)")
+    parser.add_argument("--dry-run", action="store_true", help="실행할 작업만 출력")
+    args = parser.parse_args()
+
+    if args.from_sessions:
+        jobs = build_session_jobs(args.session_limit)
+    else:
+        jobs = build_matrix_jobs(args.locations, args.weather, args.times)
+
+    state = PrewarmState(Path(args.state))
+    report = prewarm(jobs, state, args.concurrency, args.image_cost, args.dry_run)
+
+    print("\n=== 사전 생성 결과 ===")
+    print(f"재사용(hit): {report['hit']}")
+    print(f"새로 생성: {report['generated']}")
+    print(f"실패: {report['failed']}")
+    print(f"LLM 호출: {report['llm_calls']}")
+    if "elapsed_seconds" in report:
+        print(f"소요 시간: {report['elapsed_seconds']}s")
+        print(f"예상 이미지 비용: ${report['estimated_image_cost']}")
+
+
+if __name__ == "__main__":
+    main()
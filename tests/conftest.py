@@ -1,8 +1,9 @@
 import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
-from core.database import Base, get_db
+from core.database import Base, get_async_db, get_db, to_async_url
 from main import app
 
 # 테스트용 인메모리 SQLite 데이터베이스
@@ -57,7 +58,37 @@ def client(db_session):
         finally:
             pass
 
+    # 인증 라우터는 비동기 세션 사용 (같은 SQLite 파일)
+    async_session_factory = async_sessionmaker(
+        create_async_engine(to_async_url(SQLALCHEMY_DATABASE_URL)), autoflush=False, expire_on_commit=False
+    )
+
+    async def override_get_async_db():
+        async with async_session_factory() as db:
+            yield db
+
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = override_get_async_db
     with TestClient(app) as test_client:
         yield test_client
     app.dependency_overrides.clear()
+
+
+# 게임 서비스 단위 테스트 공용 픽스처 (MySQL 없이 임시 파일 SQLite 사용, 헬퍼는 tests/helpers.py)
+@pytest.fixture(name="engine")
+def game_engine(tmp_path):
+    game_engine = create_engine(f"sqlite:///{tmp_path / 'game.db'}")
+    Base.metadata.create_all(bind=game_engine)
+    yield game_engine
+    game_engine.dispose()
+
+
+@pytest.fixture
+def db(engine):
+    """캐릭터 "하나"(id 1)가 들어 있는 세션"""
+    from domain.repository.game_repository import CharacterRepository
+
+    db = sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+    CharacterRepository(db).create_character("하나", "밝음")
+    yield db
+    db.close()
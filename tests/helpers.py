@@ -0,0 +1,95 @@
+"""게임 서비스 단위 테스트 공용 헬퍼 (픽스처는 conftest.py)"""
+from datetime import datetime, timedelta
+
+from application.game_service import GameService
+from application.sprite_manifest import SpriteManifest
+from domain.repository.game_repository import (
+    GameRepository,
+    GameStateRepository,
+    SceneRepository,
+    SessionRepository,
+)
+
+EMOTION = {"angry": 0, "disgust": 0, "fear": 0, "happy": 80, "sad": 0, "surprise": 10, "neutral": 10}
+SELECTION = {"1": "응", "2": "아니"}
+
+
+class FakeLLMService:
+    """정해진 씬을 차례로 돌려주고 받은 대화 히스토리를 기록 (on_call은 호출 도중 실행)"""
+
+    def __init__(self, *turns, token_usage: int = 0, on_call=None):
+        self.turns = list(turns)
+        self.token_usage = token_usage
+        self.on_call = on_call
+        self.histories = []
+
+    def generate_next_scene(self, scene_history=(), **kwargs):
+        self.histories.append([scene["dialogue"] for scene in scene_history])
+        if self.on_call:
+            self.on_call()
+        return self.turns.pop(0)
+
+    def generate_scene_after_selection(self, scene_history=(), **kwargs):
+        return self.generate_next_scene(scene_history)
+
+    def consume_token_usage(self):
+        return self.token_usage
+
+
+class FakeBackgroundGenerator:
+    def create_background_image(self, content):
+        return "/static/generated_images/new.png"
+
+
+def dialogue(text, character_id=1):
+    return {"role": "npc", "type": "dialogue", "dialogue": text, "character_id": character_id, "emotion": "smile"}
+
+
+def make_service(db, tmp_path, llm_service=None, **options):
+    return GameService(
+        db,
+        bg_generator=FakeBackgroundGenerator(),
+        llm_service=llm_service or FakeLLMService(),
+        sprite_manifest=SpriteManifest(tmp_path / "sprites", "/api/v2/sprites"),
+        **options,
+    )
+
+
+def play_game(
+    db,
+    sessions=(["1-1", None, "1-3"], ["2-1", "2-2"]),
+    title: str = "제목",
+    user_id: int = 1,
+    with_state: bool = True,
+    days_ago: int = None,
+    token_usage: int = 0,
+) -> int:
+    """대사 씬으로 이루어진 게임을 만들고 커밋 (None은 선택지 씬, 선택지 1을 고른 상태)
+
+    세션 내용은 "{title} 세션 {번호}", days_ago를 주면 마지막 씬 이후 그만큼 지난 것으로 기록
+    """
+    game = GameRepository(db).create_game(user_id, title, "밝음", "로맨스", 10, 1)
+    state = None
+    for session_number, dialogues in enumerate(sessions, start=1):
+        session = SessionRepository(db).create_session(game.id, session_number, f"{title} 세션 {session_number}")
+        if with_state:
+            if state is None:
+                state = GameStateRepository(db).build_state(game, session)
+            state.next_session_number = session_number + 1
+        for scene_number, line in enumerate(dialogues, start=1):
+            scene = SceneRepository(db).create_scene(
+                session.id,
+                scene_number,
+                "npc",
+                "selection" if line is None else "dialogue",
+                dialogue=line,
+                selections=SELECTION if line is None else None,
+                game_state=state,
+                token_usage=token_usage,
+            )
+            if line is None:
+                SceneRepository(db).update_scene_selection(scene.id, 1)
+    if state is not None and days_ago is not None:
+        state.updated_at = datetime.utcnow() - timedelta(days=days_ago)
+    db.commit()
+    return game.id
@@ -0,0 +1,179 @@
+from datetime import datetime, timedelta
+
+import pytest
+import pytest_asyncio
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from core.database import to_async_url
+from domain.entity.game import GameState
+from domain.entity.image import GeneratedImage
+from domain.repository.async_game_repository import (
+    AsyncCharacterRepository,
+    AsyncGameRepository,
+    AsyncGameStateRepository,
+    AsyncSceneRepository,
+    AsyncSessionRepository,
+)
+from domain.repository.async_user_repository import AsyncUserRepository
+from domain.repository.game_repository import (
+    GameRepository,
+    GameStateRepository,
+    SceneRepository,
+    SessionRepository,
+)
+from tests.helpers import SELECTION, play_game
+
+STATE_COLUMNS = ["next_session_number", "next_scene_number", "phase", "last_emotion", "token_usage"]
+
+
+@pytest_asyncio.fixture
+async def async_db(engine):
+    """conftest의 동기 engine과 같은 DB 파일 (동기 리포지토리와 결과 비교용)"""
+    async_engine = create_async_engine(to_async_url(str(engine.url)))
+    async with async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)() as session:
+        yield session
+    await async_engine.dispose()
+
+
+class TestAsyncUrl:
+    def test_converts_sync_drivers(self):
+        """동기 드라이버 URL을 비동기 드라이버로 변환"""
+        assert to_async_url("mysql+pymysql://root:pw@localhost:3306/db") == "mysql+aiomysql://root:pw@localhost:3306/db"
+        assert to_async_url("sqlite:///./test.db") == "sqlite+aiosqlite:///./test.db"
+        assert to_async_url("sqlite+aiosqlite:///./test.db") == "sqlite+aiosqlite:///./test.db"
+
+
+class TestAsyncGameRepository:
+    @pytest.mark.asyncio
+    async def test_game_flow(self, async_db):
+        """게임 → 세션 → 씬 생성 후 대화 히스토리 순서대로 조회"""
+        character = await AsyncCharacterRepository(async_db).create_character("하나", "밝음")
+        game = await AsyncGameRepository(async_db).create_game(1, "제목", "밝음", "로맨스", 10, character.id)
+        sessions = AsyncSessionRepository(async_db)
+        scenes = AsyncSceneRepository(async_db)
+        second = await sessions.create_session(game.id, 2, "둘째")
+        first = await sessions.create_session(game.id, 1, "첫째")
+        await scenes.create_scene(second.id, 1, "npc", "dialogue", dialogue="c")
+        await scenes.create_scene(first.id, 2, "npc", "dialogue", dialogue="b")
+        await scenes.create_scene(first.id, 1, "npc", "dialogue", dialogue="a")
+
+        history = await scenes.get_all_scenes_in_game(game.id)
+
+        assert [scene.dialogue for scene in history] == ["a", "b", "c"]
+        assert (await sessions.get_latest_session(game.id)).id == second.id
+        assert (await scenes.get_latest_scene(first.id)).dialogue == "b"
+        assert [g.id for g in await AsyncGameRepository(async_db).get_games_by_user(1)] == [game.id]
+
+    @pytest.mark.asyncio
+    async def test_create_session_increments_reference_count(self, async_db):
+        """세션 생성 시 배경 이미지 참조 수 증가"""
+        async_db.add(GeneratedImage(
+            hash="a" * 64, filename=f"{'a' * 64}.png", keyword="park", width=16, height=9, bytes=100
+        ))
+        await async_db.commit()
+
+        session = await AsyncSessionRepository(async_db).create_session(
+            1, 1, "공원", background_url=f"/static/generated_images/{'a' * 64}.png"
+        )
+        completed = await AsyncSessionRepository(async_db).mark_session_completed(session.id)
+
+        image = await async_db.get(GeneratedImage, "a" * 64, populate_existing=True)
+        assert image.reference_count == 1
+        assert completed.is_completed == 1
+
+
+class TestParityWithSyncRepository:
+    """같은 호출이면 동기 리포지토리와 같은 진행 상태/히스토리"""
+
+    @pytest.mark.asyncio
+    async def test_create_scene_updates_state(self, db, async_db):
+        """씬 생성 시 게임 상태 갱신 (현재 위치, 다음 번호, 단계, 감정, 토큰 사용량)"""
+        game = GameRepository(db).create_game(1, "동기", "밝음", "로맨스", 10, 1)
+        session = SessionRepository(db).create_session(game.id, 1, "교실")
+        state = GameStateRepository(db).build_state(game, session)
+        SceneRepository(db).create_scene(session.id, 1, "npc", "dialogue", dialogue="안녕", game_state=state)
+        SceneRepository(db).create_scene(
+            session.id, 2, "npc", "selection", selections=SELECTION,
+            game_state=state, user_emotion="happy", token_usage=30,
+        )
+
+        async_game = await AsyncGameRepository(async_db).create_game(1, "비동기", "밝음", "로맨스", 10, 1)
+        async_session = await AsyncSessionRepository(async_db).create_session(async_game.id, 1, "교실")
+        async_state = AsyncGameStateRepository(async_db).build_state(async_game, async_session)
+        scenes = AsyncSceneRepository(async_db)
+        await scenes.create_scene(async_session.id, 1, "npc", "dialogue", dialogue="안녕", game_state=async_state)
+        selection = await scenes.create_scene(
+            async_session.id, 2, "npc", "selection", selections=SELECTION,
+            game_state=async_state, user_emotion="happy", token_usage=30,
+        )
+
+        db.expire_all()
+        expected = db.get(GameState, game.id)
+        actual = await AsyncGameStateRepository(async_db).get_state(async_game.id)
+        assert [getattr(actual, column) for column in STATE_COLUMNS] == [
+            getattr(expected, column) for column in STATE_COLUMNS
+        ]
+        assert (actual.current_session_id, actual.current_scene_id) == (async_session.id, selection.id)
+
+    @pytest.mark.asyncio
+    async def test_fork_history_matches(self, db, async_db):
+        """분기 게임의 히스토리는 동기 리포지토리와 같은 씬 (원본의 분기 지점 이전 씬 포함)"""
+        parent_id = play_game(db)
+        parent_scenes = SceneRepository(db).get_all_scenes_in_game(parent_id)
+        games = GameRepository(db)
+        fork_id = games.create_fork(games.get_game_by_id(parent_id), parent_scenes[3]).game_id
+        nested_id = games.create_fork(games.get_game_by_id(fork_id), parent_scenes[1]).game_id
+
+        for game_id in (parent_id, fork_id, nested_id):
+            expected = [scene.id for scene in SceneRepository(db).get_all_scenes_in_game(game_id)]
+            actual = [scene.id for scene in await AsyncSceneRepository(async_db).get_all_scenes_in_game(game_id)]
+            assert actual == expected
+
+    @pytest.mark.asyncio
+    async def test_create_fork_and_paged_history(self, db, async_db):
+        """비동기 분기 생성 후 씬 페이지/게임 목록이 동기 리포지토리와 같음"""
+        parent_id = play_game(db)
+        parent_scenes = SceneRepository(db).get_all_scenes_in_game(parent_id)
+        games = AsyncGameRepository(async_db)
+        parent = await games.get_game_by_id(parent_id)
+        fork_scene = await AsyncSceneRepository(async_db).get_scene_by_id(parent_scenes[3].id)
+        state = await games.create_fork(parent, fork_scene)
+
+        assert (state.next_session_number, state.next_scene_number) == (3, 2)
+        for after_scene_id, limit in ((0, None), (0, 2), (parent_scenes[1].id, 2)):
+            _, expected = GameRepository(db).get_game_with_scenes(state.game_id, after_scene_id, limit)
+            _, actual = await games.get_game_with_scenes(state.game_id, after_scene_id, limit)
+            assert [[scene.id for scene in session.scenes] for session in actual] == [
+                [scene.id for scene in session.scenes] for session in expected
+            ]
+        expected = GameRepository(db).get_games_by_user(1, before_id=state.game_id + 1, limit=1)
+        actual = await games.get_games_by_user(1, before_id=state.game_id + 1, limit=1)
+        assert [game.id for game in actual] == [game.id for game in expected] == [state.game_id]
+
+
+class TestAsyncUserRepository:
+    @pytest.mark.asyncio
+    async def test_refresh_token_rotation(self, async_db):
+        """리프레시 토큰 교체 시 이전 토큰 삭제"""
+        users = AsyncUserRepository(async_db)
+        user = await users.create_user("player", "player@example.com", "hashed")
+        expires_at = datetime.utcnow() + timedelta(days=7)
+        await users.save_refresh_token(user.id, "old", expires_at)
+
+        await users.replace_refresh_token("old", user.id, "new", expires_at)
+
+        assert await users.get_refresh_token("old") is None
+        assert (await users.get_refresh_token("new")).user_id == user.id
+        assert (await users.get_user_by_username("player")).email == "player@example.com"
+
+    @pytest.mark.asyncio
+    async def test_per_user_cap(self, async_db):
+        """max_active를 넘는 오래된 토큰은 같은 트랜잭션에서 삭제 (동기 리포지토리와 같은 규칙)"""
+        users = AsyncUserRepository(async_db)
+        expires_at = datetime.utcnow() + timedelta(days=7)
+        for token in ["a", "b", "c"]:
+            await users.save_refresh_token(1, token, expires_at, max_active=2)
+
+        assert await users.get_refresh_token("a") is None
+        assert await users.get_refresh_token("b") is not None
+        assert await users.get_refresh_token("c") is not None
@@ -0,0 +1,121 @@
+import base64
+import io
+from random import Random
+from types import SimpleNamespace
+
+import pytest
+from PIL import Image
+
+from application.background_generator import BackgroundGenerator
+from application.image_processing import process_background_image
+from application.keyword_cache import KeywordCache
+from core.storage import LocalImageStorage
+
+
+def make_png_base64(seed: int) -> str:
+    # 지각 해시가 서로 충분히 다르도록 무작위 패턴 사용
+    random = Random(seed)
+    image = Image.new("L", (9, 8))
+    image.putdata([random.randrange(256) for _ in range(72)])
+    buffer = io.BytesIO()
+    image.resize((320, 180), Image.NEAREST).convert("RGB").save(buffer, "PNG")
+    return base64.b64encode(buffer.getvalue()).decode("ascii")
+
+
+class FakeResponse:
+    status_code = 200
+    text = "{}"
+
+    def __init__(self, data):
+        self.__data = data
+
+    def json(self):
+        return self.__data
+
+
+class FakeHttpClient:
+    def __init__(self, images):
+        self.images = images
+        self.prompts = []
+
+    def post(self, url, **kwargs):
+        self.prompts.append(kwargs["json"]["contents"][0]["parts"][0]["text"])
+        parts = [{"inlineData": {"mimeType": "image/png", "data": image}} for image in self.images]
+        return FakeResponse({"candidates": [{"content": {"parts": parts}}]})
+
+
+class InlineImageProcessor:
+    def process(self, image_base64):
+        return process_background_image(image_base64, max_pixels=10_000_000)
+
+
+@pytest.fixture
+def make_generator(tmp_path, monkeypatch):
+    monkeypatch.setenv("GEMINI_TOKEN", "test-key")
+
+    def make(images):
+        http_client = FakeHttpClient(images)
+        generator = BackgroundGenerator(
+            storage=LocalImageStorage(tmp_path, "/static/generated_images"),
+            image_processor=InlineImageProcessor(),
+            http_client=http_client,
+            keyword_cache=KeywordCache(None, max_size=10, ttl_seconds=60),
+            session_factory=None,
+        )
+        return generator, http_client
+
+    return make
+
+
+class TestVariantBatch:
+    def test_one_call_fills_variant_keywords(self, make_generator):
+        """한 번의 호출로 받은 이미지를 요청 순서대로 각 변형 키워드에 저장"""
+        images = [make_png_base64(1), make_png_base64(2), make_png_base64(3)]
+        generator, http_client = make_generator(images)
+
+        url = generator.create_background_image_by_keyword("sunny park", variant_facets=["night", "rainy"])
+
+        assert len(http_client.prompts) == 1
+        assert "1. sunny park" in http_client.prompts[0]
+        assert "2. night sunny park" in http_client.prompts[0]
+        assert "3. rainy park" in http_client.prompts[0]
+        assert generator.find_matching_image("sunny park") == url
+        assert generator.find_matching_image("park at night sunny") not in (None, url)
+        assert generator.find_matching_image("rainy park") not in (None, url)
+
+    def test_skips_existing_variants(self, make_generator):
+        """이미 이미지가 있는 변형과 같은 장면의 facet은 다시 요청하지 않음"""
+        generator, http_client = make_generator([make_png_base64(4), make_png_base64(5)])
+        generator.create_background_image_by_keyword("rainy park", variant_facets=[])
+
+        variants = generator.get_variant_keywords("sunny park", ["rainy", "sunny", "night", "nighttime"])
+
+        assert variants == ["night sunny park"]
+
+    def test_missing_variant_images(self, make_generator):
+        """이미지가 요청보다 적게 오면 받은 만큼만 저장"""
+        generator, _ = make_generator([make_png_base64(6)])
+
+        url = generator.create_background_image_by_keyword("sunny park", variant_facets=["night"])
+
+        assert generator.find_matching_image("sunny park") == url
+        assert generator.find_matching_image("night sunny park") is None
+
+
+class TestKeywordResolution:
+    def test_reports_llm_call_only_on_cache_miss(self, make_generator):
+        """캐시에 없을 때만 LLM을 호출했다고 알림 (사전 생성 리포트의 LLM 호출 수)"""
+        generator, _ = make_generator([])
+        calls = []
+
+        def generate_content(model, contents):
+            calls.append(contents)
+            part = SimpleNamespace(text=" sunny park \n")
+            return SimpleNamespace(candidates=[SimpleNamespace(content=SimpleNamespace(parts=[part]))])
+
+        generator._BackgroundGenerator__client = SimpleNamespace(models=SimpleNamespace(generate_content=generate_content))
+
+        assert generator.resolve_background_keyword("공원 산책") == ("sunny park", True)
+        assert generator.resolve_background_keyword("공원 산책") == ("sunny park", False)
+        assert generator.get_background_keyword("공원 산책") == "sunny park"
+        assert len(calls) == 1
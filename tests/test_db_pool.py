@@ -0,0 +1,76 @@
+import pytest
+from sqlalchemy import create_engine, exc
+
+from core.config import get_settings
+from core.database import Base
+from core.db_pool import TimedQueuePool, instrument_pool, pool_options
+from core.metrics import metrics
+from domain.repository.game_repository import SceneRepository
+from tests.helpers import FakeLLMService, dialogue, make_service, play_game
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}",
+        poolclass=TimedQueuePool,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.05,
+    )
+    instrument_pool(engine)
+    Base.metadata.create_all(bind=engine)
+    metrics.reset()
+    yield engine
+    engine.dispose()
+
+
+class TestPoolOptions:
+    def test_memory_sqlite_keeps_default_pool(self):
+        """메모리 SQLite는 큐 풀 설정을 넘기지 않음"""
+        assert pool_options("sqlite://", get_settings()) == {}
+
+    def test_mysql_uses_settings(self):
+        settings = get_settings()
+
+        options = pool_options("mysql+pymysql://u:p@localhost/db", settings)
+
+        assert options["poolclass"] is TimedQueuePool
+        assert options["pool_size"] == settings.DB_POOL_SIZE
+        assert options["max_overflow"] == settings.DB_MAX_OVERFLOW
+
+
+class TestPoolMetrics:
+    def test_checkout_wait_and_in_use(self, engine):
+        """체크아웃 대기 시간, 사용 중 연결 수, 풀 고갈 시 타임아웃 기록"""
+        held = engine.connect()
+        assert metrics.snapshot()["gauges"]["db_pool_in_use"] == 1
+
+        with pytest.raises(exc.TimeoutError):
+            engine.connect()
+        held.close()
+
+        snapshot = metrics.snapshot()
+        assert snapshot["gauges"]["db_pool_in_use"] == 0
+        assert snapshot["counters"]["db_pool_checkout_timeout_total"] == 1
+        assert snapshot["observations"]["db_pool_checkout_wait_ms"]["max"] >= 50
+
+
+class TestReleaseConnectionDuringCalls:
+    @pytest.mark.parametrize("release, expected_in_use", [(True, 0), (False, 1)])
+    def test_llm_call_without_connection(self, engine, db, tmp_path, release, expected_in_use):
+        """해제 모드에서는 LLM 호출 동안 연결을 잡고 있지 않고 이후 쿼리에서 다시 받음"""
+        game_id = play_game(db, sessions=(["안녕"],), with_state=False)
+        scene = SceneRepository(db).get_all_scenes_in_game(game_id)[-1]
+        db.close()
+        in_use_during_call = []
+        llm_service = FakeLLMService(
+            (dialogue("다음"), False, None), on_call=lambda: in_use_during_call.append(engine.pool.checkedout())
+        )
+        service = make_service(db, tmp_path, llm_service, release_connection_during_calls=release)
+
+        result = service.generate_next_scene(game_id, scene.session_id, scene.id, emotion={}, elapsed_time=30)
+        db.close()
+
+        assert in_use_during_call == [expected_in_use]
+        assert result["scenes"][0]["dialogue"] == "다음"
@@ -0,0 +1,158 @@
+import shutil
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from core.database import Base
+from core.db_routing import RoutingSession, use_primary
+from core.metrics import metrics
+from domain.entity.game import Game
+from domain.repository.game_repository import (
+    CharacterRepository,
+    GameRepository,
+    GameStateRepository,
+    SceneRepository,
+)
+from tests.helpers import EMOTION, FakeLLMService, dialogue, make_service, play_game
+
+
+@pytest.fixture
+def databases(tmp_path):
+    """primary와 지연된 복제본 (primary 파일의 특정 시점 복사본)"""
+    primary_path = tmp_path / "primary.db"
+    replica_path = tmp_path / "replica.db"
+    primary = create_engine(f"sqlite:///{primary_path}")
+    Base.metadata.create_all(bind=primary)
+    db = sessionmaker(bind=primary)()
+    character_id = CharacterRepository(db).create_character("하나", "밝음").id
+    GameRepository(db).create_game(1, "복제된 게임", "밝음", "로맨스", 10, character_id)
+    db.close()
+    shutil.copy(primary_path, replica_path)
+    replica = create_engine(f"sqlite:///{replica_path}")
+
+    # 복제본에 아직 반영되지 않은 쓰기
+    db = sessionmaker(bind=primary)()
+    GameRepository(db).create_game(1, "최근 게임", "밝음", "로맨스", 10, character_id)
+    db.close()
+
+    yield primary, replica
+    primary.dispose()
+    replica.dispose()
+
+
+def routing_session(primary, replicas):
+    return sessionmaker(class_=RoutingSession, autoflush=False, bind=primary, replicas=replicas)()
+
+
+def titles(games) -> list:
+    return sorted(game.title for game in games)
+
+
+class TestRoutingSession:
+    def test_read_only_methods_use_replica(self, databases):
+        """@read_only 조회는 복제본에서 (지연된 최근 게임은 아직 안 보임)"""
+        primary, replica = databases
+        db = routing_session(primary, [replica])
+        metrics.reset()
+
+        assert titles(GameRepository(db).get_games_by_user(1)) == ["복제된 게임"]
+        assert metrics.counter("db_replica_read_total") == 1
+        db.close()
+
+    def test_other_queries_use_primary(self, databases):
+        """@read_only가 아닌 조회는 항상 primary"""
+        primary, replica = databases
+        db = routing_session(primary, [replica])
+
+        assert GameRepository(db).get_game_by_id(2).title == "최근 게임"
+        assert db.get(Game, 2).title == "최근 게임"
+        db.close()
+
+    def test_reads_after_write_stick_to_primary(self, databases):
+        """세션에서 쓰기가 있었으면 이후 읽기는 primary (read-your-writes)"""
+        primary, replica = databases
+        db = routing_session(primary, [replica])
+
+        created = GameRepository(db).create_game(1, "방금 만든 게임", "밝음", "로맨스", 10, 1)
+
+        assert GameRepository(db).get_game_by_id(created.id).title == "방금 만든 게임"
+        assert titles(GameRepository(db).get_games_by_user(1)) == ["방금 만든 게임", "복제된 게임", "최근 게임"]
+        db.close()
+
+    def test_bulk_update_sticks_to_primary(self, databases):
+        """flush 없는 UPDATE 문도 쓰기로 취급"""
+        primary, replica = databases
+        db = routing_session(primary, [replica])
+
+        db.query(Game).filter(Game.id == 1).update({"title": "바뀐 제목"})
+
+        assert GameRepository(db).get_game_by_id(1).title == "바뀐 제목"
+        db.close()
+
+    def test_use_primary_overrides_read_only(self, databases):
+        """use_primary 블록 안에서는 @read_only 조회도 primary"""
+        primary, replica = databases
+        db = routing_session(primary, [replica])
+
+        with use_primary(db):
+            assert titles(GameRepository(db).get_games_by_user(1)) == ["복제된 게임", "최근 게임"]
+        assert titles(GameRepository(db).get_games_by_user(1)) == ["복제된 게임"]
+        db.close()
+
+    def test_without_replicas_everything_on_primary(self, databases):
+        primary, _ = databases
+        db = routing_session(primary, [])
+
+        assert titles(GameRepository(db).get_games_by_user(1)) == ["복제된 게임", "최근 게임"]
+        db.close()
+
+
+class TestLaggingReplica:
+    @pytest.fixture
+    def lagging(self, tmp_path):
+        """복제본에는 마지막 턴이 없는 게임(1)과 아예 없는 게임(2)"""
+        primary_path = tmp_path / "primary.db"
+        replica_path = tmp_path / "replica.db"
+        primary = create_engine(f"sqlite:///{primary_path}")
+        Base.metadata.create_all(bind=primary)
+        db = sessionmaker(bind=primary)()
+        CharacterRepository(db).create_character("하나", "밝음")
+        play_game(db, sessions=(["1-1", "1-2"],))
+        db.close()
+        shutil.copy(primary_path, replica_path)
+        replica = create_engine(f"sqlite:///{replica_path}")
+
+        db = sessionmaker(bind=primary)()
+        state = GameStateRepository(db).get_state(1)
+        SceneRepository(db).create_scene(state.current_session_id, 3, "npc", "dialogue", dialogue="1-3", game_state=state)
+        play_game(db, sessions=(["2-1"],))
+        db.close()
+
+        yield primary, replica
+        primary.dispose()
+        replica.dispose()
+
+    def test_turn_history_includes_latest_scene(self, lagging, tmp_path):
+        """턴의 LLM 히스토리는 복제본에 아직 없는 직전 씬까지 포함"""
+        primary, replica = lagging
+        db = routing_session(primary, [replica])
+        latest = SceneRepository(db).get_all_scenes_in_game(1)[-1]
+        llm = FakeLLMService((dialogue("1-4"), False, None))
+
+        make_service(db, tmp_path, llm).generate_next_scene(1, latest.session_id, latest.id, EMOTION, 30)
+
+        assert llm.histories == [["1-1", "1-2", "1-3"]]
+        db.close()
+
+    def test_fork_and_version_see_new_game(self, lagging, tmp_path):
+        """복제본에 없는 방금 만든 게임도 버전/게임 조회와 분기에서 404가 나지 않음"""
+        primary, replica = lagging
+        db = routing_session(primary, [replica])
+        service = make_service(db, tmp_path)
+        scene_id = SceneRepository(db).get_all_scenes_in_game(2)[-1].id
+
+        assert service.get_game_version(1, 2) == scene_id
+        assert service.get_game(1, 2)["latest_scene_id"] == scene_id
+        assert service.fork_game(1, 2, scene_id)["parent_game_id"] == 2
+        db.close()
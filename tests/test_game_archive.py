@@ -0,0 +1,85 @@
+from application.game_archive import archive_games, restore_game
+from domain.entity.game import GameArchive, GameState, Scene, Session as GameSession
+from domain.repository.game_repository import SceneRepository
+from tests.helpers import make_service, play_game
+
+
+def finished_game(db, last_dialogue: str = "끝", days_ago: int = 60) -> int:
+    """세션 2개, 씬 3개인 게임 (마지막 씬 이후 days_ago일 경과)"""
+    return play_game(db, sessions=(["안녕", "반가워"], [last_dialogue]), days_ago=days_ago, token_usage=10)
+
+
+def row_counts(db, game_id: int):
+    sessions = db.query(GameSession).filter(GameSession.game_id == game_id).count()
+    scenes = db.query(Scene).join(GameSession).filter(GameSession.game_id == game_id).count()
+    return sessions, scenes
+
+
+class TestArchiveGames:
+    def test_archives_only_old_finished_games(self, db):
+        """엔딩 후 오래된 게임만 보관하고 진행 중이거나 최근에 끝난 게임은 유지"""
+        old_finished = finished_game(db)
+        recent_finished = finished_game(db, days_ago=1)
+        old_in_progress = finished_game(db, last_dialogue="계속")
+
+        report = archive_games(db, older_than_days=30, batch_size=1)
+
+        assert report["archived"] == 1
+        assert (report["sessions"], report["scenes"]) == (2, 3)
+        assert row_counts(db, old_finished) == (0, 0)
+        assert db.get(GameArchive, old_finished).latest_scene_id is not None
+        assert row_counts(db, recent_finished) == (2, 3)
+        assert row_counts(db, old_in_progress) == (2, 3)
+
+    def test_batches_and_max_games(self, db):
+        """배치 크기와 관계없이 max_games까지만 보관"""
+        for _ in range(5):
+            finished_game(db)
+
+        report = archive_games(db, older_than_days=30, batch_size=2, max_games=3)
+
+        assert report["archived"] == 3
+        assert db.query(GameArchive).count() == 3
+
+    def test_dry_run(self, db):
+        game_id = finished_game(db)
+
+        report = archive_games(db, older_than_days=30, dry_run=True)
+
+        assert report["candidates"] == [game_id]
+        assert row_counts(db, game_id) == (2, 3)
+
+
+class TestRestoreGame:
+    def test_restore_keeps_ids_and_state(self, db):
+        """원래 ID와 진행 상태 그대로 복원하고 보관 행 삭제"""
+        game_id = finished_game(db)
+        scene_ids = [scene.id for scene in SceneRepository(db).get_all_scenes_in_game(game_id)]
+        archive_games(db, older_than_days=30)
+        db.expire_all()
+
+        assert restore_game(db, game_id) is True
+
+        db.expire_all()
+        assert [scene.id for scene in SceneRepository(db).get_all_scenes_in_game(game_id)] == scene_ids
+        state = db.get(GameState, game_id)
+        assert (state.current_scene_id, state.token_usage) == (scene_ids[-1], 30)
+        assert db.get(GameArchive, game_id) is None
+        assert restore_game(db, game_id) is False
+
+    def test_read_path_restores_transparently(self, db, tmp_path):
+        """게임 조회 시 보관된 게임을 자동 복원, 목록은 복원 없이 마지막 씬 ID 표시"""
+        game_id = finished_game(db)
+        latest_scene_id = SceneRepository(db).get_latest_scene_ids([game_id])[game_id]
+        archive_games(db, older_than_days=30)
+        service = make_service(db, tmp_path)
+
+        listed = service.list_games(1)
+        assert listed["games"][0]["latest_scene_id"] == latest_scene_id
+        assert db.get(GameArchive, game_id) is not None
+
+        assert service.get_game_version(1, game_id) == latest_scene_id
+        result = service.get_game(1, game_id)
+
+        assert [s["content"] for s in result["sessions"]] == ["제목 세션 1", "제목 세션 2"]
+        assert db.get(GameArchive, game_id) is None
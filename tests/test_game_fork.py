@@ -0,0 +1,153 @@
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from application.container import get_game_service
+from application.game_archive import archive_games
+from application.game_transfer import export_games, import_games
+from core.auth_dependency import get_current_user
+from domain.entity.game import GAME_PHASE_SELECTION, Game, GameState, Scene, Session as GameSession
+from domain.repository.game_repository import SceneRepository
+from presentation.game_router import router
+from tests.helpers import EMOTION, SELECTION, FakeLLMService, make_service, play_game
+
+def history(db, game_id: int) -> list:
+    return [scene.dialogue for scene in SceneRepository(db).get_all_scenes_in_game(game_id)]
+
+
+def selection_scene_id(db, game_id: int) -> int:
+    return next(scene.id for scene in SceneRepository(db).get_all_scenes_in_game(game_id) if scene.type == "selection")
+
+
+class TestForkGame:
+    def test_fork_references_parent_history(self, db, tmp_path):
+        """분기 게임은 원본의 분기 지점 이전 씬을 공유하고 분기 지점 씬만 복사"""
+        parent_id = play_game(db)
+        scene_id = selection_scene_id(db, parent_id)
+
+        result = make_service(db, tmp_path).fork_game(1, parent_id, scene_id)
+
+        fork_id = result["game_id"]
+        assert (result["parent_game_id"], result["fork_scene_id"]) == (parent_id, scene_id)
+        assert history(db, fork_id) == ["1-1", None]
+        copied = result["sessions"][0]["scenes"][0]
+        assert copied["scene_id"] != scene_id and copied["selections"] == SELECTION
+        assert db.query(GameSession).filter(GameSession.game_id == fork_id).count() == 1
+        state = db.get(GameState, fork_id)
+        assert (state.phase, state.next_scene_number, state.next_session_number) == (GAME_PHASE_SELECTION, 3, 2)
+
+    def test_fork_cost_independent_of_history_length(self, db, engine, tmp_path):
+        """히스토리가 길어도 분기에 쓰는 쿼리 수는 같음"""
+        counts = []
+        for length in (2, 40):
+            game_id = play_game(db, sessions=([None] + [f"{n}" for n in range(length)],))
+            scene_id = selection_scene_id(db, game_id)
+            db.expunge_all()
+            statements = []
+            listener = lambda *args: statements.append(args[2])
+            event.listen(engine, "before_cursor_execute", listener)
+            make_service(db, tmp_path).fork_game(1, game_id, scene_id)
+            event.remove(engine, "before_cursor_execute", listener)
+            counts.append(len(statements))
+
+        assert counts[0] == counts[1]
+
+    def test_other_branch_keeps_parent_selection(self, db, tmp_path):
+        """분기 게임에서 다른 선택지를 골라도 원본의 선택은 그대로, LLM에는 공유 히스토리 전달"""
+        parent_id = play_game(db)
+        parent_scene_id = selection_scene_id(db, parent_id)
+        llm = FakeLLMService(({"role": "npc", "type": "dialogue", "dialogue": "다른 길"}, False, None))
+        service = make_service(db, tmp_path, llm)
+        fork = service.fork_game(1, parent_id, parent_scene_id)
+        session = fork["sessions"][0]
+
+        service.generate_scene_after_selection(
+            fork["game_id"], session["session_id"], session["scenes"][0]["scene_id"], 2, EMOTION, 30
+        )
+
+        assert llm.histories == [["1-1", None]]
+        assert history(db, fork["game_id"]) == ["1-1", None, "다른 길"]
+        assert db.get(Scene, parent_scene_id).selected_option == 1
+        assert history(db, parent_id) == ["1-1", None, "1-3", "2-1", "2-2"]
+
+    def test_nested_fork_from_inherited_scene(self, db, tmp_path):
+        """분기 게임에서 원본으로부터 물려받은 씬으로 다시 분기"""
+        parent_id = play_game(db)
+        service = make_service(db, tmp_path)
+        parent_scenes = SceneRepository(db).get_all_scenes_in_game(parent_id)
+        fork = service.fork_game(1, parent_id, parent_scenes[3].id)  # "2-1"
+
+        nested = service.fork_game(1, fork["game_id"], parent_scenes[1].id)
+
+        assert history(db, fork["game_id"]) == ["1-1", None, "1-3", "2-1"]
+        assert history(db, nested["game_id"]) == ["1-1", None]
+
+    def test_scene_outside_history_not_found(self, db, tmp_path):
+        """원본의 분기 지점 이후 씬이나 다른 게임의 씬으로는 분기할 수 없음"""
+        parent_id = play_game(db)
+        other_id = play_game(db)
+        service = make_service(db, tmp_path)
+        parent_scenes = SceneRepository(db).get_all_scenes_in_game(parent_id)
+        fork = service.fork_game(1, parent_id, parent_scenes[1].id)
+
+        for game_id, scene_id in [(fork["game_id"], parent_scenes[2].id), (parent_id, selection_scene_id(db, other_id))]:
+            with pytest.raises(HTTPException) as exc_info:
+                service.fork_game(1, game_id, scene_id)
+            assert exc_info.value.status_code == 404
+
+
+class TestForkReadAndStorage:
+    @pytest.fixture
+    def client(self, db, tmp_path):
+        app = FastAPI()
+        app.include_router(router)
+        app.dependency_overrides[get_game_service] = lambda: make_service(db, tmp_path)
+        app.dependency_overrides[get_current_user] = lambda: {"user_id": 1}
+        return TestClient(app)
+
+    def test_fork_endpoint_and_paginated_history(self, db, client):
+        """분기 API 응답 후 게임 조회는 물려받은 씬부터 페이지 단위로 반환"""
+        parent_id = play_game(db)
+        scene_id = SceneRepository(db).get_all_scenes_in_game(parent_id)[2].id  # "1-3"
+
+        fork = client.post(f"/api/v2/game/{parent_id}/fork", params={"from_scene_id": scene_id}).json()
+        first = client.get(f"/api/v2/game/{fork['game_id']}", params={"limit": 2}).json()
+        rest = client.get(
+            f"/api/v2/game/{fork['game_id']}", params={"after_scene_id": first["next_after_scene_id"]}
+        ).json()
+
+        assert first["parent_game_id"] == parent_id
+        assert [sc["dialogue"] for se in first["sessions"] for sc in se["scenes"]] == ["1-1", None]
+        assert [se["session_id"] for se in rest["sessions"]] == [fork["sessions"][0]["session_id"]]
+        assert [sc["dialogue"] for sc in rest["sessions"][0]["scenes"]] == ["1-3"]
+        assert rest["next_after_scene_id"] is None
+
+    def test_parent_with_forks_not_archived(self, db, tmp_path):
+        """분기 게임이 참조하는 원본은 보관하지 않음"""
+        parent_id = play_game(db, sessions=(["안녕", "끝"],))
+        plain_id = play_game(db, sessions=(["안녕", "끝"],))
+        make_service(db, tmp_path).fork_game(1, parent_id, SceneRepository(db).get_all_scenes_in_game(parent_id)[0].id)
+        db.query(GameState).update({GameState.updated_at: datetime.utcnow() - timedelta(days=60)})
+        db.commit()
+
+        report = archive_games(db, older_than_days=30)
+
+        assert report["archived"] == 1
+        assert db.query(GameSession).filter(GameSession.game_id == plain_id).count() == 0
+        assert history(db, parent_id) == ["안녕", "끝"]
+
+    def test_export_import_keeps_fork_references(self, db, tmp_path):
+        """가져온 분기 게임도 새 ID의 원본 히스토리를 참조"""
+        parent_id = play_game(db)
+        fork = make_service(db, tmp_path).fork_game(1, parent_id, selection_scene_id(db, parent_id))
+        path = str(tmp_path / "games.jsonl")
+        export_games(db, path, chunk_size=1)
+
+        import_games(db, path)
+
+        imported_fork = db.query(Game).filter(Game.parent_game_id.isnot(None), Game.id != fork["game_id"]).one()
+        assert imported_fork.parent_game_id != parent_id
+        assert history(db, imported_fork.id) == history(db, fork["game_id"]) == ["1-1", None]
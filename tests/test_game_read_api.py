@@ -0,0 +1,128 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from application.container import get_game_service
+from application.game_service import GameService
+from application.sprite_manifest import SpriteManifest
+from core.auth_dependency import get_current_user
+from core.database import Base
+from core.sql_instrumentation import QueryStatsMiddleware, instrument_engine
+from domain.repository.game_repository import (
+    CharacterRepository,
+    GameRepository,
+    SceneRepository,
+    SessionRepository,
+)
+from presentation.game_router import router
+
+
+@pytest.fixture
+def db(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'games.db'}")
+    instrument_engine(engine)
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+    yield db
+    db.close()
+    engine.dispose()
+
+
+@pytest.fixture
+def client(db, tmp_path):
+    app = FastAPI()
+    app.add_middleware(QueryStatsMiddleware)
+    app.include_router(router)
+    manifest = SpriteManifest(tmp_path / "sprites", "/api/v2/sprites")
+    app.dependency_overrides[get_game_service] = lambda: GameService(
+        db, bg_generator=object(), llm_service=object(), sprite_manifest=manifest
+    )
+    app.dependency_overrides[get_current_user] = lambda: {"user_id": 1}
+    return TestClient(app)
+
+
+def create_game(db, user_id: int = 1, scenes_per_session=(3, 2)) -> int:
+    character = CharacterRepository(db).get_character_by_id(1) or CharacterRepository(db).create_character("하나", "밝음")
+    game = GameRepository(db).create_game(user_id, "제목", "밝음", "로맨스", 10, character.id)
+    for session_number, count in enumerate(scenes_per_session, start=1):
+        session = SessionRepository(db).create_session(game.id, session_number, f"세션 {session_number}")
+        for scene_number in range(1, count + 1):
+            SceneRepository(db).create_scene(
+                session.id, scene_number, "npc", "dialogue", dialogue=f"{session_number}-{scene_number}"
+            )
+    return game.id
+
+
+def dialogues(body) -> list:
+    return [scene["dialogue"] for session in body["sessions"] for scene in session["scenes"]]
+
+
+class TestGetGame:
+    def test_scene_keyset_pagination(self, db, client):
+        """씬을 진행 순서대로 페이지 단위로 조회하고 세션 정보도 함께 반환"""
+        game_id = create_game(db)
+
+        first = client.get(f"/api/v2/game/{game_id}", params={"limit": 4}).json()
+        second = client.get(
+            f"/api/v2/game/{game_id}", params={"limit": 4, "after_scene_id": first["next_after_scene_id"]}
+        ).json()
+
+        assert dialogues(first) == ["1-1", "1-2", "1-3", "2-1"]
+        assert [session["content"] for session in first["sessions"]] == ["세션 1", "세션 2"]
+        assert dialogues(second) == ["2-2"]
+        assert second["next_after_scene_id"] is None
+        assert first["latest_scene_id"] == second["latest_scene_id"]
+
+    def test_query_count_independent_of_history_length(self, db, client):
+        """세션/씬 수가 늘어도 쿼리 수는 그대로 (지연 로딩 없음)"""
+        short_game = create_game(db, scenes_per_session=(1,))
+        long_game = create_game(db, scenes_per_session=(5, 5, 5, 5))
+
+        short = client.get(f"/api/v2/game/{short_game}")
+        long = client.get(f"/api/v2/game/{long_game}")
+
+        assert len(dialogues(long.json())) == 20
+        assert long.headers["x-db-query-count"] == short.headers["x-db-query-count"]
+
+    def test_not_modified_until_new_scene(self, db, client):
+        """가장 최근 씬이 그대로면 304, 새 씬이 생기면 새 ETag로 200"""
+        game_id = create_game(db)
+        etag = client.get(f"/api/v2/game/{game_id}").headers["etag"]
+
+        not_modified = client.get(f"/api/v2/game/{game_id}", headers={"If-None-Match": etag})
+        latest_session = SessionRepository(db).get_latest_session(game_id)
+        SceneRepository(db).create_scene(latest_session.id, 3, "npc", "dialogue", dialogue="2-3")
+        modified = client.get(f"/api/v2/game/{game_id}", headers={"If-None-Match": etag})
+
+        assert etag.startswith('W/"')
+        assert not_modified.status_code == 304
+        assert modified.status_code == 200
+        assert modified.headers["etag"] != etag
+
+    def test_other_users_game_not_found(self, db, client):
+        game_id = create_game(db, user_id=2)
+
+        assert client.get(f"/api/v2/game/{game_id}").status_code == 404
+
+
+class TestListGames:
+    def test_keyset_pagination_newest_first(self, db, client):
+        """최신 게임부터 페이지 단위로 조회하고 다른 사용자 게임은 제외"""
+        game_ids = [create_game(db) for _ in range(3)]
+        create_game(db, user_id=2)
+
+        first = client.get("/api/v2/games", params={"limit": 2}).json()
+        second = client.get("/api/v2/games", params={"limit": 2, "before_id": first["next_before_id"]}).json()
+
+        assert [game["game_id"] for game in first["games"]] == [game_ids[2], game_ids[1]]
+        assert [game["game_id"] for game in second["games"]] == [game_ids[0]]
+        assert second["next_before_id"] is None
+        assert first["games"][0]["latest_scene_id"] is not None
+
+    def test_not_modified(self, db, client):
+        create_game(db)
+        etag = client.get("/api/v2/games").headers["etag"]
+
+        assert client.get("/api/v2/games", headers={"If-None-Match": etag}).status_code == 304
@@ -0,0 +1,75 @@
+from sqlalchemy import event
+
+from domain.entity.game import GAME_PHASE_DIALOGUE, GAME_PHASE_SELECTION, GameState
+from domain.repository.game_repository import GameStateRepository, SceneRepository
+from tests.helpers import EMOTION, FakeLLMService, dialogue, make_service, play_game
+
+
+def create_game(db, with_state: bool = True):
+    """씬 하나인 게임 (game_id, session_id, scene_id)"""
+    game_id = play_game(db, sessions=(["안녕"],), with_state=with_state)
+    scene = SceneRepository(db).get_all_scenes_in_game(game_id)[-1]
+    return game_id, scene.session_id, scene.id
+
+
+class TestGameState:
+    def test_first_scene_creates_state(self, db):
+        """첫 씬과 같은 트랜잭션에서 상태 행 생성"""
+        game_id, session_id, scene_id = create_game(db)
+
+        state = GameStateRepository(db).get_state(game_id)
+
+        assert (state.current_session_id, state.current_scene_id) == (session_id, scene_id)
+        assert (state.next_session_number, state.next_scene_number) == (2, 2)
+        assert state.phase == GAME_PHASE_DIALOGUE
+
+    def test_state_loaded_in_single_query(self, db, engine):
+        """상태 조회 한 번으로 게임과 현재 세션까지 로드"""
+        game_id, _, _ = create_game(db)
+        db.expunge_all()
+        statements = []
+        event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+        state = GameStateRepository(db).get_state(game_id)
+
+        assert (state.game.title, state.current_session.content) == ("제목", "제목 세션 1")
+        assert len(statements) == 1
+
+    def test_turns_advance_state(self, db, tmp_path):
+        """씬이 생길 때마다 현재 위치, 다음 번호, 단계, 감정, 토큰 사용량 갱신"""
+        game_id, session_id, scene_id = create_game(db)
+        selection = {"role": "user", "type": "selection", "selections": {"1": "응", "2": "아니"}}
+        service = make_service(
+            db,
+            tmp_path,
+            FakeLLMService((selection, False, None), (dialogue("좋아"), True, "운동장. 맑음"), token_usage=100),
+        )
+
+        first = service.generate_next_scene(game_id, session_id, scene_id, EMOTION, 30)
+        state = GameStateRepository(db).get_state(game_id)
+        assert state.phase == GAME_PHASE_SELECTION
+        assert state.next_scene_number == 3
+        assert state.last_emotion == "happy"
+
+        second = service.generate_scene_after_selection(
+            game_id, session_id, first["scenes"][0]["scene_id"], 1, EMOTION, 60
+        )
+        db.expire_all()
+        state = db.get(GameState, game_id)
+
+        assert second["session_id"] == state.current_session_id != session_id
+        assert state.current_scene_id == second["scenes"][0]["scene_id"]
+        assert (state.next_session_number, state.next_scene_number) == (3, 2)
+        assert state.phase == GAME_PHASE_DIALOGUE
+        assert state.token_usage == 200
+
+    def test_missing_state_rebuilt(self, db, tmp_path):
+        """상태 행이 없는 기존 게임은 세션/씬에서 다시 계산"""
+        game_id, session_id, scene_id = create_game(db, with_state=False)
+        service = make_service(db, tmp_path, FakeLLMService((dialogue("다음"), False, None)))
+
+        result = service.generate_next_scene(game_id, session_id, scene_id, EMOTION, 30)
+
+        state = GameStateRepository(db).get_state(game_id)
+        assert state.current_scene_id == result["scenes"][0]["scene_id"]
+        assert state.next_scene_number == 3
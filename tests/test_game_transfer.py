@@ -0,0 +1,184 @@
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from application.game_archive import archive_games
+from application.game_transfer import export_games, find_checkpoint, import_games
+from core.database import Base
+from domain.entity.game import GAME_PHASE_ENDED, Game, GameState, Scene, Session as GameSession
+from domain.repository.game_repository import (
+    CharacterRepository,
+    GameRepository,
+    SceneRepository,
+    SessionRepository,
+)
+from tests.helpers import play_game
+
+
+def make_db(path):
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+    CharacterRepository(db).create_character("하나", "밝음")
+    return engine, db
+
+
+@pytest.fixture
+def source(tmp_path):
+    engine, db = make_db(tmp_path / "source.db")
+    yield db
+    db.close()
+    engine.dispose()
+
+
+@pytest.fixture
+def target(tmp_path):
+    engine, db = make_db(tmp_path / "target.db")
+    yield db
+    db.close()
+    engine.dispose()
+
+
+def finished_game(db, title: str, user_id: int = 1) -> int:
+    """세션 2개, 씬 3개인 끝난 게임"""
+    return play_game(db, sessions=(["안녕", "반가워"], ["끝"]), title=title, user_id=user_id, days_ago=60)
+
+
+def history(db):
+    """제목별 (세션 내용, 씬 대사) 목록 - ID와 무관하게 비교"""
+    result = {}
+    for game in db.query(Game).order_by(Game.id):
+        scenes = SceneRepository(db).get_all_scenes_in_game(game.id)
+        sessions = SessionRepository(db).get_sessions_by_game(game.id)
+        result[game.title] = ([s.content for s in sessions], [s.dialogue for s in scenes])
+    return result
+
+
+class TestExportImport:
+    def test_round_trip_remaps_ids(self, source, target, tmp_path):
+        """가져온 게임은 새 ID를 받고 세션/씬 참조도 새 ID를 따라감"""
+        for title in ["A", "B", "C"]:
+            finished_game(source, title)
+        finished_game(target, "기존")
+        path = str(tmp_path / "games.jsonl")
+
+        exported = export_games(source, path, chunk_size=2, yield_per=2)
+        imported = import_games(target, path, batch_size=2)
+
+        assert (exported["games"], exported["sessions"], exported["scenes"]) == (3, 6, 9)
+        assert (imported["games"], imported["sessions"], imported["scenes"], imported["checkpoints"]) == (3, 6, 9, 2)
+        assert history(target) == {"기존": history(target)["기존"], **history(source)}
+        for session in target.query(GameSession):
+            assert session.game.title in session.content
+
+    def test_builds_game_states(self, source, target, tmp_path):
+        """가져온 게임마다 마지막 세션/씬 기준 진행 상태를 같은 트랜잭션에서 저장"""
+        for title in ["A", "B", "C"]:
+            finished_game(source, title)
+        path = str(tmp_path / "games.jsonl")
+
+        export_games(source, path, chunk_size=2)
+        import_games(target, path)
+
+        states = target.query(GameState).all()
+        assert len(states) == 3
+        for state in states:
+            game = target.get(Game, state.game_id)
+            last_scene = SceneRepository(target).get_all_scenes_in_game(game.id)[-1]
+            assert state.current_scene_id == last_scene.id
+            assert state.current_session_id == last_scene.session_id
+            assert (state.next_session_number, state.next_scene_number) == (3, 2)
+            assert state.phase == GAME_PHASE_ENDED
+            assert state.main_character_id == game.main_character_id
+
+    def test_includes_archived_games(self, source, target, tmp_path):
+        """보관된 게임도 세션/씬을 풀어서 내보냄"""
+        finished_game(source, "A")
+        expected = history(source)
+        archive_games(source, older_than_days=30)
+        path = str(tmp_path / "games.jsonl")
+
+        export_games(source, path)
+        import_games(target, path, user_id=7)
+
+        assert history(target) == expected
+        assert target.query(Game).one().user_id == 7
+
+    def test_resume_export_and_import(self, source, target, tmp_path):
+        """중단된 줄은 버리고 마지막 체크포인트부터 이어서 진행"""
+        for title in ["A", "B", "C"]:
+            finished_game(source, title)
+        path = str(tmp_path / "games.jsonl")
+        state_path = str(tmp_path / "state.json")
+
+        export_games(source, path, chunk_size=1, max_games=2)
+        with open(path, "a", encoding="utf-8") as f:
+            f.write('{"table":"games","row":{"id":3,')  # 중단된 쓰기
+        assert find_checkpoint(path)[1] == 2
+        first = import_games(target, path, state_path=state_path)
+
+        export_games(source, path, resume=True, chunk_size=1)
+        second = import_games(target, path, state_path=state_path)
+
+        assert (first["games"], second["games"]) == (2, 1)
+        assert history(target) == history(source)
+        assert target.query(Scene).count() == 9
+
+    def test_resume_after_live_inserts(self, source, target, tmp_path):
+        """체크포인트와 재개 사이에 다른 게임이 추가되어도 새 ID가 겹치지 않음"""
+        for title in ["A", "B", "C"]:
+            finished_game(source, title)
+        path = str(tmp_path / "games.jsonl")
+        state_path = str(tmp_path / "state.json")
+        export_games(source, path, chunk_size=1, max_games=2)
+        import_games(target, path, state_path=state_path)
+
+        finished_game(target, "새 게임")
+        export_games(source, path, resume=True, chunk_size=1)
+        import_games(target, path, state_path=state_path)
+
+        expected = history(source)
+        assert {title: value for title, value in history(target).items() if title != "새 게임"} == expected
+        assert target.query(Game).count() == 4
+
+
+class TestForkReferences:
+    def fork(self, db, game_id: int, scene_index: int) -> int:
+        scene = SceneRepository(db).get_all_scenes_in_game(game_id)[scene_index]
+        games = GameRepository(db)
+        return games.create_fork(games.get_game_by_id(game_id), scene).game_id
+
+    def test_fork_in_same_chunk_points_to_imported_scene(self, source, target, tmp_path):
+        """원본과 같은 묶음의 분기 게임도 새 원본/분기 지점 씬을 가리킴"""
+        finished_game(target, "기존")
+        parent_id = finished_game(source, "원본")
+        fork_id = self.fork(source, parent_id, 1)
+        path = str(tmp_path / "games.jsonl")
+
+        export_games(source, path, chunk_size=10)
+        import_games(target, path)
+
+        source_fork = source.get(Game, fork_id)
+        fork = target.query(Game).filter(Game.parent_game_id.isnot(None)).one()
+        parent = target.get(Game, fork.parent_game_id)
+        fork_scene = target.get(Scene, fork.fork_scene_id)
+        assert parent.title == "원본" and parent.id != parent_id
+        assert fork_scene.session.game_id == parent.id
+        assert fork_scene.dialogue == source.get(Scene, source_fork.fork_scene_id).dialogue
+        assert [scene.dialogue for scene in SceneRepository(target).get_all_scenes_in_game(fork.id)] == [
+            scene.dialogue for scene in SceneRepository(source).get_all_scenes_in_game(fork_id)
+        ]
+
+    def test_fork_without_exported_parent_is_detached(self, source, target, tmp_path):
+        """원본 게임이 내보내기에 없으면 원본 참조를 비움"""
+        parent_id = finished_game(source, "원본", user_id=2)
+        self.fork(source, parent_id, 1)
+        source.query(Game).filter(Game.id != parent_id).update({Game.user_id: 1})
+        source.commit()
+        path = str(tmp_path / "games.jsonl")
+
+        export_games(source, path, user_id=1)
+        import_games(target, path)
+
+        fork = target.query(Game).one()
+        assert (fork.parent_game_id, fork.fork_scene_id) == (None, None)
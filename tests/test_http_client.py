@@ -0,0 +1,52 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from core.config import Settings
+from core.http_client import PooledHttpClient
+from core.metrics import metrics
+
+
+class KeepAliveHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        body = b'{"ok": true}'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def server_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), KeepAliveHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+
+
+class TestPooledHttpClient:
+    def test_connection_reuse(self, server_url):
+        """같은 호스트로의 연속 요청은 하나의 연결을 재사용"""
+        metrics.reset()
+        client = PooledHttpClient(Settings())
+        try:
+            for _ in range(3):
+                response = client.post(f"{server_url}/generate", json={"prompt": "park"})
+                assert response.json() == {"ok": True}
+        finally:
+            client.close()
+
+        snapshot = metrics.snapshot()
+        assert snapshot["counters"]["http_request_total"] == 3
+        assert snapshot["counters"]["http_new_connection_total"] == 1
+        assert snapshot["ratios"]["http_connection_reuse_rate"] == pytest.approx(2 / 3)
+        assert snapshot["observations"]["http_handshake_seconds"]["count"] == 1
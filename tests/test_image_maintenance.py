@@ -0,0 +1,176 @@
+from datetime import datetime, timedelta
+
+from application.game_archive import archive_games, restore_game
+from application.image_index import ImageIndex
+from application.image_maintenance import dedupe_images, evict_images
+from core.storage import LocalImageStorage
+from domain.entity.game import Session as GameSession
+from domain.repository.game_repository import SessionRepository
+from domain.repository.image_repository import ImageRepository
+from tests.helpers import play_game
+
+
+def add_image(db, storage, index, name: str, days_ago: int) -> str:
+    digest = name * 64
+    storage.put(f"{digest}.png", b"x" * 100, "image/png")
+    storage.put(f"{digest}_w640.webp", b"y" * 10, "image/webp")
+    index.add(digest, f"{digest}.png", f"keyword {name}")
+    ImageRepository(db).record_image(digest, f"{digest}.png", f"keyword {name}", 16, 9, 100)
+    image = ImageRepository(db).get_image(digest)
+    image.last_used_at = datetime.utcnow() - timedelta(days=days_ago)
+    db.commit()
+    return digest
+
+
+def archive_game_using(db, digest: str) -> None:
+    """digest를 배경으로 쓰는 게임을 보관하고 참조 수는 어긋난 상태(0)로 만듦"""
+    game_id = play_game(db, sessions=(["안녕", "끝"],), days_ago=60)
+    db.query(GameSession).filter(GameSession.game_id == game_id).update(
+        {GameSession.background_url: f"/static/generated_images/{digest}.png"}
+    )
+    db.commit()
+    assert archive_games(db, older_than_days=30)["archived"] == 1
+    ImageRepository(db).get_image(digest).reference_count = 0
+    db.commit()
+
+
+class TestImageEviction:
+    def test_create_session_increments_reference_count(self, db):
+        """세션 생성 시 배경 이미지 참조 수 증가"""
+        ImageRepository(db).record_image("a" * 64, f"{'a' * 64}.png", "park", 16, 9, 100)
+
+        SessionRepository(db).create_session(
+            game_id=1, session_number=1, content="공원", background_url=f"/static/generated_images/{'a' * 64}.png"
+        )
+
+        assert ImageRepository(db).get_image("a" * 64).reference_count == 1
+
+    def test_evicts_unreferenced_lru_first(self, db, tmp_path):
+        """참조되지 않은 이미지를 오래된 순으로 삭제하고 세션이 쓰는 이미지는 유지"""
+        storage = LocalImageStorage(tmp_path / "images", "/static/generated_images")
+        index = ImageIndex(storage)
+        oldest = add_image(db, storage, index, "a", days_ago=30)
+        old = add_image(db, storage, index, "b", days_ago=20)
+        recent = add_image(db, storage, index, "c", days_ago=1)
+        referenced = add_image(db, storage, index, "d", days_ago=40)
+        SessionRepository(db).create_session(
+            game_id=1, session_number=1, content="공원", background_url=f"/static/generated_images/{referenced}.png"
+        )
+
+        report = evict_images(db, storage, index, quota_bytes=250)
+
+        assert report["evicted"] == 2
+        assert ImageRepository(db).get_image(oldest) is None
+        assert ImageRepository(db).get_image(old) is None
+        assert ImageRepository(db).get_image(recent) is not None
+        assert ImageRepository(db).get_image(referenced) is not None
+        assert not storage.exists(f"{oldest}.png")
+        assert not storage.exists(f"{oldest}_w640.webp")
+        assert storage.exists(f"{referenced}.png")
+        assert index.find("keyword a") is None
+        assert index.find("keyword d") == f"{referenced}.png"
+
+    def test_keeps_background_of_archived_game(self, db, tmp_path):
+        """세션 행이 없는 보관된 게임의 배경도 참조로 보고 유지"""
+        storage = LocalImageStorage(tmp_path / "images", "/static/generated_images")
+        index = ImageIndex(storage)
+        archived = add_image(db, storage, index, "a", days_ago=30)
+        archive_game_using(db, archived)
+
+        report = evict_images(db, storage, index, quota_bytes=0)
+
+        assert (report["evicted"], report["skipped_referenced"]) == (0, 1)
+        assert storage.exists(f"{archived}.png")
+        assert ImageRepository(db).get_image(archived).reference_count == 1
+
+    def test_keeps_image_picked_during_eviction(self, db, tmp_path):
+        """인덱스에서 뺀 뒤 다시 확인할 때 참조가 생겼으면 파일과 인덱스 항목을 되돌림"""
+        storage = LocalImageStorage(tmp_path / "images", "/static/generated_images")
+
+        class PickedDuringEviction(ImageIndex):
+            def remove(self, digest):
+                entry = super().remove(digest)
+                SessionRepository(db).create_session(
+                    game_id=1, session_number=1, content="공원", background_url=f"/static/generated_images/{digest}.png"
+                )
+                return entry
+
+        index = PickedDuringEviction(storage)
+        picked = add_image(db, storage, index, "a", days_ago=30)
+
+        report = evict_images(db, storage, index, quota_bytes=0)
+
+        assert (report["evicted"], report["skipped_referenced"]) == (0, 1)
+        assert storage.exists(f"{picked}.png")
+        assert index.find("keyword a") == f"{picked}.png"
+
+    def test_reference_count_follows_archive_and_restore(self, db):
+        """게임을 보관하면 세션 수만큼 참조 수가 줄고 복원하면 다시 늘어남"""
+        digest = "a" * 64
+        ImageRepository(db).record_image(digest, f"{digest}.png", "park", 16, 9, 100)
+        game_id = play_game(db, sessions=(["안녕"], ["끝"]), days_ago=60)
+        for session in db.query(GameSession).filter(GameSession.game_id == game_id):
+            session.background_url = f"/static/generated_images/{digest}.png"
+        ImageRepository(db).get_image(digest).reference_count = 2
+        db.commit()
+
+        archive_games(db, older_than_days=30)
+        db.expire_all()
+        assert ImageRepository(db).get_image(digest).reference_count == 0
+
+        assert restore_game(db, game_id)
+        db.expire_all()
+        assert ImageRepository(db).get_image(digest).reference_count == 2
+
+
+class TestImageDedup:
+    def test_merges_near_duplicates_into_canonical(self, db, tmp_path):
+        """유사 이미지의 키워드를 대표 이미지로 합치고 나머지 파일 삭제"""
+        storage = LocalImageStorage(tmp_path / "images", "/static/generated_images")
+        index = ImageIndex(storage)
+        canonical = add_image(db, storage, index, "a", days_ago=3)
+        duplicate = add_image(db, storage, index, "b", days_ago=2)
+        referenced = add_image(db, storage, index, "c", days_ago=1)
+        distinct = add_image(db, storage, index, "d", days_ago=1)
+        index.set_dhashes({
+            canonical: "0000000000000000",
+            duplicate: "0000000000000001",
+            referenced: "0000000000000003",
+            distinct: "ffffffffffffffff",
+        })
+        SessionRepository(db).create_session(
+            game_id=1, session_number=1, content="공원", background_url=f"/static/generated_images/{referenced}.png"
+        )
+
+        report = dedupe_images(db, storage, index, max_distance=2)
+
+        assert report["clusters"] == 1
+        assert report["merged"] == 2
+        assert report["deleted"] == 2
+        # 세션이 참조하는 이미지가 대표로 선택됨
+        assert index.find("keyword a") == f"{referenced}.png"
+        assert index.find("keyword b") == f"{referenced}.png"
+        assert index.find("keyword d") == f"{distinct}.png"
+        assert storage.exists(f"{referenced}.png")
+        assert not storage.exists(f"{duplicate}.png")
+        assert not storage.exists(f"{canonical}_w640.webp")
+        assert ImageRepository(db).get_image(duplicate) is None
+
+    def test_keeps_duplicates_still_referenced(self, db, tmp_path):
+        """참조 수가 남았거나 보관된 게임이 쓰는 유사 이미지는 인덱스에서만 빼고 파일은 유지"""
+        storage = LocalImageStorage(tmp_path / "images", "/static/generated_images")
+        index = ImageIndex(storage)
+        canonical = add_image(db, storage, index, "a", days_ago=3)
+        counted = add_image(db, storage, index, "b", days_ago=2)
+        archived = add_image(db, storage, index, "c", days_ago=1)
+        index.set_dhashes({canonical: "0000000000000000", counted: "0000000000000001", archived: "0000000000000002"})
+        archive_game_using(db, archived)
+        ImageRepository(db).get_image(canonical).reference_count = 2
+        ImageRepository(db).get_image(counted).reference_count = 1
+        db.commit()
+
+        report = dedupe_images(db, storage, index, max_distance=2)
+
+        assert (report["merged"], report["deleted"], report["kept_referenced"]) == (2, 0, 2)
+        assert index.find("keyword c") == f"{canonical}.png"
+        assert storage.exists(f"{counted}.png") and storage.exists(f"{archived}.png")
@@ -0,0 +1,86 @@
+import base64
+import io
+from concurrent.futures import Future, TimeoutError
+
+import pytest
+from PIL import Image
+
+from application.image_processing import ImageProcessor, decode_base64_into_buffer, process_background_image
+
+
+def make_png_base64(width: int, height: int) -> str:
+    buffer = io.BytesIO()
+    Image.new("RGB", (width, height), (120, 180, 240)).save(buffer, "PNG")
+    return base64.b64encode(buffer.getvalue()).decode("ascii")
+
+
+class TestDecodeBase64:
+    @pytest.mark.parametrize("size", [0, 1, 2, 3, 100, 200_001])
+    def test_matches_b64decode(self, size):
+        """조각 단위 디코딩 결과가 base64.b64decode와 동일"""
+        raw = bytes(range(256)) * (size // 256) + bytes(range(size % 256))
+        encoded = base64.b64encode(raw).decode("ascii")
+
+        assert decode_base64_into_buffer(encoded).getvalue() == raw
+
+
+class TestProcessBackgroundImage:
+    def test_crops_to_16_9(self):
+        """정사각형 이미지는 16:9로 중앙 크롭"""
+        result = process_background_image(make_png_base64(1024, 1024), max_pixels=10_000_000, measure_memory=True)
+
+        assert (result.width, result.height) == (1024, 576)
+        assert Image.open(io.BytesIO(result.png_bytes)).size == (1024, 576)
+        assert result.cpu_seconds >= 0
+        assert result.peak_memory_bytes > 1024 * 1024 * 3
+
+    def test_skips_memory_measurement_by_default(self):
+        """측정 대상이 아니면 tracemalloc을 켜지 않음"""
+        result = process_background_image(make_png_base64(160, 90), max_pixels=10_000_000)
+
+        assert result.peak_memory_bytes is None
+
+    def test_rejects_too_many_pixels(self):
+        """최대 픽셀 수를 넘으면 거부"""
+        with pytest.raises(ValueError):
+            process_background_image(make_png_base64(200, 200), max_pixels=100 * 100)
+
+
+class TestImageProcessor:
+    def test_process_in_pool(self):
+        """프로세스 풀에서 처리"""
+        processor = ImageProcessor(max_workers=1, queue_size=1, max_pixels=10_000_000, timeout=30)
+        try:
+            result = processor.process(make_png_base64(1600, 900))
+        finally:
+            processor.shutdown()
+
+        assert (result.width, result.height) == (1600, 900)
+
+    def test_timed_out_job_keeps_its_slot(self):
+        """제한 시간을 넘긴 작업도 워커에서 끝날 때까지 슬롯을 차지"""
+
+        class PendingExecutor:
+            def __init__(self):
+                self.futures = []
+
+            def submit(self, *args):
+                self.futures.append(Future())
+                return self.futures[-1]
+
+            def shutdown(self, **kwargs):
+                pass
+
+        processor = ImageProcessor(max_workers=1, queue_size=0, max_pixels=10_000_000, timeout=0.05)
+        processor.shutdown()
+        executor = processor._ImageProcessor__executor = PendingExecutor()
+
+        with pytest.raises(TimeoutError):
+            processor.process("")
+        with pytest.raises(RuntimeError):
+            processor.process("")
+
+        executor.futures[0].set_exception(ValueError("done"))
+        with pytest.raises(TimeoutError):
+            processor.process("")
+        assert len(executor.futures) == 2
@@ -0,0 +1,61 @@
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from application.keyword_cache import KeywordCache, normalize_story
+from core.database import Base
+from core.metrics import metrics
+
+
+@pytest.fixture
+def session_factory(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'cache.db'}")
+    Base.metadata.create_all(bind=engine)
+    yield sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    engine.dispose()
+
+
+class TestKeywordCache:
+    def test_normalize_story(self):
+        """공백, 대소문자, 끝 문장부호 차이는 무시"""
+        assert normalize_story("  학교 옥상.  시원한 바람이 부는   점심시간. ") == normalize_story(
+            "학교 옥상. 시원한 바람이 부는 점심시간"
+        )
+
+    def test_memory_hit(self):
+        """메모리 LRU 적중"""
+        metrics.reset()
+        cache = KeywordCache(None, max_size=10, ttl_seconds=60)
+        assert cache.get("도서관. 조용한 분위기") is None
+
+        cache.set("도서관. 조용한 분위기", "quiet library")
+
+        assert cache.get("도서관.  조용한 분위기.") == "quiet library"
+        assert metrics.snapshot()["ratios"]["keyword_cache_hit_rate"] == 0.5
+
+    def test_lru_eviction(self):
+        """최대 크기를 넘으면 가장 오래 쓰지 않은 항목 제거"""
+        cache = KeywordCache(None, max_size=2, ttl_seconds=60)
+        cache.set("a", "1")
+        cache.set("b", "2")
+        cache.get("a")
+        cache.set("c", "3")
+
+        assert cache.get("a") == "1"
+        assert cache.get("b") is None
+        assert cache.get("c") == "3"
+
+    def test_ttl_expiry(self):
+        """TTL이 지나면 미스"""
+        cache = KeywordCache(None, max_size=10, ttl_seconds=0)
+        cache.set("a", "1")
+
+        assert cache.get("a") is None
+
+    def test_persistent_backing(self, session_factory):
+        """DB에 저장되어 다른 워커(새 인스턴스)에서도 적중"""
+        KeywordCache(session_factory, max_size=10, ttl_seconds=60).set("공원. 밤", "night park")
+
+        other_worker = KeywordCache(session_factory, max_size=10, ttl_seconds=60)
+
+        assert other_worker.get("공원. 밤") == "night park"
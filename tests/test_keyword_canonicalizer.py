@@ -0,0 +1,82 @@
+import pytest
+
+from application.image_index import ImageIndex
+from application.keyword_canonicalizer import canonical_key, canonicalize_keyword, with_facet
+from core.metrics import metrics
+from core.storage import LocalImageStorage
+
+
+class TestCanonicalizeKeyword:
+    def test_word_order_and_synonyms(self):
+        """단어 순서, 동의어, 대소문자가 달라도 같은 키"""
+        expected = canonical_key("rainy school corridor")
+
+        assert canonical_key("school corridor rainy") == expected
+        assert canonical_key("Rainy School Hallway") == expected
+        assert canonical_key("rainy_school_corridor") == expected
+        assert canonical_key("the school corridor in the rain") == expected
+
+    def test_facets(self):
+        """날씨/시간대는 facet으로 분리"""
+        keyword = canonicalize_keyword("evening park with clouds")
+
+        assert keyword.place == ("park",)
+        assert keyword.weather == "cloudy"
+        assert keyword.time_of_day == "sunset"
+
+    def test_different_facets_do_not_match(self):
+        """날씨나 시간대가 다르면 다른 키"""
+        assert canonical_key("rainy park") != canonical_key("sunny park")
+        assert canonical_key("night park") != canonical_key("park")
+
+    @pytest.mark.parametrize(
+        "first, second",
+        [
+            ("inside school", "outside school"),
+            ("school", "school view"),
+            ("school hall", "school corridor"),
+            ("bathroom shower", "rainy bathroom"),
+            ("bright classroom", "sunny classroom"),
+            ("clear lake", "sunny lake"),
+        ],
+    )
+    def test_distinct_scenes_do_not_collide(self, first, second):
+        """장면을 바꾸는 단어나 장소로도 쓰이는 단어는 지우거나 합치지 않음"""
+        assert canonical_key(first) != canonical_key(second)
+
+    def test_place_words_stay_places(self):
+        """hall, shower는 복도/비가 아니라 장소 토큰으로 남음"""
+        assert canonical_key("school hall") == "hall_school||"
+        assert canonical_key("bathroom shower") == "bathroom_shower||"
+
+
+class TestWithFacet:
+    def test_replaces_same_kind_facet(self):
+        """같은 종류 facet만 교체하고 다른 facet은 유지"""
+        assert with_facet("sunny school rooftop", "rainy") == "rainy school rooftop"
+        assert with_facet("rainy park dusk", "night") == "night rainy park"
+        assert canonical_key(with_facet("Rainy park at Dusk", "night")) == canonical_key("rainy night park")
+
+    def test_unknown_facet(self):
+        """날씨/시간대가 아닌 facet은 거부"""
+        with pytest.raises(ValueError):
+            with_facet("park", "crowded")
+
+
+class TestImageIndexCanonicalLookup:
+    def test_canonical_hit(self, tmp_path):
+        """정규화 키로 기존 이미지 재사용 및 적중률 집계"""
+        metrics.reset()
+        storage = LocalImageStorage(tmp_path, "/static")
+        (tmp_path / "sunny_classroom_20251114_153045.png").write_bytes(b"legacy")
+        index = ImageIndex(storage)
+        index.add("c" * 64, f"{'c' * 64}.png", "rainy school corridor")
+
+        assert index.find("rainy school corridor") == f"{'c' * 64}.png"
+        assert index.find("school hallway rainy") == f"{'c' * 64}.png"
+        assert index.find("classroom sunny") == "sunny_classroom_20251114_153045.png"
+        assert index.find("snowy street") is None
+
+        ratios = metrics.snapshot()["ratios"]
+        assert ratios["background_lookup_exact_hit_rate"] == 0.25
+        assert ratios["background_lookup_hit_rate"] == 0.75
@@ -0,0 +1,41 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from core.config import get_settings
+from presentation.metrics_router import router
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.include_router(router)
+    return TestClient(app)
+
+
+@pytest.fixture
+def metrics_token(monkeypatch):
+    def configure(token: str):
+        monkeypatch.setenv("METRICS_TOKEN", token)
+        get_settings.cache_clear()
+
+    yield configure
+    get_settings.cache_clear()
+
+
+class TestMetricsEndpoint:
+    def test_requires_metrics_token(self, client, metrics_token):
+        """METRICS_TOKEN과 같은 Bearer 토큰만 조회 가능"""
+        metrics_token("secret")
+
+        assert client.get("/api/v2/metrics").status_code == 401
+        assert client.get("/api/v2/metrics", headers={"Authorization": "Bearer wrong"}).status_code == 401
+        response = client.get("/api/v2/metrics", headers={"Authorization": "Bearer secret"})
+        assert response.status_code == 200
+        assert "counters" in response.json()
+
+    def test_disabled_without_token(self, client, metrics_token):
+        """토큰이 설정되지 않았으면 엔드포인트를 숨김"""
+        metrics_token("")
+
+        assert client.get("/api/v2/metrics", headers={"Authorization": "Bearer "}).status_code == 404
@@ -0,0 +1,64 @@
+import io
+
+from PIL import Image, ImageDraw
+
+from application.perceptual_hash import cluster_near_duplicates, dhash, find_nearest, hamming_distances, pack_hashes
+
+
+def make_scene(width: int, height: int, horizon: float) -> Image.Image:
+    image = Image.new("RGB", (width, height), (90, 150, 230))
+    draw = ImageDraw.Draw(image)
+    draw.rectangle((0, int(height * horizon), width, height), fill=(60, 120, 50))
+    draw.ellipse((width // 8, height // 8, width // 4, height // 4), fill=(250, 230, 120))
+    return image
+
+
+class TestDhash:
+    def test_resized_and_recompressed_image_is_close(self):
+        """크기와 압축만 다른 이미지는 해밍 거리가 작음"""
+        original = make_scene(1600, 900, 0.6)
+        buffer = io.BytesIO()
+        original.resize((800, 450)).save(buffer, "JPEG", quality=60)
+        recompressed = Image.open(io.BytesIO(buffer.getvalue()))
+
+        packed = pack_hashes([dhash(original)])
+
+        assert hamming_distances(packed, pack_hashes([dhash(recompressed)])[0])[0] <= 4
+
+    def test_different_scene_is_far(self):
+        """구도가 다른 이미지는 해밍 거리가 큼"""
+        packed = pack_hashes([dhash(make_scene(1600, 900, 0.6))])
+        flipped = make_scene(1600, 900, 0.3).transpose(Image.FLIP_LEFT_RIGHT)
+
+        assert hamming_distances(packed, pack_hashes([dhash(flipped)])[0])[0] > 10
+
+
+class TestClustering:
+    def test_find_nearest_within_distance(self):
+        """거리 이내에서 가장 가까운 해시 선택"""
+        hashes = ["ffffffffffffffff", "0000000000000003", "000000000000000f"]
+
+        assert find_nearest(hashes, "0000000000000001", max_distance=2) == (1, 1)
+        assert find_nearest(hashes, "00000000ff000000", max_distance=2) is None
+        assert find_nearest(hashes, "0000000000000003", max_distance=-1) is None
+
+    def test_clusters_around_representative(self):
+        """A~B, B~C여도 대표 A와 먼 C는 같은 묶음에 넣지 않음, 먼 이미지는 제외"""
+        hashes = {
+            "a": "0000000000000000",
+            "b": "0000000000000007",
+            "c": "000000000000003f",
+            "d": "ffffffffffffffff",
+        }
+
+        assert cluster_near_duplicates(hashes, max_distance=3) == [["a", "b"]]
+
+    def test_priority_picks_representative(self):
+        """우선순위가 높은 이미지가 대표가 되고 대표와 가까운 이미지만 묶임"""
+        hashes = {
+            "a": "0000000000000000",
+            "b": "0000000000000007",
+            "c": "000000000000003f",
+        }
+
+        assert cluster_near_duplicates(hashes, max_distance=3, priority=["b"]) == [["b", "a", "c"]]
@@ -0,0 +1,80 @@
+from types import SimpleNamespace
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from PIL import Image
+
+from application.container import get_game_service
+from application.game_service import GameService
+from application.sprite_manifest import SpriteManifest
+from core.auth_dependency import get_current_user
+from presentation.game_router import build_link_header, router
+
+
+@pytest.fixture
+def manifest(tmp_path):
+    for filename in ["1.png", "1_smile.png", "1_sad.png", "1_worry.png", "1_anger.png", "2.png"]:
+        Image.new("RGB", (10, 20), (len(filename) * 20, 0, 0)).save(tmp_path / filename)
+    return SpriteManifest(tmp_path, "/api/v2/sprites")
+
+
+def make_service(manifest) -> GameService:
+    return GameService(db=None, bg_generator=object(), llm_service=object(), sprite_manifest=manifest)
+
+
+def scene(character_id, emotion):
+    return SimpleNamespace(character_id=character_id, emotion=emotion)
+
+
+class TestPrefetchUrls:
+    def test_most_used_emotions_of_main_character(self, manifest):
+        """메인 캐릭터가 자주 쓴 표정 순 + 기본 표정, 현재 씬 스프라이트와 다른 캐릭터는 제외"""
+        scenes = [scene(1, "sad"), scene(1, "happy"), scene(1, "smile"), scene(2, "anger"), scene(1, "sad")]
+        current = manifest.url(1, "sad")
+
+        urls = make_service(manifest)._get_prefetch_urls(1, scenes, exclude=[current])
+
+        assert urls == [manifest.url(1, "smile"), manifest.url(1, "default")]
+
+    def test_character_without_sprites(self, manifest):
+        """서버에 스프라이트가 없으면 힌트 없음"""
+        assert make_service(manifest)._get_prefetch_urls(3, [scene(3, "smile")], exclude=[]) == []
+
+
+class TestLinkHeader:
+    def test_preload_then_prefetch_without_duplicates(self):
+        """현재 에셋은 preload, 다음 에셋은 prefetch (중복/None 제외)"""
+        link = build_link_header(["/bg.png", None, "/a.png"], ["/a.png", "/b.png"])
+
+        assert link == "</bg.png>; rel=preload; as=image, </a.png>; rel=preload; as=image, </b.png>; rel=prefetch; as=image"
+        assert build_link_header([None], []) is None
+
+    def test_next_scene_response_headers(self):
+        """새 세션이면 배경을 preload하고 본문의 prefetch를 Link 헤더에도 포함"""
+        result = {
+            "session_id": 8,
+            "content": "새 세션",
+            "scenes": [{"role": "npc", "scene_id": 1, "type": "dialogue", "character_url": "/api/v2/sprites/a.png"}],
+            "background_url": "/static/generated_images/bg.png",
+            "prefetch": ["/api/v2/sprites/b.png"],
+        }
+        service = SimpleNamespace(generate_next_scene=lambda **kwargs: result)
+        app = FastAPI()
+        app.include_router(router)
+        app.dependency_overrides[get_game_service] = lambda: service
+        app.dependency_overrides[get_current_user] = lambda: {"user_id": 1}
+        body = {
+            "emotion": {"angry": 0, "disgust": 0, "fear": 0, "happy": 0, "sad": 0, "surprise": 0, "neutral": 100},
+            "time": 10,
+        }
+
+        response = TestClient(app).post("/api/v2/game/1/7/3", json=body)
+
+        assert response.status_code == 200
+        assert response.json()["prefetch"] == ["/api/v2/sprites/b.png"]
+        assert response.headers["link"] == (
+            "</static/generated_images/bg.png>; rel=preload; as=image, "
+            "</api/v2/sprites/a.png>; rel=preload; as=image, "
+            "</api/v2/sprites/b.png>; rel=prefetch; as=image"
+        )
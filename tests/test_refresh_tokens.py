@@ -0,0 +1,193 @@
+import time
+from datetime import datetime, timedelta
+
+import pytest
+import pytest_asyncio
+from fastapi import HTTPException
+from sqlalchemy import create_engine, text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from application.auth_service import AuthService, settings
+from application.refresh_token_purge import RefreshTokenPurger, purge_expired_refresh_tokens
+from core.database import Base, to_async_url
+from core.security import get_password_hash, hash_token
+from domain.entity.user import RefreshToken
+from domain.repository import user_repository
+from domain.repository.async_user_repository import AsyncUserRepository
+from domain.repository.user_repository import UserRepository
+
+
+@pytest.fixture
+def session_factory(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'tokens.db'}")
+    Base.metadata.create_all(bind=engine)
+    yield sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    engine.dispose()
+
+
+@pytest.fixture
+def db(session_factory):
+    db = session_factory()
+    yield db
+    db.close()
+
+
+@pytest_asyncio.fixture
+async def async_db(session_factory):
+    """session_factory와 같은 DB 파일의 비동기 세션 (인증 서비스용)"""
+    async_engine = create_async_engine(to_async_url(str(session_factory.kw["bind"].url)))
+    async with async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)() as session:
+        yield session
+    await async_engine.dispose()
+
+
+def save_tokens(db, user_id: int, count: int, expires_in_days: int = 7, max_active: int = 0):
+    repo = UserRepository(db)
+    now = datetime.utcnow()
+    for i in range(count):
+        expires_at = now + timedelta(days=expires_in_days)
+        repo.save_refresh_token(user_id, f"token-{user_id}-{expires_in_days}-{i}", expires_at, max_active)
+
+
+class TestHashedStorage:
+    def test_stores_only_digest(self, db):
+        """원문 대신 고정 길이 SHA-256 hex만 저장하고 원문으로 조회"""
+        repo = UserRepository(db)
+        repo.save_refresh_token(1, "raw-token", datetime.utcnow() + timedelta(days=1))
+
+        stored = db.query(RefreshToken).one()
+
+        assert stored.token_hash == hash_token("raw-token") and len(stored.token_hash) == 64
+        assert repo.get_refresh_token("raw-token").id == stored.id
+        assert repo.get_refresh_token("other-token") is None
+
+    @pytest.mark.asyncio
+    async def test_login_and_reissue_rotate_hashed_token(self, db, async_db):
+        """로그인/재발급 흐름은 그대로, 재발급 후 이전 토큰은 거부"""
+        UserRepository(db).create_user("user", "user@example.com", get_password_hash("password"))
+        service = AuthService(async_db)
+
+        first = (await service.login("user", "password"))["refresh_token"]
+        second = (await service.reissue_token(first))["refresh_token"]
+
+        assert db.query(RefreshToken).one().token_hash == hash_token(second)
+        with pytest.raises(HTTPException) as exc_info:
+            await service.reissue_token(first)
+        assert exc_info.value.status_code == 401
+
+    @pytest.mark.asyncio
+    async def test_login_applies_per_user_cap(self, db, async_db, monkeypatch):
+        """비동기 경로의 로그인도 사용자당 토큰 수 제한 적용"""
+        monkeypatch.setattr(settings, "REFRESH_TOKEN_MAX_PER_USER", 2)
+        UserRepository(db).create_user("user", "user@example.com", get_password_hash("password"))
+        service = AuthService(async_db)
+
+        tokens = [(await service.login("user", "password"))["refresh_token"] for _ in range(3)]
+
+        stored = {token.token_hash for token in db.query(RefreshToken)}
+        assert stored == {hash_token(token) for token in tokens[1:]}
+
+
+class TestLegacyColumnFallback:
+    @pytest.fixture
+    def legacy_db(self, db, monkeypatch):
+        """마이그레이션 1단계 이후 상태: 원문 token 컬럼과 NULL 허용 token_hash가 공존"""
+        monkeypatch.setattr(user_repository, "_legacy_token_column", True)
+        db.execute(text("DROP TABLE refresh_tokens"))
+        db.execute(text("""
+            CREATE TABLE refresh_tokens (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                user_id INTEGER NOT NULL,
+                token VARCHAR(500),
+                token_hash CHAR(64) UNIQUE,
+                created_at DATETIME NOT NULL,
+                expires_at DATETIME NOT NULL
+            )
+        """))
+        db.execute(
+            text("INSERT INTO refresh_tokens (user_id, token, created_at, expires_at) VALUES (1, 'legacy-token', :now, :expires_at)"),
+            {"now": datetime.utcnow(), "expires_at": datetime.utcnow() + timedelta(days=1)},
+        )
+        db.commit()
+        return db
+
+    def test_finds_unhashed_token_and_fills_hash(self, legacy_db):
+        """해시가 없는 구버전 토큰은 원문 컬럼으로 찾고 해시를 채워 이후에는 해시로 조회"""
+        repo = UserRepository(legacy_db)
+
+        assert repo.get_refresh_token("legacy-token").user_id == 1
+        assert legacy_db.scalar(text("SELECT token_hash FROM refresh_tokens")) == hash_token("legacy-token")
+        assert repo.get_refresh_token("other-token") is None
+        assert user_repository.legacy_token_lookup_enabled()
+
+    @pytest.mark.asyncio
+    async def test_async_lookup_falls_back(self, legacy_db, async_db):
+        """비동기 저장소도 같은 방식으로 원문 컬럼 조회"""
+        repo = AsyncUserRepository(async_db)
+
+        assert (await repo.get_refresh_token("legacy-token")).user_id == 1
+        await repo.delete_refresh_token("legacy-token")
+        assert legacy_db.scalar(text("SELECT COUNT(*) FROM refresh_tokens")) == 0
+
+    def test_stops_after_cutover(self, db, monkeypatch):
+        """원문 컬럼이 없으면 (cutover 이후) 조회 실패 한 번 뒤 원문 조회를 멈춤"""
+        monkeypatch.setattr(user_repository, "_legacy_token_column", True)
+
+        assert UserRepository(db).get_refresh_token("missing-token") is None
+        assert not user_repository.legacy_token_lookup_enabled()
+
+
+class TestPerUserCap:
+    def test_oldest_tokens_evicted(self, db):
+        """유효한 토큰이 max_active개를 넘으면 오래된 것부터 삭제 (다른 사용자는 영향 없음)"""
+        save_tokens(db, user_id=2, count=2)
+        save_tokens(db, user_id=1, count=5, max_active=3)
+
+        remaining = UserRepository(db).get_refresh_token
+        assert [remaining(f"token-1-7-{i}") is not None for i in range(5)] == [False, False, True, True, True]
+        assert db.query(RefreshToken).filter(RefreshToken.user_id == 2).count() == 2
+
+    def test_expired_tokens_removed_without_counting(self, db):
+        """만료된 토큰은 한도에 포함하지 않고 함께 삭제"""
+        save_tokens(db, user_id=1, count=3, expires_in_days=-1)
+        save_tokens(db, user_id=1, count=2, max_active=2)
+
+        assert db.query(RefreshToken).count() == 2
+
+
+class TestPurge:
+    def test_purges_expired_in_batches(self, db):
+        """만료된 토큰만 batch_size개씩 삭제"""
+        save_tokens(db, user_id=1, count=5, expires_in_days=-1)
+        save_tokens(db, user_id=1, count=2)
+
+        report = purge_expired_refresh_tokens(db, batch_size=2)
+
+        assert report == {"deleted": 5, "batches": 3}
+        assert db.query(RefreshToken).count() == 2
+
+    def test_max_batches_bounds_work(self, db):
+        save_tokens(db, user_id=1, count=5, expires_in_days=-1)
+
+        report = purge_expired_refresh_tokens(db, batch_size=2, max_batches=1)
+
+        assert report == {"deleted": 2, "batches": 1}
+
+    def test_purger_runs_in_background(self, db, session_factory):
+        """백그라운드 스레드가 주기적으로 정리하고 stop으로 종료"""
+        save_tokens(db, user_id=1, count=3, expires_in_days=-1)
+        purger = RefreshTokenPurger(session_factory, interval_seconds=0.01, batch_size=10)
+
+        purger.start()
+        try:
+            for _ in range(200):
+                if db.query(RefreshToken).count() == 0:
+                    break
+                db.rollback()
+                time.sleep(0.01)
+        finally:
+            purger.stop()
+
+        assert db.query(RefreshToken).count() == 0
+        assert not purger._thread.is_alive()
@@ -0,0 +1,71 @@
+import io
+import json
+
+from PIL import Image
+
+from application.sprite_atlas import build_atlases, pack_frames
+from application.sprite_manifest import SpriteManifest
+
+
+def make_sprites(sprite_dir, character_id, emotions, size=(40, 80)):
+    sprite_dir.mkdir(exist_ok=True)
+    for i, emotion in enumerate(emotions):
+        filename = f"{character_id}.png" if emotion == "default" else f"{character_id}_{emotion}.png"
+        Image.new("RGBA", size, (i * 40, 100, 200, 255)).save(sprite_dir / filename)
+
+
+class TestSpriteAtlas:
+    def test_pack_frames_does_not_overlap(self, tmp_path):
+        """프레임끼리 겹치지 않고 아틀라스 안에 들어감"""
+        make_sprites(tmp_path, 1, ["default", "smile", "sad", "anger", "blush"])
+        sprites = SpriteManifest(tmp_path, "/sprites").sprites(1)
+
+        width, height, frames = pack_frames(sprites)
+
+        boxes = [(f["x"], f["y"], f["x"] + f["width"], f["y"] + f["height"]) for f in frames.values()]
+        assert len(boxes) == 5
+        assert all(right <= width and bottom <= height for _, _, right, bottom in boxes)
+        for i, a in enumerate(boxes):
+            for b in boxes[i + 1:]:
+                assert a[2] <= b[0] or b[2] <= a[0] or a[3] <= b[1] or b[3] <= a[1]
+
+    def test_build_and_expose_atlas(self, tmp_path):
+        """아틀라스를 만들고 매니페스트가 프레임 좌표와 함께 노출"""
+        sprite_dir, atlas_dir = tmp_path / "sprites", tmp_path / "atlases"
+        make_sprites(sprite_dir, 1, ["default", "smile", "sad"])
+
+        report = build_atlases(SpriteManifest(sprite_dir, "/sprites"), sprite_dir, atlas_dir)
+
+        assert report["built"] == [1]
+        manifest = SpriteManifest(sprite_dir, "/sprites", atlas_dir=atlas_dir, atlas_url_prefix="/static/atlases")
+        atlas = manifest.atlas(1)
+        assert atlas["url"].startswith("/static/atlases/") and atlas["url"].endswith(".webp")
+        assert set(atlas["frames"]) == {"default", "sad", "smile"}
+
+        image = Image.open(io.BytesIO((atlas_dir / atlas["url"].rsplit("/", 1)[1]).read_bytes()))
+        assert image.format == "WEBP"
+        assert image.size == (atlas["width"], atlas["height"])
+        frame = atlas["frames"]["smile"]
+        assert image.getpixel((frame["x"] + 1, frame["y"] + 1))[1] == 100
+
+    def test_rebuilds_only_changed_characters(self, tmp_path):
+        """스프라이트가 바뀐 캐릭터만 다시 빌드하고 오래된 아틀라스는 노출하지 않음"""
+        sprite_dir, atlas_dir = tmp_path / "sprites", tmp_path / "atlases"
+        make_sprites(sprite_dir, 1, ["default", "smile"])
+        make_sprites(sprite_dir, 2, ["default"])
+        build_atlases(SpriteManifest(sprite_dir, "/sprites"), sprite_dir, atlas_dir)
+        old_image = json.loads((atlas_dir / "index.json").read_text())["1"]["image"]
+
+        make_sprites(sprite_dir, 1, ["default", "smile", "worry"])
+        stale = SpriteManifest(sprite_dir, "/sprites", atlas_dir=atlas_dir)
+        assert stale.atlas(1) is None
+        assert stale.atlas(2) is not None
+
+        report = build_atlases(stale, sprite_dir, atlas_dir)
+
+        assert report["built"] == [1]
+        assert report["skipped"] == [2]
+        assert not (atlas_dir / old_image).exists()
+        assert set(SpriteManifest(sprite_dir, "/sprites", atlas_dir=atlas_dir).atlas(1)["frames"]) == {
+            "default", "smile", "worry",
+        }
@@ -0,0 +1,110 @@
+import os
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from PIL import Image
+
+import application.sprite_manifest as sprite_manifest_module
+from application.sprite_manifest import SpriteManifest, normalize_emotion
+from presentation.sprite_router import router
+
+
+@pytest.fixture
+def manifest(tmp_path):
+    for filename, color in [("1.png", "white"), ("1_smile.png", "yellow"), ("1_sad.png", "blue"), ("2.png", "red")]:
+        Image.new("RGB", (40, 80), color).save(tmp_path / filename)
+    (tmp_path / "notes.txt").write_text("ignored")
+    return SpriteManifest(tmp_path, "/api/v2/sprites")
+
+
+class TestSpriteManifest:
+    def test_normalize_emotion(self):
+        """동의어는 스프라이트 표정으로, 알 수 없는 표정은 기본 표정으로"""
+        assert normalize_emotion("Happy") == "smile"
+        assert normalize_emotion("worried") == "worry"
+        assert normalize_emotion("bored") == "default"
+        assert normalize_emotion(None) == "default"
+
+    def test_resolve_falls_back_to_available_sprite(self, manifest):
+        """없는 표정은 동의어 → 기본 표정 순으로 존재하는 스프라이트 사용"""
+        assert manifest.filename(1, "smile") == "1_smile.png"
+        assert manifest.filename(1, "happy") == "1_smile.png"
+        assert manifest.filename(1, "anger") == "1.png"
+        assert manifest.filename(1, "") == "1.png"
+        assert manifest.filename(None, "smile") is None
+
+    def test_character_without_sprites(self, manifest):
+        """서버에 스프라이트가 없는 캐릭터는 표정 이름만 정규화하고 URL은 없음"""
+        assert manifest.filename(3, "shocked") == "3_surprise.png"
+        assert manifest.filename(3, "bored") == "3.png"
+        assert manifest.url(3, "smile") is None
+
+    def test_hashed_url(self, manifest):
+        """URL은 콘텐츠 해시 기반"""
+        url = manifest.url(1, "smile")
+        sprite = manifest.resolve(1, "smile")
+
+        assert url == f"/api/v2/sprites/{sprite.digest}.png"
+        assert manifest.path_for(f"{sprite.digest}.png").name == "1_smile.png"
+        assert (sprite.width, sprite.height) == (40, 80)
+
+    def test_to_dict_filters_characters(self, manifest):
+        """지정한 캐릭터의 스프라이트만 포함"""
+        data = manifest.to_dict([2])
+
+        assert list(data["characters"]) == ["2"]
+        assert list(data["characters"]["2"]) == ["default"]
+        assert data["version"] == manifest.version
+
+
+class TestSpriteRouter:
+    @pytest.fixture
+    def client(self, manifest, monkeypatch):
+        monkeypatch.setattr(sprite_manifest_module, "_sprite_manifest", manifest)
+        app = FastAPI()
+        app.include_router(router)
+        return TestClient(app)
+
+    def test_manifest_etag(self, client):
+        """매니페스트는 버전 ETag로 재검증"""
+        response = client.get("/api/v2/sprites", params={"character_id": [1]})
+        assert response.status_code == 200
+        assert set(response.json()["characters"]["1"]) == {"default", "sad", "smile"}
+
+        cached = client.get(
+            "/api/v2/sprites", params={"character_id": [1]}, headers={"If-None-Match": response.headers["etag"]}
+        )
+        assert cached.status_code == 304
+        assert client.get("/api/v2/sprites", headers={"If-None-Match": response.headers["etag"]}).status_code == 200
+
+    def test_hashed_sprite_is_immutable(self, client, manifest):
+        """해시 URL의 스프라이트는 영구 캐시, 모르는 해시는 404"""
+        url = manifest.url(1, "sad")
+
+        response = client.get(url)
+        assert response.status_code == 200
+        assert "immutable" in response.headers["cache-control"]
+        assert client.get(url, headers={"If-None-Match": response.headers["etag"]}).status_code == 304
+        assert client.get(f"/api/v2/sprites/{'0' * 64}.png").status_code == 404
+
+    def test_replaced_sprite_gets_new_hash(self, client, manifest, tmp_path):
+        """파일이 바뀌면 이전 해시 URL은 404, 새 해시 URL로 새 내용을 제공"""
+        old_url = manifest.url(1, "sad")
+        assert client.get(old_url, headers={"If-None-Match": 'W/"unrelated"'}).status_code == 200
+
+        Image.new("RGB", (40, 80), "green").save(tmp_path / "1_sad.png")
+        os.utime(tmp_path / "1_sad.png", ns=(1, 1))
+
+        assert client.get(old_url).status_code == 404
+        new_url = manifest.url(1, "sad")
+        assert new_url != old_url
+        assert client.get(new_url).content == (tmp_path / "1_sad.png").read_bytes()
+        assert new_url in client.get("/api/v2/sprites").text
+
+    def test_weak_etag_matches(self, client, manifest):
+        """W/ 접두사가 붙은 If-None-Match도 같은 ETag로 비교"""
+        url = manifest.url(1, "smile")
+        etag = client.get(url).headers["etag"]
+
+        assert client.get(url, headers={"If-None-Match": f"W/{etag}"}).status_code == 304
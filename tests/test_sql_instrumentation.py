@@ -0,0 +1,116 @@
+import logging
+
+import pytest
+import pytest_asyncio
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from core.config import get_settings
+from core.database import Base
+from core.metrics import metrics
+from core.sql_instrumentation import QueryStatsMiddleware, instrument_engine, normalize_sql
+from domain.repository.async_game_repository import AsyncCharacterRepository
+from domain.repository.game_repository import CharacterRepository
+
+
+@pytest.fixture
+def session_factory(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'sql.db'}")
+    instrument_engine(engine)
+    Base.metadata.create_all(bind=engine)
+    yield sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    engine.dispose()
+
+
+@pytest.fixture
+def slow_query_threshold(monkeypatch):
+    """모든 쿼리를 느린 쿼리로 기록"""
+    monkeypatch.setattr(get_settings(), "SQL_SLOW_QUERY_MS", 0.0)
+    monkeypatch.setattr(get_settings(), "SQL_SLOW_QUERY_SAMPLE_RATE", 1.0)
+
+
+class TestNormalizeSql:
+    def test_replaces_literals_and_parameters(self):
+        """리터럴/파라미터를 ?로 바꾸고 IN 목록과 공백을 정리"""
+        statement = "SELECT *\n  FROM users WHERE name = 'kim' AND id IN (%s, %s, %s) AND age > 20 LIMIT %(param_1)s"
+
+        assert normalize_sql(statement) == "SELECT * FROM users WHERE name = ? AND id IN (...) AND age > ? LIMIT ?"
+
+
+class TestQueryStatsMiddleware:
+    def test_request_headers_and_metrics(self, session_factory):
+        """요청에서 실행된 쿼리 수와 DB 시간을 응답 헤더와 메트릭으로 기록"""
+        app = FastAPI()
+        app.add_middleware(QueryStatsMiddleware)
+
+        def get_session():
+            db = session_factory()
+            try:
+                yield db
+            finally:
+                db.close()
+
+        @app.get("/characters")
+        def list_characters(db=Depends(get_session)):
+            CharacterRepository(db).create_character("하나", "밝음")
+            return len(CharacterRepository(db).get_all_characters())
+
+        metrics.reset()
+        response = TestClient(app).get("/characters")
+
+        assert response.json() == 1
+        assert int(response.headers["x-db-query-count"]) >= 2
+        assert response.headers["server-timing"].startswith("db;dur=")
+        assert metrics.snapshot()["observations"]["db_queries_per_request"]["count"] == 1
+
+    def test_slow_query_log_includes_repository_caller(self, session_factory, slow_query_threshold, caplog):
+        """느린 쿼리 로그에 정규화된 SQL과 리포지토리 메서드 기록"""
+        db = session_factory()
+        with caplog.at_level(logging.WARNING, logger="core.sql_instrumentation"):
+            CharacterRepository(db).get_character_by_id(42)
+            db.execute(text("SELECT 1"))
+        db.close()
+
+        messages = [record.getMessage() for record in caplog.records]
+        assert any("caller=CharacterRepository.get_character_by_id" in m and "characters.id = ?" in m for m in messages)
+        assert any("caller=unknown sql=SELECT ?" in m for m in messages)
+
+
+class TestFailedStatements:
+    def test_failed_statement_leaves_no_timing_state(self, session_factory):
+        """실패한 쿼리는 연결에 시작 시각을 남기지 않고 다음 쿼리 시간 측정에 영향 없음"""
+        db = session_factory()
+        metrics.reset()
+        for _ in range(3):
+            with pytest.raises(Exception):
+                db.execute(text("SELECT * FROM missing_table"))
+            db.rollback()
+
+        db.execute(text("SELECT 1"))
+
+        assert "query_start_time" not in db.connection().info
+        assert metrics.counter("db_query_total") == 1
+        db.close()
+
+
+class TestAsyncInstrumentation:
+    @pytest_asyncio.fixture
+    async def async_db(self, tmp_path):
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'async_sql.db'}")
+        instrument_engine(engine.sync_engine)
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        async with async_sessionmaker(engine, expire_on_commit=False)() as session:
+            yield session
+        await engine.dispose()
+
+    @pytest.mark.asyncio
+    async def test_async_caller(self, async_db, slow_query_threshold, caplog):
+        """비동기 리포지토리 쿼리도 호출한 메서드를 찾음"""
+        with caplog.at_level(logging.WARNING, logger="core.sql_instrumentation"):
+            await AsyncCharacterRepository(async_db).get_all_characters()
+
+        assert any("caller=AsyncCharacterRepository.get_all_characters" in r.getMessage() for r in caplog.records)
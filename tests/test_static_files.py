@@ -0,0 +1,213 @@
+import hashlib
+import json
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from application.image_index import ImageIndex
+from core.metrics import metrics
+from core.static_files import AssetCache, ContentAddressedStaticFiles, IMMUTABLE_CACHE_CONTROL
+from core.storage import LocalImageStorage
+
+
+@pytest.fixture
+def static_client(tmp_path):
+    """콘텐츠 해시 파일과 일반 파일이 있는 정적 파일 클라이언트"""
+    content = b"fake png bytes" * 100
+    digest = hashlib.sha256(content).hexdigest()
+    (tmp_path / f"{digest}.png").write_bytes(content)
+    (tmp_path / "legacy_20251114_153045.png").write_bytes(content)
+
+    app = FastAPI()
+    app.mount("/static", ContentAddressedStaticFiles(directory=tmp_path), name="static")
+    return TestClient(app), digest, content
+
+
+class TestContentAddressedStaticFiles:
+    def test_immutable_headers(self, static_client):
+        """해시 파일명은 immutable 캐시 헤더와 해시 ETag로 응답"""
+        client, digest, content = static_client
+
+        response = client.get(f"/static/{digest}.png")
+
+        assert response.status_code == 200
+        assert response.content == content
+        assert response.headers["cache-control"] == IMMUTABLE_CACHE_CONTROL
+        assert response.headers["etag"] == f'"{digest}"'
+
+    def test_conditional_get(self, static_client):
+        """If-None-Match가 일치하면 304"""
+        client, digest, _ = static_client
+
+        response = client.get(f"/static/{digest}.png", headers={"If-None-Match": f'"{digest}"'})
+
+        assert response.status_code == 304
+        assert response.headers["etag"] == f'"{digest}"'
+
+    def test_range_request(self, static_client):
+        """Range 요청은 206 부분 응답"""
+        client, digest, content = static_client
+
+        response = client.get(f"/static/{digest}.png", headers={"Range": "bytes=0-9"})
+
+        assert response.status_code == 206
+        assert response.content == content[:10]
+
+    def test_legacy_file_not_immutable(self, static_client):
+        """해시가 아닌 파일명은 기본 정적 파일 응답"""
+        client, _, _ = static_client
+
+        response = client.get("/static/legacy_20251114_153045.png")
+
+        assert response.status_code == 200
+        assert "cache-control" not in response.headers
+
+
+class TestImageIndex:
+    def test_duplicate_content_merges_keywords(self, tmp_path):
+        """같은 해시로 등록하면 키워드만 병합"""
+        index = ImageIndex(LocalImageStorage(tmp_path, "/static"))
+        index.add("a" * 64, f"{'a' * 64}.png", "rainy school corridor")
+        index.add("a" * 64, f"{'a' * 64}.png", "sunny classroom")
+
+        assert index.find("rainy school corridor") == f"{'a' * 64}.png"
+        assert index.find("sunny classroom") == f"{'a' * 64}.png"
+        # LLM 재사용 후보에는 파일마다 대표 키워드 하나만 노출
+        assert index.keywords() == ["rainy_school_corridor"]
+
+    def test_index_persists(self, tmp_path):
+        """저장소의 index.json에 저장되어 새 인스턴스에서도 조회 가능"""
+        storage = LocalImageStorage(tmp_path, "/static")
+        ImageIndex(storage).add("b" * 64, f"{'b' * 64}.png", "night park")
+
+        assert ImageIndex(storage).find("night park") == f"{'b' * 64}.png"
+        assert ImageIndex(storage).find("snowy street") is None
+
+
+    def test_concurrent_add_retries_on_conflict(self, tmp_path):
+        """다른 워커가 먼저 index.json을 저장하면 최신 내용에 다시 적용하여 두 항목 모두 유지"""
+        metrics.reset()
+        storage = RacingStorage(tmp_path, "/static")
+        index = ImageIndex(storage)
+        storage.before_first_write = lambda: ImageIndex(LocalImageStorage(tmp_path, "/static")).add(
+            "d" * 64, f"{'d' * 64}.png", "snowy street"
+        )
+
+        index.add("e" * 64, f"{'e' * 64}.png", "night park")
+
+        fresh = ImageIndex(storage)
+        assert fresh.find("snowy street") == f"{'d' * 64}.png"
+        assert fresh.find("night park") == f"{'e' * 64}.png"
+        assert metrics.counter("image_index_write_conflict_total") == 1
+
+    def test_miss_reads_index_without_listing(self, tmp_path):
+        """미스마다 저장소 전체 목록을 읽지 않고 index.json만 다시 읽음"""
+        storage = RacingStorage(tmp_path, "/static")
+        index = ImageIndex(storage)
+        ImageIndex(storage).add("f" * 64, f"{'f' * 64}.png", "quiet library")
+
+        assert index.find("snowy street") is None
+        assert index.find("quiet library") == f"{'f' * 64}.png"
+        assert storage.list_calls == 2  # 인스턴스 생성 시에만
+
+
+class RacingStorage(LocalImageStorage):
+    """첫 조건부 쓰기 직전에 다른 워커의 쓰기를 끼워 넣고 목록 조회 횟수를 세는 저장소"""
+
+    def __init__(self, *args):
+        super().__init__(*args)
+        self.before_first_write = None
+        self.list_calls = 0
+
+    def list(self, prefix: str = ""):
+        self.list_calls += 1
+        return super().list(prefix)
+
+    def put_if_match(self, key, data, content_type, version):
+        if self.before_first_write:
+            before_first_write, self.before_first_write = self.before_first_write, None
+            before_first_write()
+        return super().put_if_match(key, data, content_type, version)
+
+
+class TestAssetCache:
+    def test_evicts_least_recently_used_by_bytes(self):
+        """전체 바이트 수가 한도를 넘으면 가장 오래 사용하지 않은 항목부터 제거"""
+        cache = AssetCache(max_bytes=25, max_entry_bytes=20)
+        cache.put(("a",), b"a" * 10)
+        cache.put(("b",), b"b" * 10)
+        cache.get(("a",))
+        cache.put(("c",), b"c" * 10)
+        cache.put(("big",), b"x" * 21)
+
+        assert cache.get(("a",)) is not None
+        assert cache.get(("b",)) is None
+        assert cache.get(("c",)) is not None
+        assert cache.get(("big",)) is None
+        assert cache.size == 20
+
+
+class TestStaticServingTiers:
+    @pytest.fixture
+    def client(self, tmp_path):
+        (tmp_path / "small.png").write_bytes(b"p" * 100)
+        (tmp_path / "large.png").write_bytes(b"L" * 5000)
+        (tmp_path / "manifest.json").write_text(json.dumps({"frames": list(range(200))}))
+        app = FastAPI()
+        app.mount(
+            "/static",
+            ContentAddressedStaticFiles(directory=tmp_path, cache=AssetCache(max_bytes=10_000, max_entry_bytes=1000)),
+        )
+        metrics.reset()
+        return TestClient(app)
+
+    def test_small_file_served_from_memory(self, client):
+        """작은 파일은 두 번째 요청부터 메모리에서 응답"""
+        assert client.get("/static/small.png").content == b"p" * 100
+        response = client.get("/static/small.png")
+
+        assert response.content == b"p" * 100
+        snapshot = metrics.snapshot()
+        assert snapshot["counters"]["static_disk_request_total"] == 1
+        assert snapshot["counters"]["static_memory_request_total"] == 1
+        assert snapshot["counters"]["static_memory_bytes_total"] == 100
+        assert snapshot["ratios"]["static_cache_hit_rate"] == 0.5
+
+    def test_large_file_streamed(self, client):
+        """캐시 한도보다 큰 파일은 디스크에서 전송"""
+        response = client.get("/static/large.png")
+
+        assert response.content == b"L" * 5000
+        assert metrics.snapshot()["counters"]["static_sendfile_bytes_total"] == 5000
+
+    def test_not_modified(self, client):
+        """ETag가 일치하면 캐시 계층과 관계없이 304"""
+        etag = client.get("/static/small.png").headers["etag"]
+
+        assert client.get("/static/small.png", headers={"If-None-Match": etag}).status_code == 304
+
+    @pytest.mark.parametrize("encoding", ["gzip", "br"])
+    def test_json_precompressed(self, client, encoding):
+        """JSON은 압축본을 한 번 만들어 재사용하고 인코딩별 ETag로 응답"""
+        headers = {"Accept-Encoding": encoding}
+        first = client.get("/static/manifest.json", headers=headers)
+        second = client.get("/static/manifest.json", headers=headers)
+
+        assert first.headers["content-encoding"] == encoding
+        assert first.headers["vary"] == "Accept-Encoding"
+        assert first.headers["etag"].endswith(f'-{encoding}"')
+        assert second.json() == {"frames": list(range(200))}
+        assert int(second.headers["content-length"]) < len(json.dumps({"frames": list(range(200))}))
+        assert metrics.counter("static_precompressed_request_total") == 2
+        assert metrics.counter("static_cache_hit_total") == 1
+        assert client.get(
+            "/static/manifest.json", headers={**headers, "If-None-Match": first.headers["etag"]}
+        ).status_code == 304
+
+    def test_json_uncompressed_when_not_accepted(self, client):
+        """압축을 받지 않는 클라이언트에는 원본 전송"""
+        response = client.get("/static/manifest.json", headers={"Accept-Encoding": "identity"})
+
+        assert "content-encoding" not in response.headers
+        assert response.json() == {"frames": list(range(200))}
@@ -0,0 +1,145 @@
+import hashlib
+import io
+
+import pytest
+
+from core.config import Settings
+from core.static_files import IMMUTABLE_CACHE_CONTROL
+from core.storage import LocalImageStorage, S3ImageStorage, create_image_storage
+
+CDN = "https://cdn.example.com"
+
+
+class FakeS3Client:
+    """MinIO 대용 인메모리 S3 클라이언트 (boto3 클라이언트와 같은 메서드 시그니처)"""
+
+    class exceptions:
+        class NoSuchKey(Exception):
+            pass
+
+    class PreconditionFailed(Exception):
+        """botocore ClientError와 같은 response 형식"""
+
+        response = {"Error": {"Code": "PreconditionFailed"}}
+
+    def __init__(self):
+        self.objects = {}
+
+    def upload_fileobj(self, fileobj, bucket, key, ExtraArgs=None):
+        self.objects[(bucket, key)] = {"Body": fileobj.read(), **(ExtraArgs or {})}
+
+    def get_object(self, Bucket, Key):
+        if (Bucket, Key) not in self.objects:
+            raise self.exceptions.NoSuchKey(Key)
+        body = self.objects[(Bucket, Key)]["Body"]
+        return {"Body": io.BytesIO(body), "ETag": f'"{hashlib.md5(body).hexdigest()}"'}
+
+    def put_object(self, Bucket, Key, Body, ContentType, IfMatch=None, IfNoneMatch=None):
+        current = self.objects.get((Bucket, Key))
+        etag = f'"{hashlib.md5(current["Body"]).hexdigest()}"' if current else None
+        if (IfNoneMatch == "*" and current) or (IfMatch is not None and IfMatch != etag):
+            raise self.PreconditionFailed()
+        self.objects[(Bucket, Key)] = {"Body": Body, "ContentType": ContentType}
+
+    def list_objects_v2(self, Bucket, Prefix="", MaxKeys=1000):
+        keys = sorted(key for bucket, key in self.objects if bucket == Bucket and key.startswith(Prefix))
+        return {"Contents": [{"Key": key} for key in keys[:MaxKeys]]}
+
+    def delete_object(self, Bucket, Key):
+        self.objects.pop((Bucket, Key), None)
+
+    def get_paginator(self, name):
+        client = self
+
+        class Paginator:
+            def paginate(self, Bucket, Prefix=""):
+                yield client.list_objects_v2(Bucket=Bucket, Prefix=Prefix)
+
+        return Paginator()
+
+
+@pytest.fixture
+def s3_client():
+    return FakeS3Client()
+
+
+class TestS3ImageStorage:
+    def test_put_and_get(self, s3_client):
+        """prefix 아래에 content type과 함께 저장"""
+        storage = S3ImageStorage(bucket="assets", public_base_url=CDN, prefix="generated_images", client=s3_client)
+
+        storage.put("abc.png", b"png-bytes", "image/png", immutable=True)
+
+        stored = s3_client.objects[("assets", "generated_images/abc.png")]
+        assert stored["Body"] == b"png-bytes"
+        assert stored["ContentType"] == "image/png"
+        assert stored["CacheControl"] == IMMUTABLE_CACHE_CONTROL
+        assert storage.get("abc.png") == b"png-bytes"
+        assert storage.get("missing.png") is None
+
+    def test_exists_and_list(self, s3_client):
+        """존재 확인은 정확한 키만, 목록은 prefix 제거된 키"""
+        storage = S3ImageStorage(bucket="assets", public_base_url=CDN, prefix="generated_images", client=s3_client)
+        storage.put("abc.png", b"1", "image/png")
+        storage.put("abcd.png", b"2", "image/png")
+
+        assert storage.exists("abc.png")
+        assert not storage.exists("ab.png")
+        assert storage.list() == ["abc.png", "abcd.png"]
+        assert storage.list("abcd") == ["abcd.png"]
+
+    def test_put_if_match(self, s3_client):
+        """ETag가 그대로일 때만 덮어쓰고, 버전 없이 쓰면 키가 없을 때만 생성"""
+        storage = S3ImageStorage(bucket="assets", public_base_url=CDN, prefix="generated_images", client=s3_client)
+
+        assert storage.put_if_match("index.json", b"1", "application/json", None)
+        assert not storage.put_if_match("index.json", b"2", "application/json", None)
+        data, version = storage.get_versioned("index.json")
+        assert storage.put_if_match("index.json", b"3", "application/json", version)
+        assert not storage.put_if_match("index.json", b"4", "application/json", version)
+        assert (data, storage.get("index.json")) == (b"1", b"3")
+
+    def test_url(self, s3_client):
+        """공개 주소 아래의 고정 URL (호출할 때마다 같은 값)"""
+        storage = S3ImageStorage(
+            bucket="assets", public_base_url=CDN + "/", prefix="generated_images", client=s3_client
+        )
+
+        assert storage.url("abc.png") == "https://cdn.example.com/generated_images/abc.png"
+        assert storage.url("abc.png") == storage.url("abc.png")
+
+    def test_public_base_url_required(self, s3_client):
+        """서명된 URL은 만료되어 저장할 수 없으므로 공개 주소 없이는 생성 불가"""
+        with pytest.raises(ValueError):
+            S3ImageStorage(bucket="assets", public_base_url="", client=s3_client)
+
+        settings = Settings(IMAGE_STORAGE_BACKEND="s3", S3_BUCKET="assets", S3_PUBLIC_BASE_URL="")
+        with pytest.raises(ValueError):
+            create_image_storage(settings)
+
+
+class TestLocalImageStorage:
+    def test_put_get_list(self, tmp_path):
+        """로컬 저장소 기본 동작"""
+        storage = LocalImageStorage(tmp_path / "images", "/static/generated_images")
+
+        storage.put("abc.png", b"png-bytes", "image/png")
+
+        assert storage.exists("abc.png")
+        assert storage.get("abc.png") == b"png-bytes"
+        assert storage.get("missing.png") is None
+        assert storage.list() == ["abc.png"]
+        assert storage.url("abc.png") == "/static/generated_images/abc.png"
+
+    def test_put_if_match(self, tmp_path):
+        """저장된 내용이 읽은 버전 그대로일 때만 덮어씀"""
+        storage = LocalImageStorage(tmp_path / "images", "/static/generated_images")
+
+        assert storage.get_versioned("index.json") == (None, None)
+        assert storage.put_if_match("index.json", b"1", "application/json", None)
+        _, version = storage.get_versioned("index.json")
+        storage.put("index.json", b"2", "application/json")
+
+        assert not storage.put_if_match("index.json", b"3", "application/json", version)
+        assert storage.get("index.json") == b"2"
+        assert storage.list() == ["index.json"]